@@ -0,0 +1,34 @@
+"""
+Benchmarks for seo-checker.py, sitemap-generator.py and seo-html-generator.py.
+
+Run from the repository root:
+
+    python -m benchmarks                                # all cases
+    python -m benchmarks --quick --only checker         # smaller corpus, matching cases
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json   # exits 1 on regressions
+
+The corpus (corpus.py) is generated from fixed seeds, so every run measures
+the same pages and directory trees. Each case runs in its own process so
+its peak RSS is not inflated by the cases before it.
+"""
+
+import importlib.util
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(filename):
+    """Imports one of the hyphen-named top-level scripts (e.g. 'seo-checker.py') as a module."""
+    name = filename[:-3].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
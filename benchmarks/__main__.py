@@ -0,0 +1,67 @@
+"""Command-line entry point: python -m benchmarks --help"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.harness import (DEFAULT_TOLERANCE, compare, format_results, load_baseline, run_case,
+                                run_case_isolated, save_baseline)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks for the SEO toolkit.")
+    parser.add_argument("--only", action="append", metavar="TEXT", help="Run the cases whose name contains TEXT (repeatable).")
+    parser.add_argument("--quick", action="store_true", help="Smaller corpus and fewer samples (smoke run).")
+    parser.add_argument("--baseline", help="Compare against this baseline file; exit 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed relative slowdown before a regression is reported (default: {DEFAULT_TOLERANCE}).")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Save the results as a new baseline.")
+    parser.add_argument("--json", metavar="FILE", help="Also write the raw results as JSON.")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit.")
+    parser.add_argument("--corpus", metavar="DIR", help="Write the synthetic corpus (pages and a directory tree) to DIR and exit.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_case(args.worker, quick=args.quick)))
+        return 0
+
+    from benchmarks.cases import CASES
+    if args.list:
+        for name, (_, unit, samples, quick_samples, budget_ms) in CASES.items():
+            budget = f", p50 budget {budget_ms} ms" if budget_ms else ""
+            print(f"{name:<50} {unit:<6} {samples} samples ({quick_samples} with --quick){budget}")
+        return 0
+    if args.corpus:
+        from benchmarks.corpus import write_corpus
+        write_corpus(args.corpus, pages=20 if args.quick else 200, tree_files=1000 if args.quick else 10000)
+        print(f"✅ Corpus written to: {args.corpus}")
+        return 0
+
+    names = [name for name in CASES if not args.only or any(text in name for text in args.only)]
+    if not names:
+        print("❌ ERROR: No benchmark matches --only.")
+        return 2
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    results = []
+    for name in names:
+        print(f"ℹ️ Running {name}...", flush=True)
+        try:
+            results.append(run_case_isolated(name, quick=args.quick))
+        except RuntimeError as e:
+            print(f"❌ ERROR: {e}")
+            return 1
+
+    regressions = compare(results, baseline, tolerance=args.tolerance)
+    print("\n".join(format_results(results, baseline, regressions)))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"✅ Baseline saved to: {args.save_baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
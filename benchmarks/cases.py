@@ -0,0 +1,131 @@
+"""
+Benchmark cases. Each case is a setup function (registered with @case) that
+builds its input from the corpus and returns (run, items): `run()` is the
+timed call and `items` the number of units (pages, files, URLs) it handles.
+A case registered with budget_ms fails the run when its p50 exceeds the
+budget, with or without a baseline.
+"""
+
+import atexit
+import contextlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import REPO_ROOT, load_script
+from benchmarks.corpus import generate_profile_page, generate_tree
+
+CASES = {}      # name -> (setup, unit, samples, quick samples, p50 budget in ms or None)
+
+STARTUP_BUDGET_MS = 400         # Cold start of `seo-checker.py --version`, interpreter included
+HEAVY_MODULES = ('requests', 'bs4', 'fpdf', 'numpy')
+
+
+def case(name, unit, samples=20, quick_samples=5, budget_ms=None):
+    def register(setup):
+        CASES[name] = (setup, unit, samples, quick_samples, budget_ms)
+        return setup
+    return register
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _silent(function, *args):
+    """Calls `function` with stdout discarded (the checker prints its reports)."""
+    with contextlib.redirect_stdout(_NullWriter()):
+        return function(*args)
+
+
+# --- seo-checker.py ---
+
+@case('checker.startup[--version]', 'runs', samples=10, quick_samples=5, budget_ms=STARTUP_BUDGET_MS)
+def _startup(quick):
+    script = os.path.join(REPO_ROOT, 'seo-checker.py')
+    # Importing the checker must not load a heavy dependency: that cost belongs to the runs that use it
+    probe = ("import sys; from benchmarks import load_script; load_script('seo-checker.py'); "
+             f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', probe], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    if loaded:
+        raise RuntimeError(f"importing seo-checker.py loads {loaded}")
+    command = [sys.executable, script, '--version']
+    return (lambda: subprocess.run(command, cwd=REPO_ROOT, capture_output=True, check=True)), 1
+
+
+def _audit_case(profile):
+    def setup(quick):
+        checker = load_script('seo-checker.py')
+        html = generate_profile_page(profile)
+        return (lambda: _silent(checker.perform_metadata_audit, html, f'{profile}.html')), 1
+    return setup
+
+case('checker.perform_metadata_audit[typical]', 'pages')(_audit_case('typical'))
+case('checker.perform_metadata_audit[heavy]', 'pages', samples=8, quick_samples=3)(_audit_case('heavy'))
+
+
+@case('checker.analyze_tag_quality[heavy]', 'pages', samples=10, quick_samples=3)
+def _analyze_tag_quality(quick):
+    checker = load_script('seo-checker.py')
+    results, soup = checker.extract_metadata(generate_profile_page('heavy'))
+    return (lambda: checker.analyze_tag_quality(results, soup)), 1
+
+
+@case('checker.generate_overall_score_and_grade', 'pages')
+def _score(quick):
+    checker = load_script('seo-checker.py')
+    results, soup = checker.extract_metadata(generate_profile_page('typical'))
+    quality_checks = checker.analyze_tag_quality(results, soup)
+    batch = 200
+
+    def run():
+        for _ in range(batch):
+            checker.generate_overall_score_and_grade(results, quality_checks)
+    return run, batch
+
+
+# --- sitemap-generator.py ---
+
+@case('sitemap.index_local_files', 'files', samples=10, quick_samples=3)
+def _index_local_files(quick):
+    sitemap = load_script('sitemap-generator.py')
+    root = tempfile.mkdtemp(prefix='seokit-bench-')
+    atexit.register(shutil.rmtree, root, True)
+    generate_tree(root, files=2000 if quick else 20000)
+    urls = sitemap.index_local_files(root, 'https://www.example.com/')
+    return (lambda: sitemap.index_local_files(root, 'https://www.example.com/')), max(len(urls), 1)
+
+
+@case('sitemap.build_sitemap_xml', 'urls', samples=5, quick_samples=3)
+def _build_sitemap_xml(quick):
+    sitemap = load_script('sitemap-generator.py')
+    count = 5000 if quick else 50000
+    urls = [{'loc': f'https://www.example.com/section{i % 64}/file{i}.html', 'lastmod': '2024-01-05'} for i in range(count)]
+    return (lambda: sitemap.build_sitemap_xml(urls, '0.5', 'monthly')), count
+
+
+# --- seo-html-generator.py ---
+
+@case('generator.generate_full_html_content', 'pages')
+def _generate_full_html(quick):
+    generator = load_script('seo-html-generator.py')
+    settings = {
+        'title': 'Example Page Title', 'description': 'An example page description for the benchmark corpus.',
+        'keywords': 'seo, benchmark', 'author': 'Bench', 'site_url': 'https://www.example.com/page.html',
+        'image_url': 'https://www.example.com/i.png', 'og_type': 'article', 'twitter_handle': '@bench',
+        'gtag_id': 'G-XXXXXXXXXX', 'schema_type': 'FAQPage', 'json_ld_name': 'Example',
+        'json_ld_logo': 'https://www.example.com/logo.png', 'output_format': 'full_html',
+        'faq_pairs': [{'question': f'Question {i}?', 'answer': f'Answer number {i}.'} for i in range(20)],
+    }
+    batch = 100
+
+    def run():
+        for _ in range(batch):
+            generator.generate_full_html_content(settings)
+    return run, batch
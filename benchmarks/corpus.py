@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic corpus: HTML pages with a configurable tag mix and
+size, and directory trees for the sitemap generator. The same seed always
+produces byte-identical output.
+"""
+
+import json
+import os
+import random
+
+# Tag mix per page profile; body_kb is filler text in <p> elements
+PAGE_PROFILES = {
+    'minimal': {'metas': 5, 'links': 3, 'json_ld': 0, 'images': 0, 'anchors': 5, 'body_kb': 2},
+    'typical': {'metas': 30, 'links': 15, 'json_ld': 2, 'images': 40, 'anchors': 80, 'body_kb': 60},
+    'heavy': {'metas': 200, 'links': 100, 'json_ld': 10, 'images': 3000, 'anchors': 1500, 'body_kb': 600},
+}
+
+TREE_EXTENSIONS = ('.html', '.html', '.html', '.htm', '.php', '.css', '.js', '.json', '.png', '.jpg', '.txt')
+FIXED_MTIME = 1704448800        # 2024-01-05, so lastmod values never depend on when the tree was written
+
+_WORDS = ('seo audit page title description canonical crawl index search engine structured data schema '
+          'product article review rating offer price stock image alt text link internal external sitemap '
+          'robots meta tag open graph twitter card mobile viewport performance render blocking script style').split()
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _json_ld(rng, index):
+    kind = ('Article', 'Product', 'FAQPage', 'BreadcrumbList', 'Organization')[index % 5]
+    if kind == 'Article':
+        data = {'@type': 'Article', 'headline': _sentence(rng, 8), 'datePublished': '2024-01-05',
+                'author': {'@type': 'Person', 'name': 'Author %d' % index}, 'image': 'https://www.example.com/a%d.png' % index}
+    elif kind == 'Product':
+        data = {'@type': 'Product', 'name': _sentence(rng, 4), 'image': 'https://www.example.com/p%d.png' % index,
+                'offers': {'@type': 'Offer', 'price': '%d.99' % rng.randrange(1, 500), 'priceCurrency': 'USD'},
+                'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': '4.%d' % rng.randrange(10), 'reviewCount': rng.randrange(1, 900)}}
+    elif kind == 'FAQPage':
+        data = {'@type': 'FAQPage', 'mainEntity': [
+            {'@type': 'Question', 'name': _sentence(rng, 6),
+             'acceptedAnswer': {'@type': 'Answer', 'text': _sentence(rng, 20)}} for _ in range(8)]}
+    elif kind == 'BreadcrumbList':
+        data = {'@type': 'BreadcrumbList', 'itemListElement': [
+            {'@type': 'ListItem', 'position': i + 1, 'name': rng.choice(_WORDS), 'item': 'https://www.example.com/c%d/' % i}
+            for i in range(4)]}
+    else:
+        data = {'@type': 'Organization', '@id': 'https://www.example.com/#org', 'name': 'Example', 'url': 'https://www.example.com/',
+                'logo': 'https://www.example.com/logo.png'}
+    data['@context'] = 'https://schema.org'
+    return json.dumps(data, indent=2)
+
+
+def generate_page(seed=0, metas=30, links=15, json_ld=2, images=40, anchors=80, body_kb=60):
+    """Returns one HTML page (str) with the requested tag mix."""
+    rng = random.Random(seed)
+    url = 'https://www.example.com/page-%d.html' % seed
+    head = ['<meta charset="utf-8">', '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            '<title>%s</title>' % _sentence(rng, 7)[:58],
+            '<meta name="description" content="%s">' % _sentence(rng, 22)[:150],
+            '<meta name="robots" content="index, follow">',
+            '<link rel="canonical" href="%s">' % url]
+    for i in range(metas):
+        kind = i % 4
+        if kind == 0:
+            head.append('<meta property="og:%s" content="%s">' % (('title', 'description', 'url', 'type', 'image')[i % 5], _sentence(rng, 5)))
+        elif kind == 1:
+            head.append('<meta name="twitter:%s" content="%s">' % (('card', 'site', 'title', 'description', 'image')[i % 5], _sentence(rng, 4)))
+        elif kind == 2:
+            head.append('<meta name="custom-%d" content="%s">' % (i, _sentence(rng, 6)))
+        else:
+            head.append('<meta http-equiv="x-dns-prefetch-control" content="on">')
+    for i in range(links):
+        kind = i % 5
+        if kind == 0:
+            head.append('<link rel="alternate" hreflang="%s" href="https://www.example.com/%s/page-%d.html">'
+                        % (('en', 'de', 'fr', 'es', 'x-default')[i % 5], ('en', 'de', 'fr', 'es', 'en')[i % 5], seed))
+        elif kind == 1:
+            head.append('<link rel="stylesheet" href="/css/s%d.css"%s>' % (i, ' media="print"' if i % 2 else ''))
+        elif kind == 2:
+            head.append('<link rel="preconnect" href="https://cdn%d.example.net">' % (i % 3))
+        elif kind == 3:
+            head.append('<script src="/js/app%d.js"%s></script>' % (i, ' defer' if i % 2 else ''))
+        else:
+            head.append('<link rel="icon" href="/favicon-%d.png" sizes="%dx%d">' % (i, 16 + i, 16 + i))
+    for i in range(json_ld):
+        head.append('<script type="application/ld+json">\n%s\n</script>' % _json_ld(rng, i))
+
+    body = ['<h1>%s</h1>' % _sentence(rng, 6)]
+    for i in range(images):
+        alt = ' alt="%s"' % _sentence(rng, 4) if i % 7 else ''
+        size = ' width="640" height="480"' if i % 3 else ''
+        body.append('<img src="/img/i%d.jpg"%s%s loading="lazy">' % (i, alt, size))
+    for i in range(anchors):
+        href = ('/page-%d.html' % rng.randrange(10000)) if i % 4 else 'https://external%d.example.org/' % (i % 50)
+        body.append('<a href="%s">%s</a>' % (href, rng.choice(_WORDS)))
+    filler, size = [], 0
+    while size < body_kb * 1024:
+        paragraph = '<p>%s</p>' % ' '.join(_sentence(rng) for _ in range(6))
+        filler.append(paragraph)
+        size += len(paragraph)
+    body.extend(filler)
+    return ('<!DOCTYPE html>\n<html lang="en">\n<head>\n' + '\n'.join(head) + '\n</head>\n<body>\n'
+            + '\n'.join(body) + '\n</body>\n</html>\n')
+
+
+def generate_profile_page(profile, seed=0):
+    return generate_page(seed=seed, **PAGE_PROFILES[profile])
+
+
+def generate_tree(root, files=10000, fanout=8, depth=3, seed=0):
+    """
+    Writes `files` small files into a nested directory tree under `root`
+    (an index.html per directory, plus skipped folders such as node_modules)
+    with fixed modification times. Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    directories = ['']
+    frontier = ['']
+    for level in range(depth):
+        frontier = [os.path.join(parent, 'section%d' % i) for parent in frontier for i in range(fanout)]
+        directories.extend(frontier)
+    directories.append('node_modules')
+    directories.append(os.path.join('section0', '.git'))
+    written = 0
+    for directory in directories:
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+    while written < files:
+        directory = directories[written % len(directories)] if written < len(directories) else rng.choice(directories)
+        name = 'index.html' if written < len(directories) else 'file%d%s' % (written, rng.choice(TREE_EXTENSIONS))
+        path = os.path.join(root, directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<html><head><title>%d</title></head><body></body></html>\n' % written)
+        os.utime(path, (FIXED_MTIME, FIXED_MTIME))
+        written += 1
+    return written
+
+
+def write_corpus(directory, pages=100, profile='typical', tree_files=1000):
+    """Writes `pages` HTML pages and a directory tree (for the sitemap generator) under `directory`."""
+    os.makedirs(os.path.join(directory, 'pages'), exist_ok=True)
+    for seed in range(pages):
+        with open(os.path.join(directory, 'pages', 'page-%d.html' % seed), 'w', encoding='utf-8') as f:
+            f.write(generate_profile_page(profile, seed))
+    generate_tree(os.path.join(directory, 'tree'), files=tree_files)
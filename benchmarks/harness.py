@@ -0,0 +1,154 @@
+"""
+Timing, statistics and baseline comparison.
+
+A case is timed after one warm-up call; each sample is one run() call.
+Latency is reported per unit (sample time / items), throughput as units per
+second over all samples. Peak RSS is the worker process's high-water mark.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from benchmarks import REPO_ROOT
+
+DEFAULT_TOLERANCE = 0.20        # Allowed slowdown / growth before a metric counts as a regression
+RSS_SLACK_MB = 5                # Ignore RSS differences below this (allocator noise)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:         # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_case(name, quick=False, warmup=1):
+    """Sets up and times one case in this process; returns its result dictionary."""
+    from benchmarks.cases import CASES
+    setup, unit, samples, quick_samples, budget_ms = CASES[name]
+    run, items = setup(quick)
+    for _ in range(warmup):
+        run()
+    timings = []
+    for _ in range(quick_samples if quick else samples):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    per_unit = sorted(sample / items for sample in timings)
+    return {
+        'case': name,
+        'unit': unit,
+        'samples': len(timings),
+        'items': items,
+        'throughput': items * len(timings) / sum(timings),
+        'p50_ms': percentile(per_unit, 0.50) * 1000,
+        'p99_ms': percentile(per_unit, 0.99) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        'budget_ms': budget_ms,
+    }
+
+
+def run_case_isolated(name, quick=False):
+    """Runs one case in a fresh interpreter (so peak RSS belongs to that case alone)."""
+    command = [sys.executable, '-m', 'benchmarks', '--worker', name] + (['--quick'] if quick else [])
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares results with a saved baseline (or None) and their budgets.
+    Returns [(case, metric, baseline value, new value)] for every
+    regression: throughput down or p50 up by more than `tolerance`, p99 up
+    by more than twice `tolerance` (tail latency is noisier), peak RSS up by
+    more than `tolerance` and RSS_SLACK_MB, or p50 over the case's budget
+    (reported as metric 'budget_ms').
+    """
+    regressions = []
+    for result in results:
+        if result.get('budget_ms') and result['p50_ms'] > result['budget_ms']:
+            regressions.append((result['case'], 'budget_ms', result['budget_ms'], result['p50_ms']))
+        base = (baseline or {}).get('cases', {}).get(result['case'])
+        if not base:
+            continue
+        name = result['case']
+        if result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append((name, 'throughput', base['throughput'], result['throughput']))
+        if result['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append((name, 'p50_ms', base['p50_ms'], result['p50_ms']))
+        if result['p99_ms'] > base['p99_ms'] * (1 + 2 * tolerance):
+            regressions.append((name, 'p99_ms', base['p99_ms'], result['p99_ms']))
+        if result['peak_rss_mb'] and base.get('peak_rss_mb') and \
+                result['peak_rss_mb'] > max(base['peak_rss_mb'] * (1 + tolerance), base['peak_rss_mb'] + RSS_SLACK_MB):
+            regressions.append((name, 'peak_rss_mb', base['peak_rss_mb'], result['peak_rss_mb']))
+    return regressions
+
+
+def _latency(ms):
+    return f"{ms * 1000:.1f} us" if ms < 1 else f"{ms:.2f} ms"
+
+
+def format_results(results, baseline=None, regressions=()):
+    """Formats the results table (with the change against the baseline when given)."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           B E N C H M A R K S")
+    lines.append("="*70)
+    for result in results:
+        base = (baseline or {}).get('cases', {}).get(result['case'])
+        change = f"  ({(result['throughput'] / base['throughput'] - 1) * 100:+.0f}% vs baseline)" if base else ""
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else "n/a"
+        lines.append(f"\n  {result['case']}")
+        lines.append(f"    > {result['throughput']:,.1f} {result['unit']}/s{change}")
+        lines.append(f"    > p50 {_latency(result['p50_ms'])} | p99 {_latency(result['p99_ms'])} per {result['unit'][:-1]}"
+                     f" | peak RSS {rss} | {result['samples']} samples")
+        if result.get('budget_ms'):
+            lines.append(f"    > budget: p50 under {_latency(result['budget_ms'])}")
+    over_budget = [item for item in regressions if item[1] == 'budget_ms']
+    if over_budget:
+        lines.append(f"\n--- Over Budget ({len(over_budget)}) ---")
+        for name, _, budget, p50 in over_budget:
+            lines.append(f"  ❌ {name}: p50 {_latency(p50)} (budget {_latency(budget)})")
+    regressions = [item for item in regressions if item[1] != 'budget_ms']
+    if baseline is not None:
+        lines.append(f"\n--- Regressions against baseline of {baseline.get('environment', {}).get('date', '?')} ({len(regressions)}) ---")
+        if not regressions:
+            lines.append("  ✅ No regressions.")
+        for name, metric, before, after in regressions:
+            lines.append(f"  ❌ {name}: {metric} {before:,.3f} -> {after:,.3f}")
+    lines.append("="*70)
+    return lines
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'cases': {result['case']: result for result in results}}, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -1,17 +1,61 @@
-import requests
-from bs4 import BeautifulSoup
+# requests, bs4 and fpdf are imported where they are first needed, so --help,
+# --version and runs that never fetch or write a PDF start quickly
 import json
 import os 
+import sqlite3
 import sys 
+import time
 from datetime import datetime
-# --- NEW IMPORT FOR PDF GENERATION ---
-from fpdf import FPDF # Requires: pip install fpdf2
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+from seokit.critical_path import analyze_critical_path, critical_path_findings
+from seokit.fetch import ResourceSizeCache, head_section, new_session, probe_status, read_html_stream, request_with_redirects, response_facts, x_robots_noindex
+from seokit.columns import FactsColumnWriter, column_names, load_fact_columns
+from seokit.pdf import PdfBatch, PdfRenderer, lines_to_blocks
+from seokit.jsonld import JsonLdIndex, describe_types, loads as loads_json, validate_index
+from seokit.schema import compile_validators, required_properties
+from seokit.scoring import compile_ruleset, load_ruleset
+from seokit.robots import GOOGLEBOT, RobotsCache
+from seokit.sitemap import ISSUES as ISSUES_BY_KIND, SitemapReader, format_sitemap_report
+from seokit.hreflang import HreflangValidator, format_hreflang_report
+from seokit.link_graph import LinkGraph, format_link_graph_report, resolve_internal_links
+from seokit.site_index import SiteIndex, normalize_url
+from seokit.store import AuditStore, format_history_report
+from seokit.traffic import INDEX_FILES, TrafficCounts, format_traffic_report
+from seokit.reconcile import TitleReconciler, format_reconcile_report
+from seokit.profiling import PROFILER, run_profiled, span, stage_laps
+from seokit.server import DEFAULT_PORT as SERVE_PORT, AuditServer
+from seokit.diff import RunDiff, SortedPages, format_diff_report, join_pages
+from seokit.summary import SiteSummary, format_summary_report, iter_jsonl_range, jsonl_chunks
+from seokit.site_files import HTML_EXTENSIONS, AuditManifest, file_digest, iter_site_files, read_ahead, read_html_file, read_local_page
+from seokit import __version__, metrics
 
 # --- CONFIGURATION CONSTANTS FOR QUALITY ANALYSIS ---
 MAX_TITLE_CHARS = 60    # Recommended maximum character length for Google Title
 MAX_DESC_CHARS = 160    # Recommended maximum character length for Google Meta Description
 MIN_DESC_CHARS = 70     # Recommended minimum character length for a good description
 
+# --- CONFIGURATION CONSTANTS FOR FETCHING ---
+MAX_FETCH_BYTES = 5 * 1024 * 1024   # Pages are cut off after this many bytes
+STATUS_SWEEP_WORKERS = 32           # Concurrent requests (and pooled connections) for `status` sweeps
+ROBOTS_USER_AGENT = 'seo-toolkit'   # robots.txt group obeyed by bulk audits and sweeps (falls back to "*")
+LOCAL_SITE_BASE = 'file:///'        # Site root the files of `audit --dir` are linked under (see page_url_for)
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+}
+
+# --- METRICS (Prometheus text on --metrics-port; see seokit/metrics.py) ---
+PAGES_METRIC = metrics.counter('seokit_pages_total', 'Bulk audit targets handled, by result (ok, failed, blocked).', ('result',))
+FETCH_BYTES_METRIC = metrics.counter('seokit_fetch_bytes_total', 'HTML bytes downloaded.')
+HTTP_RESPONSES_METRIC = metrics.counter('seokit_http_responses_total', 'HTTP responses (after redirects), by status code.', ('status',))
+FETCH_ERRORS_METRIC = metrics.counter('seokit_fetch_errors_total', 'Requests that failed without an HTTP response.')
+PARSE_SECONDS_METRIC = metrics.histogram('seokit_parse_seconds', 'Time to parse one HTML document.')
+AUDIT_SECONDS_METRIC = metrics.histogram('seokit_audit_seconds', 'Time to audit one page (parse, analysis and scoring).')
+
 # --- CONFIGURATION CONSTANTS FOR SCORING ---
 MAX_SCORE = 100 # The total possible score
 # Weights for critical factors (must sum to <= 100)
@@ -40,18 +84,105 @@ GRADING_SCALE = {
     0: 'F', # Anything below 50
 }
 
+# Deductions for problems seen in the HTTP response (URL audits only)
+HTTP_PENALTIES = {
+    'Redirect_Chain': 5,               # More than one redirect before the page
+    'X_Robots_Noindex': 20,            # X-Robots-Tag header keeps the page out of the index
+    'Header_Canonical_Conflict': 10,   # Link: rel=canonical header disagrees with the HTML canonical
+    'Uncompressed': 3,                 # HTML served without gzip/br compression
+    'Robots_Txt_Blocked': 15,          # Indexable by meta robots, but Googlebot may not crawl it
+}
 
-# --- SCHEMA REQUIRED PROPERTY DEFINITIONS (Simplified Google set) ---
-# Maps schema type to a list of properties Google requires for Rich Results
-SCHEMA_REQUIREMENTS = {
-    "Article": ["headline", "image", "datePublished"],
-    "TechArticle": ["headline", "image", "datePublished"],
-    "NewsArticle": ["headline", "image", "datePublished", "dateModified"],
-    "Product": ["name", "image", "description", "offers"],
-    "Recipe": ["name", "image", "description", "aggregateRating", "recipeIngredient"],
-    "FAQPage": ["mainEntity"]
+# Site-level deductions applied during bulk audits (points off the page score)
+SITE_PENALTIES = {
+    'Duplicate_Title': 5,          # Several pages compete for the same query
+    'Duplicate_Description': 5,    # Identical snippets across pages
+    'Near_Duplicate': 3,           # Title + description almost identical to another page
+    'Canonical_Chain': 5,          # Canonical points at a page that canonicalizes elsewhere
+    'Canonical_Cycle': 10,         # Canonicals loop; Google has to guess
+    'Hreflang_Errors': 5,          # Non-reciprocal, non-canonical or invalid hreflang annotations
 }
 
+def default_scoring_ruleset():
+    """
+    The built-in declarative ruleset (see seokit/scoring.py), derived from the
+    constants above. Dump it with `seo-checker.py rules --dump`, edit the
+    copy and pass it back with --rules to tune scoring per site.
+    """
+    w = SCORE_WEIGHTS
+    return {
+        'max_score': MAX_SCORE,
+        'grading_scale': {str(k): v for k, v in GRADING_SCALE.items()},
+        'params': {'max_title_chars': MAX_TITLE_CHARS, 'min_desc_chars': MIN_DESC_CHARS, 'max_desc_chars': MAX_DESC_CHARS},
+        'rules': [
+            {'id': 'Canonical_Present', 'weight': w['Canonical_Present'], 'severity': 'critical',
+             'when': {'field': 'canonical', 'op': 'present'}},
+            # A missing robots tag means "index, follow", so only noindex loses these points
+            {'id': 'Robots_Optimal', 'weight': w['Robots_Optimal'], 'severity': 'critical',
+             'when': {'field': 'robots_noindex', 'op': 'false'}},
+            {'id': 'Title_Optimal', 'weight': w['Title_Optimal'], 'severity': 'warning',
+             'when': {'all': [{'field': 'title_length', 'op': '>', 'value': 0},
+                              {'field': 'title_length', 'op': '<=', 'value': '$max_title_chars'}]},
+             'partial': [{'when': {'field': 'title_length', 'op': '>', 'value': '$max_title_chars'}, 'credit': 0.5}]},
+            {'id': 'Description_Optimal', 'weight': w['Description_Optimal'], 'severity': 'warning',
+             'when': {'all': [{'field': 'description_length', 'op': '>=', 'value': '$min_desc_chars'},
+                              {'field': 'description_length', 'op': '<=', 'value': '$max_desc_chars'}]},
+             'partial': [{'when': {'field': 'description_length', 'op': '>', 'value': 0}, 'credit': 0.5}]},
+            {'id': 'Hreflang_Present', 'weight': w['Hreflang_Present'], 'severity': 'info',
+             'when': {'field': 'hreflang_count', 'op': '>', 'value': 0}},
+            {'id': 'OpenGraph_Present', 'weight': w['OpenGraph_Present'], 'severity': 'warning',
+             'when': {'field': 'og_count', 'op': '>', 'value': 0}},
+            {'id': 'TwitterCard_Present', 'weight': w['TwitterCard_Present'], 'severity': 'warning',
+             'when': {'field': 'twitter_count', 'op': '>', 'value': 0}},
+            {'id': 'Schema_Valid', 'weight': w['Schema_Valid'], 'severity': 'warning',
+             'ratio': {'numerator': 'schema_valid', 'denominator': 'schema_checked', 'empty': 0}},
+            # No images is not penalized
+            {'id': 'Image_Alt_Optimal', 'weight': w['Image_Alt_Optimal'], 'severity': 'warning',
+             'ratio': {'numerator': 'images_missing_alt', 'denominator': 'images_total', 'invert': True, 'empty': 1}},
+            # HTTP response penalties (the facts are 0/False for local files)
+            {'id': 'Redirect_Chain', 'weight': HTTP_PENALTIES['Redirect_Chain'], 'severity': 'warning', 'penalty': True,
+             'when': {'field': 'redirect_hops', 'op': '>', 'value': 1}},
+            {'id': 'X_Robots_Noindex', 'weight': HTTP_PENALTIES['X_Robots_Noindex'], 'severity': 'critical', 'penalty': True,
+             'when': {'field': 'x_robots_noindex', 'op': 'true'}},
+            {'id': 'Header_Canonical_Conflict', 'weight': HTTP_PENALTIES['Header_Canonical_Conflict'], 'severity': 'critical', 'penalty': True,
+             'when': {'field': 'header_canonical_conflict', 'op': 'true'}},
+            {'id': 'Uncompressed', 'weight': HTTP_PENALTIES['Uncompressed'], 'severity': 'info', 'penalty': True,
+             'when': {'all': [{'field': 'http_status', 'op': '>', 'value': 0}, {'field': 'compressed', 'op': 'false'}]}},
+            {'id': 'Robots_Txt_Blocked', 'weight': HTTP_PENALTIES['Robots_Txt_Blocked'], 'severity': 'critical', 'penalty': True,
+             'when': {'all': [{'field': 'robots_txt_blocked', 'op': 'true'}, {'field': 'robots_noindex', 'op': 'false'}]}},
+        ],
+        'site_penalties': dict(SITE_PENALTIES),
+    }
+
+# Fact fields rules can read: the keys of extract_page_facts()
+PAGE_FACT_FIELDS = (
+    'title', 'title_length', 'description', 'description_length', 'canonical', 'robots', 'robots_noindex',
+    'hreflang_count', 'og_count', 'twitter_count', 'schema_checked', 'schema_valid', 'images_total',
+    'images_missing_alt', 'outgoing_links', 'blocking_scripts', 'blocking_stylesheets', 'blocking_bytes',
+    'render_blocking_ms', 'images_missing_dimensions', 'http_status', 'redirect_hops', 'x_robots_noindex',
+    'robots_txt_blocked', 'header_canonical_conflict', 'compressed',
+)
+
+def compile_scoring_rules(ruleset):
+    """Compiles a ruleset, rejecting rules that read fields pages do not have."""
+    return compile_ruleset(ruleset, known_fields=PAGE_FACT_FIELDS)
+
+# The active, compiled ruleset (replaced by --rules FILE)
+SCORING_RULES = compile_scoring_rules(default_scoring_ruleset())
+
+def use_scoring_rules(path):
+    """Loads and compiles a ruleset file and makes it the active one."""
+    global SCORING_RULES
+    SCORING_RULES = compile_scoring_rules(load_ruleset(path))
+    return SCORING_RULES
+
+
+# --- SCHEMA REQUIRED PROPERTY DEFINITIONS (Simplified Google set) ---
+# Maps schema type to a list of properties Google requires for Rich Results.
+# Both are derived from the registry shared with seo-html-generator.py (seokit/schema.py).
+SCHEMA_REQUIREMENTS = required_properties()
+SCHEMA_VALIDATORS = compile_validators()
+
 # --- EXHAUSTIVE TAG DEFINITIONS (New for v2) ---
 
 # Link relations for icons, PWA, and device features
@@ -102,35 +233,29 @@ def format_link_rel_category(title, data, buffer_list):
     else:
         buffer_list.append("  (None Found)")
 
-def perform_metadata_audit(html_content, source_name):
+def extract_metadata(html_content):
     """
-    Parses HTML content, extracts all metadata, generates reports, and returns 
-    the complete report as a single string.
+    Parses HTML content and extracts all metadata into the results dictionary.
+    Returns (results, soup).
     """
-    output_buffer = [] # The list that will hold all report lines
-    
-    output_buffer.append(f"\n--- Running Audit for: {source_name} ---")
-    output_buffer.append(f"--- Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n")
-    
-    try:
-        # Comprehensive results dictionary structure
-        results = {
-            'ESSENTIAL_HTML_TAGS': {},
-            'CORE_SEO_TAGS': {'Canonical': '❌ MISSING', 'Hreflang_Tags': [], 'Robots': '❌ MISSING', 'Description': '❌ MISSING'},
-            'SOCIAL_MEDIA_TAGS': {'OPEN_GRAPH': {}, 'TWITTER_CARD': {}},
-            'PWA_MOBILE_TAGS': {},
-            'TECHNICAL_BROWSER_TAGS': {},
-            'CRITICAL_LINK_TAGS': {},
-            'ALL_OTHER_META_TAGS': {}, 
-            'JSON_LD_STRUCTURED_DATA': []
-        }
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-    except Exception as e:
-        output_buffer.append(f"❌ ERROR: An unexpected error occurred during parsing. ({e})\n")
-        # Print to console immediately
-        print("".join(output_buffer))
-        return None
+    # Comprehensive results dictionary structure
+    results = {
+        'ESSENTIAL_HTML_TAGS': {},
+        'CORE_SEO_TAGS': {'Canonical': '❌ MISSING', 'Hreflang_Tags': [], 'Robots': '❌ MISSING', 'Description': '❌ MISSING'},
+        'SOCIAL_MEDIA_TAGS': {'OPEN_GRAPH': {}, 'TWITTER_CARD': {}},
+        'PWA_MOBILE_TAGS': {},
+        'TECHNICAL_BROWSER_TAGS': {},
+        'CRITICAL_LINK_TAGS': {},
+        'ALL_OTHER_META_TAGS': {}, 
+        'JSON_LD_STRUCTURED_DATA': [],
+        'LINKS': []
+    }
+    from bs4 import BeautifulSoup
+    laps = stage_laps()
+    started = time.perf_counter()
+    soup = BeautifulSoup(html_content, 'html.parser')
+    PARSE_SECONDS_METRIC.observe(time.perf_counter() - started)
+    laps.mark('parse')
 
     # --- CORE EXTRACTION LOGIC (Same as before) ---
     title_tag = soup.find('title')
@@ -194,22 +319,69 @@ def perform_metadata_audit(html_content, source_name):
             key = name if name else prop
             results['ALL_OTHER_META_TAGS'][key] = content
 
-    # 3. JSON-LD STRUCTURED DATA
+    # 3. OUTGOING LINKS (Followed <a href> values, resolved later against the page URL)
+    results['LINKS'] = [
+        a['href'] for a in soup.find_all('a', href=True)
+        if 'nofollow' not in (a.get('rel') or [])
+    ]
+
+    laps.mark('extract')
+
+    # 4. JSON-LD STRUCTURED DATA (Every script goes into one page-wide @id/@type index)
+    json_ld_index = JsonLdIndex()
     for i, script in enumerate(soup.find_all('script', type='application/ld+json'), 1):
         try:
             json_string = script.string.strip()
-            json_content = json.loads(json_string)
+            json_content = loads_json(json_string)
+            json_ld_index.add(json_content)
             results['JSON_LD_STRUCTURED_DATA'].append(
                 {'Script_ID': f"#{i}", 
-                 'Schema_Type': json_content.get('@type', 'Unknown Type'), 
+                 'Schema_Type': describe_types(json_content), 
                  'Content_Snippet': json_string.replace('\n', '')[:100] + '...',
                  'Full_Content_Object': json_content 
                 }
             )
-        except:
+        except Exception:
              results['JSON_LD_STRUCTURED_DATA'].append({'Script_ID': f"#{i}", 'Schema_Type': '⚠️ PARSE ERROR', 'Content_Snippet': 'Error parsing JSON', 'Full_Content_Object': None})
+    results['JSON_LD_INDEX'] = json_ld_index
+    laps.mark('jsonld')
+
+    return results, soup
+
+def audit_html(html_content, source_name, head_only=False, http_info=None, resource_sizes=None):
+    """
+    Runs extraction, quality analysis and scoring on an HTML string and returns
+    the audit dictionary shared by the text report, bulk audits and exports.
+    With head_only, body-level checks (images, links) are skipped. `http_info`
+    (see fetch_page) adds the status, redirect chain and response headers;
+    `resource_sizes` (a ResourceSizeCache) measures render-blocking resources.
+    Raises on input that cannot be parsed.
+    """
+    results, soup = extract_metadata(html_content)
+    results['HTTP'] = http_info
+    if head_only:
+        results['LINKS'] = []
+    with span('quality'):
+        quality_checks = analyze_tag_quality(results, soup, head_only=head_only, resource_sizes=resource_sizes)
+    with span('score'):
+        score_percent, letter_grade = generate_overall_score_and_grade(results, quality_checks)
+    return {
+        'Source': source_name,
+        'Results': results,
+        'Quality_Checks': quality_checks,
+        'Score': score_percent,
+        'Grade': letter_grade,
+        'Head_Only': head_only,
+    }
+
+def format_audit_report(audit):
+    """Formats an audit dictionary (see audit_html) into the list of report lines."""
+    results = audit['Results']
+    quality_checks = audit['Quality_Checks']
+    json_ld_index = results['JSON_LD_INDEX']
+    output_buffer = []
 
-    # 4. Generate Audit Report to Buffer (This section is unchanged)
+    # 4. Generate Audit Report to Buffer
     output_buffer.append("="*70)
     output_buffer.append("           C O M P R E H E N S I V E   M E T A D A T A   A U D I T")
     output_buffer.append("="*70)
@@ -250,25 +422,63 @@ def perform_metadata_audit(html_content, source_name):
         for item in results['JSON_LD_STRUCTURED_DATA']:
             output_buffer.append(f"  {item['Script_ID']} [Type: {item['Schema_Type']}]")
             output_buffer.append(f"    Snippet: {item['Content_Snippet']}")
+        output_buffer.append(f"  Entities indexed: {len(json_ld_index.entities)} typed, {len(json_ld_index.by_id)} with @id, {len(json_ld_index.references)} @id reference(s).")
     else:
         output_buffer.append("❌ No JSON-LD Structured Data Found.")
+
+    http_info = results.get('HTTP')
+    if http_info:
+        output_buffer.append("\n--- 10. HTTP RESPONSE (Status, Redirects, Headers) ---")
+        output_buffer.append(f"  > {'Status':<35}: {http_info['Status']} ({http_info['Elapsed_Ms']} ms)")
+        if http_info['Redirect_Chain']:
+            for hop in http_info['Redirect_Chain']:
+                output_buffer.append(f"  > {'Redirect (' + str(hop['status']) + ')':<35}: {hop['url']}")
+            output_buffer.append(f"  > {'Final URL':<35}: {http_info['Final_URL']}")
+        for label, key in (('X-Robots-Tag', 'X_Robots_Tag'), ('Link rel=canonical', 'Link_Canonical'),
+                           ('Content-Encoding', 'Content_Encoding'), ('Cache-Control', 'Cache_Control'),
+                           ('ETag', 'ETag'), ('Last-Modified', 'Last_Modified'), ('Vary', 'Vary')):
+            output_buffer.append(f"  > {label:<35}: {http_info[key] or '(not set)'}")
+        robots_txt = http_info.get('Robots_Txt')
+        if robots_txt:
+            verdict = 'allowed' if robots_txt['Allowed'] else 'BLOCKED'
+            output_buffer.append(f"  > {'robots.txt (Googlebot)':<35}: {verdict}{' (' + robots_txt['Rule'] + ')' if robots_txt['Rule'] else ''}")
     output_buffer.append("="*70)
 
-    # 5. Run Quality Analysis
-    quality_checks = analyze_tag_quality(results, soup)
-    
-    # --- NEW SCORING FEATURE INTEGRATION ---
-    score_percent, letter_grade = generate_overall_score_and_grade(results, quality_checks)
-    
+    # 5. Overall Score (computed by audit_html)
     output_buffer.append("\n\n" + "#"*70)
     output_buffer.append(f"       🌟 O V E R A L L   S E O   S C O R E   &   G R A D E 🌟")
     output_buffer.append("#"*70)
-    output_buffer.append(f"          Current Score: {score_percent}%")
-    output_buffer.append(f"          Final Grade: **{letter_grade}**")
+    output_buffer.append(f"          Current Score: {audit['Score']}%")
+    output_buffer.append(f"          Final Grade: **{audit['Grade']}**")
     output_buffer.append("#"*70)
 
     # 6. Generate the detailed remediation report
     output_buffer.extend(generate_remediation_report(results, quality_checks))
+    return output_buffer
+
+def perform_metadata_audit(html_content, source_name, head_only=False, http_info=None):
+    """
+    Parses HTML content, extracts all metadata, generates reports, and returns 
+    the complete report as a single string.
+    """
+    output_buffer = [] # The list that will hold all report lines
+    
+    output_buffer.append(f"\n--- Running Audit for: {source_name} ---")
+    output_buffer.append(f"--- Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
+    if head_only:
+        output_buffer.append("--- Mode: head-only (image and body checks skipped) ---")
+    output_buffer.append("")
+    
+    try:
+        audit = audit_html(html_content, source_name, head_only=head_only, http_info=http_info)
+    except Exception as e:
+        output_buffer.append(f"❌ ERROR: An unexpected error occurred during parsing. ({e})\n")
+        # Print to console immediately
+        print("".join(output_buffer))
+        return None
+
+    with span('report'):
+        output_buffer.extend(format_audit_report(audit))
     
     # Print the full report to the console before returning
     print("\n".join(output_buffer))
@@ -280,14 +490,17 @@ def perform_metadata_audit(html_content, source_name):
 # 2. HELPER FUNCTIONS (Quality Analysis and Remediation)
 # ----------------------------------------------------------------------
 
-def analyze_tag_quality(results, soup):
-    """Analyzes the content quality, length, and technical elements."""
+def analyze_tag_quality(results, soup, head_only=False, resource_sizes=None):
+    """Analyzes the content quality, length, and technical elements (head_only skips body checks)."""
     quality_checks = {
         'Title': {'Status': '❌ MISSING', 'Length': 0, 'Recommendation': ''},
         'Description': {'Status': '❌ MISSING', 'Length': 0, 'Recommendation': ''},
         'Image_Alt_Text': {'Total': 0, 'Missing': 0, 'Recommendation': ''},
-        'Render_Blocking_JS': [],
-        'Schema_Validation': []
+        'Critical_Path': {},
+        'Performance': [],
+        'Schema_Validation': [],
+        'Schema_Summary': {'Checked': 0, 'Valid': 0},
+        'HTTP_Headers': []
     }
     
     # Title Quality Check
@@ -318,7 +531,7 @@ def analyze_tag_quality(results, soup):
             quality_checks['Description']['Recommendation'] = f'Description length is good ({length}/{MAX_DESC_CHARS} chars).'
     
     # Image Alt Text Check (UX/Accessibility)
-    all_images = soup.find_all('img')
+    all_images = [] if head_only else soup.find_all('img')
     missing_alt = sum(1 for img in all_images if not img.get('alt'))
     quality_checks['Image_Alt_Text']['Total'] = len(all_images)
     quality_checks['Image_Alt_Text']['Missing'] = missing_alt
@@ -327,117 +540,91 @@ def analyze_tag_quality(results, soup):
             quality_checks['Image_Alt_Text']['Recommendation'] = f'❌ {missing_alt} out of {len(all_images)} images are missing "alt" text. Fix this for accessibility and Image SEO.'
         else:
             quality_checks['Image_Alt_Text']['Recommendation'] = '✅ All images have "alt" text.'
+    elif head_only:
+        quality_checks['Image_Alt_Text']['Recommendation'] = 'ℹ️ Skipped (head-only audit).'
     else:
         quality_checks['Image_Alt_Text']['Recommendation'] = 'No <img> tags found.'
 
-    # Render-Blocking JS Check (Performance)
-    for script in soup.find_all('script'):
-        src = script.get('src')
-        if src and not script.get('async') and not script.get('defer') and not src.startswith('//cdnjs'):
-            quality_checks['Render_Blocking_JS'].append(f'JS: {src[:50]}...')
-            
-    if quality_checks['Render_Blocking_JS']:
-        quality_checks['Render_Blocking_JS'].insert(0, '⚠️ Potential render-blocking script(s) found. Consider adding `defer` or `async` to these tags.')
-    else:
-        quality_checks['Render_Blocking_JS'] = ['✅ No obvious render-blocking JavaScript files detected.']
+    # Critical Rendering Path Check (Performance): blocking JS/CSS, @import, hints, image dimensions
+    http_info = results.get('HTTP')
+    canonical = _tag_value(results['CORE_SEO_TAGS']['Canonical'])
+    page_url = http_info['Final_URL'] if http_info else (canonical if canonical.startswith(('http://', 'https://')) else '')
+    analysis = analyze_critical_path(soup, page_url, sizes=resource_sizes.sizes if resource_sizes and page_url else None)
+    quality_checks['Critical_Path'] = analysis
+    quality_checks['Performance'] = critical_path_findings(analysis)
 
-    # Schema Validation Check
+    # Schema Validation Check (every indexed entity: @graph members, array items and nested objects)
+    parsed_scripts = []
     for item in results['JSON_LD_STRUCTURED_DATA']:
-        schema_type = item['Schema_Type'].split()[0].replace('⚠️', '') 
-        full_json_content = item.get('Full_Content_Object')
-
-        if not full_json_content:
+        if not item.get('Full_Content_Object'):
+             schema_type = item['Schema_Type'].split()[0].replace('⚠️', '')
              quality_checks['Schema_Validation'].append(f'❌ {schema_type}: Cannot validate, original JSON was malformed or could not be loaded.')
-             continue
-
-        if schema_type in SCHEMA_REQUIREMENTS:
-            try:
-                required_props = SCHEMA_REQUIREMENTS[schema_type]
-                missing_props = [
-                    prop for prop in required_props 
-                    if prop not in full_json_content or not full_json_content.get(prop)
-                ]
-                
-                if not missing_props:
-                    quality_checks['Schema_Validation'].append(f'✅ {schema_type}: All required properties are present.')
-                else:
-                    quality_checks['Schema_Validation'].append(f'⚠️ {schema_type}: Missing required properties: {", ".join(missing_props)}.')
-            except Exception as e:
-                quality_checks['Schema_Validation'].append(f'❌ {schema_type}: Validation failed unexpectedly. ({e})')
+             quality_checks['Schema_Summary']['Checked'] += 1
         else:
-            quality_checks['Schema_Validation'].append(f'ℹ️ {schema_type}: Unknown schema type or no specific Google requirements.')
+            parsed_scripts.append(item)
+
+    json_ld_index = results.get('JSON_LD_INDEX')
+    if parsed_scripts and json_ld_index is not None:
+        try:
+            findings = validate_index(json_ld_index, SCHEMA_VALIDATORS)
+        except Exception as e:
+            findings = []
+            quality_checks['Schema_Validation'].append(f'❌ JSON-LD: Validation failed unexpectedly. ({e})')
+            quality_checks['Schema_Summary']['Checked'] += 1
+
+        for label, _, missing_props in findings:
+            quality_checks['Schema_Summary']['Checked'] += 1
+            if not missing_props:
+                quality_checks['Schema_Summary']['Valid'] += 1
+                quality_checks['Schema_Validation'].append(f'✅ {label}: All required properties are present.')
+            else:
+                quality_checks['Schema_Validation'].append(f'⚠️ {label}: Missing required properties: {", ".join(missing_props)}.')
+
+        for label, ref in json_ld_index.unresolved_references():
+            quality_checks['Schema_Validation'].append(f'⚠️ {label or "JSON-LD"}: References @id "{ref}", which is not declared on this page.')
+
+        if not findings:
+            for item in parsed_scripts:
+                quality_checks['Schema_Validation'].append(f'ℹ️ {item["Schema_Type"]}: Unknown schema type or no specific Google requirements.')
+
+    # HTTP Response Check (URL audits only)
+    if http_info:
+        checks = quality_checks['HTTP_Headers']
+        hops = len(http_info['Redirect_Chain'])
+        if hops > 1:
+            checks.append(f'⚠️ {hops} redirects before the page. Link straight to {http_info["Final_URL"]}.')
+        elif hops == 1:
+            checks.append(f'ℹ️ One redirect ({http_info["Redirect_Chain"][0]["status"]}) before the page.')
+        if x_robots_noindex(http_info['X_Robots_Tags']):
+            checks.append(f'❌ X-Robots-Tag header "{http_info["X_Robots_Tag"]}" keeps this page out of the index.')
+        if http_info['Link_Canonical'] and canonical and normalize_url(http_info['Link_Canonical']) != normalize_url(canonical):
+            checks.append(f'❌ Link header canonical ({http_info["Link_Canonical"]}) differs from the HTML canonical ({canonical}).')
+        robots_txt = http_info.get('Robots_Txt')
+        if robots_txt and not robots_txt['Allowed']:
+            if 'noindex' in _tag_value(results['CORE_SEO_TAGS']['Robots']).lower():
+                checks.append(f'⚠️ robots.txt blocks Googlebot ({robots_txt["Rule"]}), so the noindex is never seen; the URL can still be indexed from links.')
+            else:
+                checks.append(f'❌ Indexable by meta robots but blocked by robots.txt ({robots_txt["Rule"]}). Google can index the URL without its content.')
+        if not http_info['Compressed']:
+            checks.append('⚠️ HTML is served uncompressed. Enable gzip or Brotli on the server.')
+        if not (http_info['Cache_Control'] or http_info['Expires'] or http_info['ETag'] or http_info['Last_Modified']):
+            checks.append('ℹ️ No caching headers (Cache-Control, Expires, ETag or Last-Modified).')
+        if not checks:
+            checks.append('✅ Direct response with compression and caching headers, no conflicting robots or canonical headers.')
 
     return quality_checks
 
 def generate_overall_score_and_grade(results, quality_checks):
-    """Calculates the overall SEO score and converts it to a letter grade."""
-    current_score = 0
-    
-    # 1. Canonical Link (20 Points)
-    if results['CORE_SEO_TAGS']['Canonical'] != '❌ MISSING':
-        current_score += SCORE_WEIGHTS['Canonical_Present']
-    
-    # 2. Robots Tag (10 Points)
-    robots = results['CORE_SEO_TAGS']['Robots'].lower()
-    if robots != '❌ MISSING' and 'noindex' not in robots:
-        current_score += SCORE_WEIGHTS['Robots_Optimal']
-        
-    # 3. Title Quality (15 Points)
-    if quality_checks['Title']['Status'] == '✅ OPTIMAL':
-        current_score += SCORE_WEIGHTS['Title_Optimal']
-    elif quality_checks['Title']['Status'] in ['⚠️ TOO LONG', '⚠️ TOO SHORT']:
-        # Assign partial credit if present but not optimal (e.g., half points)
-        current_score += SCORE_WEIGHTS['Title_Optimal'] * 0.5 
-        
-    # 4. Description Quality (15 Points)
-    if quality_checks['Description']['Status'] == '✅ OPTIMAL':
-        current_score += SCORE_WEIGHTS['Description_Optimal']
-    elif quality_checks['Description']['Status'] in ['⚠️ TOO LONG', '⚠️ TOO SHORT']:
-        current_score += SCORE_WEIGHTS['Description_Optimal'] * 0.5 
-        
-    # 5. Hreflang Tags (5 Points)
-    if results['CORE_SEO_TAGS']['Hreflang_Tags']:
-        current_score += SCORE_WEIGHTS['Hreflang_Present']
-        
-    # 6. Open Graph Tags (5 Points)
-    if results['SOCIAL_MEDIA_TAGS']['OPEN_GRAPH']:
-        current_score += SCORE_WEIGHTS['OpenGraph_Present']
-        
-    # 7. Twitter Card Tags (5 Points)
-    if results['SOCIAL_MEDIA_TAGS']['TWITTER_CARD']:
-        current_score += SCORE_WEIGHTS['TwitterCard_Present']
-
-    # 8. Schema Validation (15 Points)
-    valid_schemas = sum(1 for status in quality_checks['Schema_Validation'] if status.startswith('✅'))
-    total_schemas = len(results['JSON_LD_STRUCTURED_DATA'])
-    if total_schemas > 0:
-        # Score proportional to the number of valid schemas
-        schema_points = SCORE_WEIGHTS['Schema_Valid'] * (valid_schemas / total_schemas)
-        current_score += schema_points
-
-    # 9. Image Alt Text (10 Points)
-    total_images = quality_checks['Image_Alt_Text']['Total']
-    missing_alt = quality_checks['Image_Alt_Text']['Missing']
-    if total_images > 0:
-        # Score proportional to the number of images with alt text
-        alt_points = SCORE_WEIGHTS['Image_Alt_Optimal'] * (1 - (missing_alt / total_images))
-        current_score += alt_points
-    # If no images, we don't penalize, so we assume optimal (10 points)
-    elif total_images == 0:
-        current_score += SCORE_WEIGHTS['Image_Alt_Optimal']
-        
-    # Calculate the final percentage and round the score
-    percentage = round((current_score / MAX_SCORE) * 100)
-
-    # Determine the letter grade
-    final_grade = 'N/A'
-    # Iterate through the scale keys in descending order
-    for threshold, grade in sorted(GRADING_SCALE.items(), reverse=True):
-        if percentage >= threshold:
-            final_grade = grade
-            break
-            
-    return percentage, final_grade
+    """Calculates the overall SEO score and converts it to a letter grade using SCORING_RULES."""
+    return SCORING_RULES.score(extract_page_facts(results, quality_checks))
+
+def grade_ranks():
+    """Maps each letter grade of the active scale to a rank (higher is better)."""
+    return {grade: len(SCORING_RULES.grading) - i for i, (_, grade) in enumerate(SCORING_RULES.grading)}
+
+def grade_for_percentage(percentage):
+    """Converts a score percentage to its letter grade using the active grading scale."""
+    return SCORING_RULES.grade(percentage)
 
 def generate_remediation_report(results, quality_checks):
     """Generates a list of missing and required items with actionable fixes."""
@@ -457,21 +644,29 @@ def generate_remediation_report(results, quality_checks):
     suggested_image = "https://www.yourdomain.com/social-image-1200x630.jpg"
     og_image = results['SOCIAL_MEDIA_TAGS']['OPEN_GRAPH'].get('og:image')
     twitter_image = results['SOCIAL_MEDIA_TAGS']['TWITTER_CARD'].get('twitter:image')
-    json_ld_scripts = results['JSON_LD_STRUCTURED_DATA']
 
     if og_image:
         suggested_image = og_image
     elif twitter_image:
         suggested_image = twitter_image
-    elif json_ld_scripts and json_ld_scripts[0]['Schema_Type'] != '⚠️ PARSE ERROR':
-        try:
-            full_content = json_ld_scripts[0]['Full_Content_Object']
-            if full_content.get('image'):
-                suggested_image = full_content['image']
-            elif full_content.get('publisher', {}).get('logo', {}).get('url'):
-                suggested_image = full_content['publisher']['logo']['url']
-        except:
-             pass 
+    elif results.get('JSON_LD_INDEX') is not None:
+        json_ld_index = results['JSON_LD_INDEX']
+        for _, entity in json_ld_index.iter_entities():
+            try:
+                image = entity.get('image')
+                logo = (json_ld_index.resolve(entity.get('publisher')) or {}).get('logo', {})
+                if isinstance(image, list) and image:
+                    image = image[0]
+                if isinstance(image, dict):
+                    image = image.get('url')
+                if isinstance(image, str) and image:
+                    suggested_image = image
+                    break
+                if isinstance(logo, dict) and logo.get('url'):
+                    suggested_image = logo['url']
+                    break
+            except AttributeError:
+                continue
     
     example_url = "https://www.yourdomain.com/this-page-path"
 
@@ -528,10 +723,13 @@ def generate_remediation_report(results, quality_checks):
     output_buffer.append(f"  > {quality_checks['Description']['Recommendation']}")
     output_buffer.append(f"\n--- Image Alt Text Check ---")
     output_buffer.append(f"  > {quality_checks['Image_Alt_Text']['Recommendation']}")
-    output_buffer.append(f"\n--- Performance Check (Render Blocking JS) ---")
-    for item in quality_checks['Render_Blocking_JS']: output_buffer.append(f"  > {item}")
+    output_buffer.append(f"\n--- Performance Check (Critical Rendering Path) ---")
+    for item in quality_checks['Performance']: output_buffer.append(f"  > {item}")
     output_buffer.append(f"\n--- Structured Data (Schema) Validation ---")
     for item in quality_checks['Schema_Validation']: output_buffer.append(f"  > {item}")
+    if quality_checks.get('HTTP_Headers'):
+        output_buffer.append(f"\n--- HTTP Response Headers ---")
+        for item in quality_checks['HTTP_Headers']: output_buffer.append(f"  > {item}")
     output_buffer.append("\n" + "="*70)
     
     # FINAL REMEDIATION OUTPUT
@@ -556,28 +754,85 @@ def generate_remediation_report(results, quality_checks):
 # 3. CONTENT SOURCE WRAPPERS (With robust headers for URL fetch)
 # ----------------------------------------------------------------------
 
-def save_report_to_pdf(report_content, filename):
-    """Saves the report content to a PDF file using FPDF."""
-    pdf = FPDF()
-    pdf.set_auto_page_break(True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Arial", size=10)
-    
+# Bulk audits: combined PDFs include a section per page up to this many pages (index table only above)
+PDF_COMBINED_MAX_PAGES = 500
+
+_PDF_RENDERER = None
+
+def pdf_renderer():
+    """The shared PdfRenderer (the font lookup happens once per process)."""
+    global _PDF_RENDERER
+    if _PDF_RENDERER is None:
+        _PDF_RENDERER = PdfRenderer()
+    return _PDF_RENDERER
+
+def _pdf_rows(data):
+    """Turns a results category (dict or list) into two-column PDF table rows."""
+    if isinstance(data, dict):
+        return [(key, value['href'] if isinstance(value, dict) and 'href' in value else value) for key, value in data.items()]
+    return [('', item) for item in data]
+
+def build_pdf_document(audit):
+    """Lays out an audit dictionary (see audit_html) as a structured PDF document (seokit/pdf.py)."""
+    results = audit['Results']
+    core = results['CORE_SEO_TAGS']
+    sections = [
+        ("Essential HTML Tags", _pdf_rows(results['ESSENTIAL_HTML_TAGS'])),
+        ("Core SEO Tags", [('Canonical URL', core['Canonical']), ('Meta Description', core['Description']),
+                           ('Meta Robots', core['Robots'])]
+                          + ([('Meta Keywords (Legacy)', core['Keywords'])] if 'Keywords' in core else [])),
+        ("Internationalization (Hreflang)", [(link['hreflang'], link['href']) for link in core['Hreflang_Tags']]),
+        ("Open Graph", _pdf_rows(results['SOCIAL_MEDIA_TAGS']['OPEN_GRAPH'])),
+        ("Twitter Card", _pdf_rows(results['SOCIAL_MEDIA_TAGS']['TWITTER_CARD'])),
+        ("PWA, Mobile and Device Configuration", _pdf_rows(results['PWA_MOBILE_TAGS'])),
+        ("Performance Hints & HTTP-Equivs", _pdf_rows(results['TECHNICAL_BROWSER_TAGS'])),
+        ("Other Critical Link Relations", _pdf_rows(results['CRITICAL_LINK_TAGS'])),
+        ("All Other/Custom Meta Tags", _pdf_rows(results['ALL_OTHER_META_TAGS'])),
+        ("JSON-LD Structured Data", [(item['Script_ID'], item['Schema_Type']) for item in results['JSON_LD_STRUCTURED_DATA']]),
+    ]
+    http_info = results.get('HTTP')
+    if http_info:
+        sections.append(("HTTP Response", [('Status', http_info['Status'])]
+                         + [(f"Redirect ({hop['status']})", hop['url']) for hop in http_info['Redirect_Chain']]
+                         + [(label, http_info[key] or '(not set)') for label, key in (
+                             ('Final URL', 'Final_URL'), ('X-Robots-Tag', 'X_Robots_Tag'), ('Link rel=canonical', 'Link_Canonical'),
+                             ('Content-Encoding', 'Content_Encoding'), ('Cache-Control', 'Cache_Control'))]
+                         + ([('robots.txt (Googlebot)', 'allowed' if http_info['Robots_Txt']['Allowed'] else f"BLOCKED ({http_info['Robots_Txt']['Rule']})")]
+                            if http_info.get('Robots_Txt') else [])))
+    blocks = []
+    for heading, rows in sections:
+        blocks.append(('heading', f"{heading} ({len(rows)})"))
+        blocks.append(('table', rows) if rows else ('text', '(None Found)'))
+    blocks.extend(lines_to_blocks(generate_remediation_report(results, audit['Quality_Checks'])))
+    return {
+        'title': 'SEO Metadata Audit',
+        'subtitle': f"{audit['Source']}  ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})",
+        'score': audit['Score'],
+        'grade': audit['Grade'],
+        'blocks': blocks,
+    }
+
+def save_report_to_pdf(report_content, filename, document=None):
+    """
+    Saves a report as PDF. `document` (see build_pdf_document) gives the
+    structured layout; otherwise the text report is split into sections.
+    """
     try:
-        # Prepare content: strip down formatting that won't transfer (like **)
-        cleaned_content = report_content.replace('**', '')
-        
-        # Use MultiCell to handle automatic line wrapping and page breaks
-        pdf.multi_cell(w=0, h=5, txt=cleaned_content.encode('latin-1', 'replace').decode('latin-1'))
-        
-        pdf.output(filename)
+        if document is None:
+            document = {'title': 'SEO Audit Report', 'blocks': lines_to_blocks(report_content.split('\n'))}
+        pdf_renderer().write(document, filename)
         print(f"✅ Results successfully saved to PDF: {filename}")
         return True
     except Exception as e:
         print(f"❌ ERROR: Could not save file as PDF. Check installation of fpdf2. ({e})")
         return False
 
-def save_results_to_file(report_content, source_name):
+def pdf_filename_for(target, position):
+    """File name of a page's PDF in bulk audits: position plus a readable slug of the target."""
+    slug = ''.join(c if c.isalnum() else '_' for c in target.split('://', 1)[-1]).strip('_')[:80] or 'page'
+    return f"{position:05d}_{slug}.pdf"
+
+def save_results_to_file(report_content, source_name, document=None):
     """Asks the user to save the report and handles file I/O for TXT or PDF."""
     
     # Clean the source name to create a default filename base
@@ -610,7 +865,7 @@ def save_results_to_file(report_content, source_name):
             if not filename.lower().endswith('.pdf'):
                 filename += '.pdf'
                 
-            if save_report_to_pdf(report_content, filename):
+            if save_report_to_pdf(report_content, filename, document):
                 break # Exit loop on successful PDF save
             else:
                 break # Exit loop on failed PDF save
@@ -623,34 +878,90 @@ def save_results_to_file(report_content, source_name):
             print("Invalid choice. Please enter 1, 2, or 3.")
 
         
-def run_audit_from_url(url):
+_HTTP_SESSION = None
+
+def http_session():
+    """The shared, pooled requests session (keep-alive connections are reused across pages and redirect hops)."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        _HTTP_SESSION = new_session(REQUEST_HEADERS)
+    return _HTTP_SESSION
+
+_ROBOTS_CACHE = None
+
+def robots_cache():
+    """The shared robots.txt cache (one fetch per host per day)."""
+    global _ROBOTS_CACHE
+    if _ROBOTS_CACHE is None:
+        _ROBOTS_CACHE = RobotsCache(http_session())
+    return _ROBOTS_CACHE
+
+def robots_txt_facts(url, final_url):
+    """Whether Googlebot may crawl the requested and the final URL, with the deciding robots.txt rule."""
+    for checked in dict.fromkeys((url, final_url)):
+        robots = robots_cache().for_url(checked)
+        allowed, rule = robots.verdict(checked, GOOGLEBOT)
+        if not allowed:
+            break
+    return {'Allowed': allowed, 'Rule': rule or '', 'URL': checked, 'Status': robots.status}
+
+def fetch_page(url, quiet=False, head_only=False, max_bytes=MAX_FETCH_BYTES):
     """
-    Fetches content from a URL, passes it to the core audit, and returns
-    the report string on success, None on failure.
+    Fetches the HTML of a URL with browser-like headers on the pooled session,
+    following redirects by hand so every hop is recorded, and streaming the
+    body (decoded incrementally, capped at max_bytes). With head_only, the
+    connection is closed as soon as </head> has been read. The HTTP facts
+    include the robots.txt verdict for Googlebot ('Robots_Txt').
+
+    Returns (html text, HTTP facts) on success and (None, HTTP facts or None)
+    on failure (after printing the reason).
     """
+    import requests
+    http_info = None
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
+        response, chain = request_with_redirects(http_session(), url)
+        http_info = response_facts(response, chain)
+        HTTP_RESPONSES_METRIC.inc(str(response.status_code))
+        if response.status_code >= 400:
+            response.close()
         response.raise_for_status()
-        print(f"✅ Successfully fetched content from: {url}")
-        
-        report = perform_metadata_audit(response.text, url)
-        return report # Returns the full report string
+        html_content, info = read_html_stream(response, head_only=head_only, max_bytes=max_bytes)
+        FETCH_BYTES_METRIC.inc(amount=info['bytes'])
+        http_info['Robots_Txt'] = robots_txt_facts(url, http_info['Final_URL'])
+        if not quiet:
+            detail = ", stopped after </head>" if info['stopped_after_head'] else ""
+            redirects = f", {len(chain)} redirect(s)" if chain else ""
+            print(f"✅ Successfully fetched content from: {url} ({info['bytes'] / 1024:.1f} KB, {info['encoding']}{detail}{redirects})")
+        if info['truncated']:
+            print(f"⚠️ WARNING: '{url}' exceeds {max_bytes} bytes; only the first {max_bytes} bytes were audited.")
+        return html_content, http_info
         
     except requests.exceptions.RequestException as e:
+        if http_info is None:
+            FETCH_ERRORS_METRIC.inc()
         if '403 Client Error' in str(e):
              print(f"❌ ERROR: Access Denied (403). The server at '{url}' is actively blocking automated requests.")
-             print("💡 Tip: Try the Local File option, or check if the server requires a different User-Agent.")
+             if not quiet:
+                 print("💡 Tip: Try the Local File option, or check if the server requires a different User-Agent.")
         else:
             print(f"❌ ERROR: Failed to fetch URL '{url}'. Check the URL, your internet connection, or if the server is blocking your request. ({e})")
+        return None, http_info # Failure
+
+def fetch_html(url, quiet=False, head_only=False, max_bytes=MAX_FETCH_BYTES):
+    """Like fetch_page, returning only the HTML text (None on failure)."""
+    return fetch_page(url, quiet=quiet, head_only=head_only, max_bytes=max_bytes)[0]
+
+def run_audit_from_url(url, head_only=False):
+    """
+    Fetches content from a URL, passes it to the core audit, and returns
+    the report string on success, None on failure.
+    """
+    html_content, http_info = fetch_page(url, head_only=head_only)
+    if html_content is None:
         return None # Failure
+    
+    report = perform_metadata_audit(html_content, url, head_only=head_only, http_info=http_info)
+    return report # Returns the full report string
 
 def run_audit_from_file(file_path):
     """
@@ -666,9 +977,8 @@ def run_audit_from_file(file_path):
         return None # Failure
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        print(f"✅ Successfully loaded content from local file: {file_path}")
+        html_content, encoding = read_html_file(file_path)
+        print(f"✅ Successfully loaded content from local file: {file_path} ({encoding})")
         
         report = perform_metadata_audit(html_content, file_path)
         return report # Returns the full report string
@@ -677,10 +987,861 @@ def run_audit_from_file(file_path):
         return None # Failure
         
 # ----------------------------------------------------------------------
-# 4. MAIN EXECUTION (User Interface)
+# 4. BULK / SITE AUDITS (Many pages, one site-level report)
 # ----------------------------------------------------------------------
 
-if __name__ == "__main__":
+def _tag_value(value):
+    """Returns '' for the '❌ MISSING' placeholder, the value otherwise."""
+    return '' if value == '❌ MISSING' else (value or '')
+
+def extract_page_facts(results, quality_checks):
+    """Flattens an audit into the per-page facts used for scoring, bulk audits and exports (keys: PAGE_FACT_FIELDS)."""
+    robots = _tag_value(results['CORE_SEO_TAGS']['Robots'])
+    canonical = _tag_value(results['CORE_SEO_TAGS']['Canonical'])
+    http_info = results.get('HTTP')
+    critical_path = quality_checks['Critical_Path']
+    return {
+        'title': _tag_value(results['ESSENTIAL_HTML_TAGS'].get('<title>')),
+        'title_length': quality_checks['Title']['Length'],
+        'description': _tag_value(results['CORE_SEO_TAGS']['Description']),
+        'description_length': quality_checks['Description']['Length'],
+        'canonical': canonical,
+        'robots': robots,
+        'robots_noindex': 'noindex' in robots.lower(),
+        'hreflang_count': len(results['CORE_SEO_TAGS']['Hreflang_Tags']),
+        'og_count': len(results['SOCIAL_MEDIA_TAGS']['OPEN_GRAPH']),
+        'twitter_count': len(results['SOCIAL_MEDIA_TAGS']['TWITTER_CARD']),
+        'schema_checked': quality_checks['Schema_Summary']['Checked'],
+        'schema_valid': quality_checks['Schema_Summary']['Valid'],
+        'images_total': quality_checks['Image_Alt_Text']['Total'],
+        'images_missing_alt': quality_checks['Image_Alt_Text']['Missing'],
+        'outgoing_links': len(results['LINKS']),
+        'blocking_scripts': len(critical_path['blocking_scripts']),
+        'blocking_stylesheets': len(critical_path['blocking_stylesheets']),
+        'blocking_bytes': critical_path['blocking_bytes'],
+        'render_blocking_ms': critical_path['estimated_blocking_ms'],
+        'images_missing_dimensions': len(critical_path['images_missing_dimensions']),
+        'http_status': http_info['Status'] if http_info else 0,
+        'redirect_hops': len(http_info['Redirect_Chain']) if http_info else 0,
+        'x_robots_noindex': x_robots_noindex(http_info['X_Robots_Tags']) if http_info else False,
+        'robots_txt_blocked': bool(http_info and http_info.get('Robots_Txt') and not http_info['Robots_Txt']['Allowed']),
+        'header_canonical_conflict': bool(http_info and http_info['Link_Canonical'] and canonical
+                                          and normalize_url(http_info['Link_Canonical']) != normalize_url(canonical)),
+        'compressed': bool(http_info and http_info['Compressed']),
+    }
+
+def build_page_record(audit):
+    """Builds the JSON-serializable record written per page during bulk audits (one JSONL line)."""
+    results = audit['Results']
+    facts = extract_page_facts(results, audit['Quality_Checks'])
+    return {
+        'url': audit['Source'],
+        'score': audit['Score'],
+        'grade': audit['Grade'],
+        'facts': facts,
+        'failed_checks': SCORING_RULES.failed_rules(facts),
+        'hreflang': results['CORE_SEO_TAGS']['Hreflang_Tags'],
+        'open_graph': results['SOCIAL_MEDIA_TAGS']['OPEN_GRAPH'],
+        'twitter_card': results['SOCIAL_MEDIA_TAGS']['TWITTER_CARD'],
+        'json_ld_types': [item['Schema_Type'] for item in results['JSON_LD_STRUCTURED_DATA']],
+        'http': results.get('HTTP'),
+    }
+
+def page_failed_checks(record):
+    """Ids of the scoring rules a page record failed (re-evaluated from its facts for records written before they were stored)."""
+    failed = record.get('failed_checks')
+    return SCORING_RULES.failed_rules(record['facts']) if failed is None else failed
+
+def section_path_for(target, site_root=None):
+    """Path a page is grouped by in score summaries: the URL, or a local file's path relative to `site_root` (default: working directory)."""
+    if target.startswith(('http://', 'https://')):
+        return target
+    return os.path.relpath(target, site_root or '.').replace(os.path.sep, '/')
+
+def grade_order():
+    """Letter grades of the active scale, best first."""
+    return [grade for _, grade in SCORING_RULES.grading]
+
+def audit_run_label(args):
+    """Label of a stored run: what was audited (sitemap, directory, list file, URLs), so runs of the same targets compare."""
+    if args.sitemap:
+        return f"sitemap {args.sitemap}"
+    parts = [f"dir {os.path.abspath(args.dir)}"] if args.dir else []
+    if args.list_file:
+        parts.append(f"list {os.path.abspath(args.list_file)}")
+    parts.extend(args.targets)
+    return ' + '.join(parts)
+
+def load_audit_targets(list_file):
+    """Reads one URL or file path per line (blank lines and # comments are skipped)."""
+    with open(list_file, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def site_page_url(url):
+    """A page URL with its index file dropped (/blog/index.html -> /blog/), as links to it usually are."""
+    parts = urlsplit(url)
+    head, _, tail = parts.path.rpartition('/')
+    if tail.lower() not in INDEX_FILES:
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, head + '/', parts.query, ''))
+
+def page_url_for(target, site_root=None, base_url=None):
+    """
+    URL used for link resolution: the URL itself; for a file of a site
+    directory (`site_root`), its site path under `base_url` (default
+    LOCAL_SITE_BASE, so root-relative links resolve inside the build),
+    index files mapped to their directory; otherwise a file:// URI.
+    """
+    if target.startswith(('http://', 'https://')):
+        return target
+    if site_root is not None:
+        relative = os.path.relpath(target, site_root).replace(os.path.sep, '/')
+        if not relative.startswith('../'):
+            return site_page_url(urljoin(base_url.rstrip('/') + '/' if base_url else LOCAL_SITE_BASE, quote(relative)))
+    return Path(target).resolve().as_uri()
+
+def manifest_fingerprint(head_only=False):
+    """Identifies what besides the file itself shapes a page record (see AuditManifest)."""
+    settings = {'version': __version__, 'rules': SCORING_RULES.source, 'head_only': head_only}
+    return file_digest(json.dumps(settings, sort_keys=True).encode('utf-8'))
+
+def apply_site_penalties(score, findings):
+    """Deducts the active ruleset's site penalties for every finding of a page. Returns (score, grade)."""
+    return SCORING_RULES.apply_site_penalties(score, findings)
+
+def run_bulk_audit(targets, jsonl_path=None, report_path=None, homepage=None, sitemap_urls=None, columns_path=None, store_path=None,
+                   pdf_dir=None, pdf_path=None, pdf_workers=None, head_only=False, max_bytes=MAX_FETCH_BYTES,
+                   resource_sizes=False, honor_robots=True, sitemap=None, traffic=None, manifest=None, site_root=None,
+                   base_url=None, summary_path=None, run_label=None):
+    """
+    Audits every target (URL or local file), writes one JSONL record per page
+    (and, with `columns_path`, one columnar row of facts for `rescore`; with
+    `store_path`, one row in the SQLite audit history, under `run_label`), then builds the cross-page duplicate index and the internal link graph
+    into a site report. Returns the site report as a string (None if no page
+    could be audited).
+
+    `homepage` is the click-depth origin (defaults to the root of the first
+    URL target, or the root index page of `site_root`); `sitemap_urls` lists the pages expected to be linked, for
+    orphan detection. `pdf_dir` receives one PDF per page (rendered in a
+    process pool while the audit runs); `pdf_path` is a combined summary PDF
+    with a table of contents. `head_only` stops each download after </head>
+    and skips body-level checks (the link graph is then empty).
+    `resource_sizes` measures the render-blocking CSS/JS of URL targets with
+    HEAD requests (cached across pages). URL targets disallowed for
+    ROBOTS_USER_AGENT by robots.txt are skipped unless `honor_robots` is False.
+
+    `targets` may be any iterable. With `sitemap` (a SitemapReader), the
+    targets are its locations as they are parsed: every audited page is
+    checked against its sitemap entry and the site report gains a sitemap
+    validation section; the sitemap URLs are also the orphan-detection set.
+
+    With `traffic` (TrafficCounts from the analytics log), the targets are
+    audited busiest first (a sitemap is then read completely before the
+    first page is fetched), every JSONL record carries its page views and
+    the site report gains a traffic-weighted score and a fix-first list.
+
+    With `jsonl_path` (or when profiling is already enabled, see --profile)
+    stage timing spans are recorded: each JSONL record gets its per-stage
+    timings_ms and the site report a stage timing summary.
+
+    Local files are stat'ed and read by a thread pool ahead of the page
+    being audited. With `manifest` (an AuditManifest), files unchanged since
+    the previous run reuse their stored record and links without being
+    parsed; `pdf_dir`/`pdf_path` then only cover the re-audited pages.
+
+    With `site_root` (the directory of a static site build), local files
+    are linked as site paths under `base_url` (see page_url_for), so
+    root-relative and absolute links between the pages resolve; the same
+    URL keys them in the duplicate/canonical index, sitemap checks, traffic
+    lookups, fact columns and the audit history.
+
+    Page scores are also aggregated as they arrive into a SiteSummary (score
+    percentiles per path prefix, most failed checks, worst pages; local
+    files are grouped by their path relative to `site_root`, default the
+    working directory). `summary_path` saves it as JSON for `summary`.
+    """
+    if jsonl_path and not PROFILER.enabled:
+        PROFILER.enable()
+
+    def url_of(target):
+        return page_url_for(target, site_root, base_url)
+
+    def site_url_of(target):
+        # Files of a site directory are keyed by their site URL, so they join canonicals, logs and stored runs
+        return url_of(target) if site_root is not None else target
+
+    if traffic:
+        targets = traffic.order(targets, key=site_url_of)
+    total = len(targets) if hasattr(targets, '__len__') else None
+    site_index = SiteIndex()
+    link_graph = LinkGraph()
+    hreflang_validator = HreflangValidator()
+    page_scores = [] # (page id, score) in audit order
+    page_keys = [] # page id -> normalized page URL (joins hreflang findings)
+    summary = SiteSummary()
+    failed = []
+    blocked = [] # (target, deciding robots.txt rule)
+    jsonl_file = open(jsonl_path, 'w', encoding='utf-8') if jsonl_path else None
+    columns_writer = FactsColumnWriter(columns_path) if columns_path else None
+    store = AuditStore(store_path) if store_path else None
+    label = run_label or (f"sitemap {', '.join(sitemap.sources)}" if sitemap else f"{total} target(s)")
+    run_id = store.begin_run(label=label) if store else None
+    listed_urls = [] if sitemap and sitemap_urls is None else None
+    if pdf_dir:
+        os.makedirs(pdf_dir, exist_ok=True)
+    pdf_batch = PdfBatch(workers=pdf_workers) if pdf_dir else None
+    pdf_documents = [] # Page sections for the combined PDF (small sites only)
+    size_cache = ResourceSizeCache(http_session()) if resource_sizes else None
+    load_local = manifest.load if manifest else read_local_page
+    if homepage is None and site_root is not None:
+        homepage = page_url_for(os.path.join(site_root, 'index.html'), site_root, base_url)
+
+    def load_ahead(target):
+        return None if target.startswith(('http://', 'https://')) else load_local(target, head_only=head_only)
+
+    try:
+        for position, (target, local_page) in enumerate(read_ahead(load_ahead, targets), 1):
+            progress = f"{position}/{total}" if total else position
+            PROFILER.begin_page()
+            is_url = target.startswith(('http://', 'https://'))
+            if is_url and homepage is None:
+                parts = urlsplit(target)
+                homepage = f"{parts.scheme}://{parts.netloc}/"
+            if listed_urls is not None:
+                listed_urls.append(target)
+            if is_url and honor_robots:
+                allowed, rule = robots_cache().verdict(target, ROBOTS_USER_AGENT)
+                if not allowed:
+                    PAGES_METRIC.inc('blocked')
+                    blocked.append((target, rule))
+                    if sitemap:
+                        sitemap.check_page(target, error='blocked')
+                    print(f"ℹ️ [{progress}] {target} — skipped, disallowed by robots.txt ({rule})")
+                    continue
+            audit = None
+            if local_page is not None and local_page.cached:
+                record, links = manifest.cached_result(local_page)
+                record['url'] = target
+                http_info = None
+            else:
+                with span('fetch'):
+                    if is_url:
+                        html_content, http_info = fetch_page(target, quiet=True, head_only=head_only, max_bytes=max_bytes)
+                    else:
+                        html_content, http_info = local_page.html, None
+                        if local_page.error:
+                            print(f"❌ ERROR: Could not read '{target}'. ({local_page.error})")
+                if html_content is None:
+                    PAGES_METRIC.inc('failed')
+                    if sitemap:
+                        sitemap.check_page(site_url_of(target), error='failed')
+                    failed.append(target)
+                    link_graph.mark_broken(url_of(target))
+                    hreflang_validator.mark_broken(url_of(target))
+                    continue
+                try:
+                    started = time.perf_counter()
+                    audit = audit_html(html_content, target, head_only=head_only, http_info=http_info,
+                                       resource_sizes=size_cache if is_url else None)
+                    AUDIT_SECONDS_METRIC.observe(time.perf_counter() - started)
+                except Exception as e:
+                    PAGES_METRIC.inc('failed')
+                    print(f"❌ ERROR: Could not audit '{target}'. ({e})")
+                    if sitemap:
+                        sitemap.check_page(site_url_of(target), error='failed')
+                    failed.append(target)
+                    link_graph.mark_broken(url_of(target))
+                    hreflang_validator.mark_broken(url_of(target))
+                    continue
+                record, links = build_page_record(audit), audit['Results']['LINKS']
+                if manifest and local_page is not None:
+                    manifest.store(local_page, record, links)
+
+            page_url = url_of(target)
+            internal_links = resolve_internal_links(page_url, links)
+            facts = record['facts']
+            canonical = urljoin(page_url, facts['canonical']) if facts['canonical'] else ''
+            if site_root is not None:
+                internal_links = [site_page_url(link) for link in internal_links]
+                canonical = site_page_url(canonical) if canonical else ''
+            link_graph.add_page(page_url, internal_links)
+            site_url = site_url_of(target)
+
+            if traffic:
+                record['pageviews'] = traffic.views_for(site_url)
+            timings = PROFILER.end_page()
+            if timings is not None:
+                record['timings_ms'] = timings
+            if sitemap:
+                sitemap.check_page(site_url, facts, final_url=http_info['Final_URL'] if http_info else None)
+            page_id = site_index.add_page(site_url, facts['title'], facts['description'], canonical)
+            hreflang_validator.add_page(page_url, canonical, facts['robots_noindex'], record['hreflang'])
+            page_keys.append(normalize_url(page_url))
+            page_scores.append((page_id, record['score']))
+            section_path = section_path_for(target, site_root)
+            if section_path != target:
+                record['site_path'] = section_path      # So `summary` does not depend on the working directory
+            summary.add(section_path, record['score'], record['grade'], page_failed_checks(record))
+            if jsonl_file:
+                jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if columns_writer:
+                columns_writer.append({'url': site_url, 'score': record['score'], 'grade': record['grade'], **facts})
+            if store:
+                store.add_page(run_id, site_url, record['score'], record['grade'], facts)
+            if audit and (pdf_batch or pdf_path):
+                document = build_pdf_document(audit)
+                if pdf_batch:
+                    pdf_batch.submit(document, os.path.join(pdf_dir, pdf_filename_for(target, position)))
+                if pdf_path and len(pdf_documents) < PDF_COMBINED_MAX_PAGES:
+                    pdf_documents.append(document)
+            PAGES_METRIC.inc('ok')
+            print(f"✅ [{progress}] {target} — {record['score']}% ({record['grade']}){'' if audit else ' (unchanged)'}")
+    finally:
+        if jsonl_file:
+            jsonl_file.close()
+        if pdf_batch:
+            pdf_failures = pdf_batch.close()
+        if columns_writer and columns_writer.rows:
+            try:
+                columns_writer.close()
+            except Exception as e:
+                print(f"❌ ERROR: Could not write the fact columns. ({e})")
+                columns_path = None
+
+    if not page_scores:
+        if sitemap:
+            print("\n".join(format_sitemap_report(sitemap)))
+        if store:
+            store.finish_run(run_id, failed=len(failed))
+            store.close()
+        print("❌ ERROR: No page could be audited.")
+        return None
+
+    # Site-level findings feed back into every affected page's score
+    with span('site_index'):
+        findings = site_index.page_findings()
+    with span('hreflang'):
+        hreflang_validation = hreflang_validator.validate()
+    hreflang_findings = hreflang_validator.page_findings(hreflang_validation)
+    for page_id, key in enumerate(page_keys):
+        if key in hreflang_findings:
+            findings.setdefault(page_id, {})['Hreflang_Errors'] = hreflang_findings[key]
+    adjusted = [(page_id, score) + apply_site_penalties(score, findings.get(page_id, {})) for page_id, score in page_scores]
+    site_score = round(sum(item[2] for item in adjusted) / len(adjusted))
+    if store:
+        store.finish_run(run_id, failed=len(failed), site_score=site_score)
+
+    output_buffer = []
+    output_buffer.append("\n" + "#"*70)
+    output_buffer.append("           🌐 S I T E   A U D I T   S U M M A R Y")
+    output_buffer.append("#"*70)
+    output_buffer.append(f"  Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    output_buffer.append(f"  Pages audited: {len(page_scores)} (failed: {len(failed)}, disallowed by robots.txt: {len(blocked)})")
+    if manifest:
+        output_buffer.append(f"  Incremental: {manifest.misses} changed page(s) parsed, {manifest.hits} unchanged page(s) reused from {manifest.path}")
+    output_buffer.append(f"  Average page score: {round(sum(score for _, score in page_scores) / len(page_scores))}%")
+    output_buffer.append(f"  Site score (after site-level findings): {site_score}% — Grade: **{grade_for_percentage(site_score)}**")
+    output_buffer.extend(format_summary_report(summary, grade_order(), title="Page Scores (before site-level findings)"))
+    output_buffer.extend(site_index.duplicates_report())
+    if traffic:
+        page_views = [(site_index.urls[page_id], traffic.views_for(site_index.urls[page_id]), new_score)
+                      for page_id, _, new_score, _ in adjusted]
+        output_buffer.extend(format_traffic_report(traffic, page_views))
+    if store:
+        drops = store.grade_drops(grade_ranks(), run_id=run_id)
+        store.close()
+        output_buffer.append(f"\n--- Audit History: run #{run_id} in {store_path} ---")
+        if drops:
+            output_buffer.append(f"  ⚠️ {len(drops)} page(s) dropped a grade since the previous run (see: seo-checker.py history {store_path})")
+            for url, old_score, old_grade, new_score, new_grade in drops[:10]:
+                output_buffer.append(f"  > {url}: {old_score}% ({old_grade}) -> {new_score}% ({new_grade})")
+        else:
+            output_buffer.append("  ✅ No page dropped a grade since the previous run.")
+
+    output_buffer.extend(format_hreflang_report(hreflang_validation))
+    if sitemap:
+        output_buffer.extend(format_sitemap_report(sitemap, audited=len(page_scores)))
+    if listed_urls is not None:
+        sitemap_urls = listed_urls
+
+    if head_only:
+        output_buffer.append("\nℹ️ Internal link graph skipped: head-only audits do not read page bodies.")
+    else:
+        try:
+            with span('link_graph'):
+                analysis = link_graph.analyze(homepage=homepage, sitemap_urls=sitemap_urls)
+            output_buffer.extend(format_link_graph_report(analysis))
+        except RuntimeError as e:
+            output_buffer.append(f"\n⚠️ Internal link graph skipped: {e}")
+
+    penalized = [item for item in adjusted if item[2] < item[1]]
+    output_buffer.append(f"\n--- Pages Penalized by Site-Level Findings ({len(penalized)}) ---")
+    for page_id, score, new_score, new_grade in sorted(penalized, key=lambda item: item[2])[:50]:
+        reasons = ', '.join(findings[page_id])
+        output_buffer.append(f"  > {site_index.urls[page_id]}: {score}% -> {new_score}% ({new_grade}) [{reasons}]")
+    if blocked:
+        output_buffer.append(f"\n--- Skipped: Disallowed by robots.txt for {ROBOTS_USER_AGENT} ({len(blocked)}) ---")
+        for target, rule in blocked[:50]: output_buffer.append(f"  ⚠️ {target} ({rule})")
+    if failed:
+        output_buffer.append(f"\n--- Failed Targets ({len(failed)}) ---")
+        for target in failed: output_buffer.append(f"  ❌ {target}")
+    if PROFILER.enabled:
+        output_buffer.extend(PROFILER.summary_lines())
+    output_buffer.append("#"*70)
+
+    report = "\n".join(output_buffer)
+    print(report)
+    if report_path:
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(report)
+            print(f"✅ Site report saved to: {report_path}")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file. Check permissions or the path provided. ({e})")
+    if jsonl_path:
+        print(f"✅ Per-page results saved to: {jsonl_path}")
+    if summary_path:
+        try:
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(summary.to_dict(), f, ensure_ascii=False)
+            print(f"✅ Score summary saved to: {summary_path} (merge runs with: seo-checker.py summary {summary_path} ...)")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file. Check permissions or the path provided. ({e})")
+    if pdf_batch:
+        print(f"✅ {pdf_batch.written} page PDF(s) saved to: {pdf_dir}")
+        for path, error in pdf_failures[:10]:
+            print(f"❌ ERROR: Could not render '{path}'. ({error})")
+    if pdf_path:
+        index_rows = [(f"{item[1]}% -> {item[2]}% ({item[3]})", site_index.urls[item[0]]) for item in adjusted]
+        pdf_summary = {
+            'title': 'Site Audit Summary',
+            'subtitle': f"{len(page_scores)} page(s) audited, {len(failed)} failed",
+            'score': site_score,
+            'grade': grade_for_percentage(site_score),
+            'blocks': lines_to_blocks(output_buffer[3:]) + [('heading', f"Page Index ({len(index_rows)})"), ('table', index_rows)],
+        }
+        if len(page_scores) > PDF_COMBINED_MAX_PAGES:
+            pdf_documents = []
+        try:
+            pdf_renderer().render_combined(pdf_path, pdf_summary, pdf_documents)
+            print(f"✅ Combined PDF report saved to: {pdf_path}")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file as PDF. Check installation of fpdf2. ({e})")
+    if columns_path:
+        print(f"✅ Per-page facts saved to: {columns_path} (re-grade with: seo-checker.py rescore {columns_path})")
+    return report
+
+def run_status_sweep(targets, out_path=None, workers=STATUS_SWEEP_WORKERS, max_examples=20, honor_robots=True):
+    """
+    Status-only sweep: HEAD-first probes (GET when HEAD is refused) on one
+    pooled session from a thread pool, recording status, redirect chain and
+    SEO-relevant headers per URL. Rows are streamed to `out_path` (CSV).
+    URLs disallowed by robots.txt are not probed unless `honor_robots` is False.
+    Returns the summary report string.
+    """
+    import csv
+    from collections import Counter, deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    session = new_session(REQUEST_HEADERS, pool_size=workers)
+    robots = RobotsCache(session) if honor_robots else None
+    started = time.perf_counter()
+    status_counts, errors, chains, noindex, blocked, uncompressed = Counter(), [], [], [], [], 0
+    out_file = open(out_path, 'w', encoding='utf-8', newline='') if out_path else None
+    writer = csv.writer(out_file) if out_file else None
+    if writer:
+        writer.writerow(['url', 'status', 'method', 'final_url', 'redirects', 'x_robots_tag', 'link_canonical',
+                         'content_encoding', 'cache_control', 'elapsed_ms', 'error'])
+
+    def probe(url):
+        if robots:
+            allowed, rule = robots.verdict(url, ROBOTS_USER_AGENT)
+            if not allowed:
+                return {'Blocked': rule}
+        return probe_status(session, url)
+
+    def record(url, facts):
+        nonlocal uncompressed
+        if 'Blocked' in facts:
+            blocked.append((url, facts['Blocked']))
+            if writer:
+                writer.writerow([url, '', '', '', '', '', '', '', '', '', f"disallowed by robots.txt ({facts['Blocked']})"])
+            return
+        if 'Error' in facts:
+            FETCH_ERRORS_METRIC.inc()
+            errors.append((url, facts['Error']))
+            status_counts['error'] += 1
+            if writer:
+                writer.writerow([url, '', '', '', '', '', '', '', '', '', facts['Error']])
+            return
+        status_counts[facts['Status']] += 1
+        HTTP_RESPONSES_METRIC.inc(str(facts['Status']))
+        hops = len(facts['Redirect_Chain'])
+        if hops > 1:
+            chains.append((url, hops, facts['Final_URL']))
+        if x_robots_noindex(facts['X_Robots_Tags']):
+            noindex.append(url)
+        if facts['Method'] == 'GET' and not facts['Compressed']:
+            uncompressed += 1
+        if writer:
+            writer.writerow([url, facts['Status'], facts['Method'], facts['Final_URL'], hops, facts['X_Robots_Tag'],
+                             facts['Link_Canonical'], facts['Content_Encoding'], facts['Cache_Control'], facts['Elapsed_Ms'], ''])
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()     # Bounded window keeps memory flat on very long lists
+            for position, url in enumerate(targets, 1):
+                in_flight.append((url, executor.submit(probe, url)))
+                if len(in_flight) >= workers * 4:
+                    done_url, future = in_flight.popleft()
+                    record(done_url, future.result())
+                metrics.QUEUE_DEPTH.set(len(in_flight), 'status')
+                if position % 10000 == 0:
+                    print(f"ℹ️ [{position}/{len(targets)}] probed...")
+            while in_flight:
+                done_url, future = in_flight.popleft()
+                record(done_url, future.result())
+                metrics.QUEUE_DEPTH.set(len(in_flight), 'status')
+    finally:
+        if out_file:
+            out_file.close()
+        session.close()
+    elapsed = time.perf_counter() - started
+
+    output_buffer = []
+    output_buffer.append("\n" + "="*70)
+    output_buffer.append("           S T A T U S   S W E E P")
+    output_buffer.append("="*70)
+    output_buffer.append(f"  URLs: {len(targets)} in {elapsed:.1f}s ({len(targets) / max(elapsed, 1e-9):.0f}/s, {workers} workers)")
+    output_buffer.append("\n--- Status Codes ---")
+    for status, count in sorted(status_counts.items(), key=lambda item: str(item[0])):
+        flag = '✅' if isinstance(status, int) and status < 300 else '⚠️' if isinstance(status, int) and status < 400 else '❌'
+        output_buffer.append(f"  {flag} {status}: {count}")
+    output_buffer.append(f"\n--- Redirect Chains (2+ hops) ({len(chains)}) ---")
+    for url, hops, final in sorted(chains, key=lambda item: -item[1])[:max_examples]:
+        output_buffer.append(f"  ⚠️ {url} -> ... -> {final} ({hops} hops)")
+    output_buffer.append(f"\n--- X-Robots-Tag noindex ({len(noindex)}) ---")
+    for url in noindex[:max_examples]:
+        output_buffer.append(f"  ❌ {url}")
+    if blocked:
+        output_buffer.append(f"\n--- Not Probed: Disallowed by robots.txt for {ROBOTS_USER_AGENT} ({len(blocked)}) ---")
+        for url, rule in blocked[:max_examples]:
+            output_buffer.append(f"  ⚠️ {url} ({rule})")
+    if uncompressed:
+        output_buffer.append(f"\n⚠️ {uncompressed} GET-probed response(s) were not compressed.")
+    if errors:
+        output_buffer.append(f"\n--- Network Errors ({len(errors)}) ---")
+        for url, message in errors[:max_examples]:
+            output_buffer.append(f"  ❌ {url}: {message}")
+    output_buffer.append("="*70)
+
+    report = "\n".join(output_buffer)
+    print(report)
+    if out_path:
+        print(f"✅ Per-URL status saved to: {out_path}")
+    return report
+
+def load_rescore_columns(path, fields):
+    """
+    Loads the columns needed to re-score a stored audit: `fields` plus url,
+    score and grade. Accepts a fact file (.npz/.parquet) or a bulk-audit
+    JSONL file (its 'facts' objects are turned into columns first). Facts
+    that older audits did not record yet are filled with zeros.
+    """
+    import numpy as np
+    wanted = sorted(set(fields) | {'url', 'score', 'grade'})
+    if not path.lower().endswith('.jsonl'):
+        stored = column_names(path)
+        columns = load_fact_columns(path, [name for name in wanted if name in stored])
+        length = len(columns['url'])
+        for name in wanted:
+            if name not in columns:
+                columns[name] = np.zeros(length, dtype=np.int64)
+        return columns
+    rows = {name: [] for name in wanted}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads_json(line)
+            facts = record['facts']
+            for name in wanted:
+                rows[name].append(record[name] if name in ('url', 'score', 'grade') else facts.get(name, 0))
+    return {name: np.array(values, dtype=object) if values and isinstance(values[0], str) else np.array(values)
+            for name, values in rows.items()}
+
+def run_rescore(facts_path, out_path=None, top=20):
+    """
+    Re-computes scores and grades for a stored audit with the active scoring
+    rules (built-in constants or --rules), in one vectorized pass, and
+    reports how the grades moved. Returns the report string.
+    """
+    import numpy as np
+    started = time.perf_counter()
+    columns = load_rescore_columns(facts_path, SCORING_RULES.fields)
+    loaded = time.perf_counter()
+    new_scores, new_grades = SCORING_RULES.score_columns({name: columns[name] for name in SCORING_RULES.fields})
+    scored = time.perf_counter()
+    old_scores = columns['score'].astype(np.int64)
+    old_grades = columns['grade'].astype(str)
+    urls = columns['url']
+    pages = len(urls)
+
+    output_buffer = []
+    output_buffer.append("\n" + "="*70)
+    output_buffer.append("           R E - S C O R E D   A U D I T")
+    output_buffer.append("="*70)
+    output_buffer.append(f"  Source: {facts_path}")
+    output_buffer.append(f"  Pages: {pages} (loaded in {loaded - started:.2f}s, scored in {scored - loaded:.2f}s)")
+    if not pages:
+        output_buffer.append("="*70)
+        report = "\n".join(output_buffer)
+        print(report)
+        return report
+    output_buffer.append(f"  Average score: {old_scores.mean():.1f}% -> {new_scores.mean():.1f}%")
+
+    output_buffer.append("\n--- Grade Distribution (stored -> re-scored) ---")
+    for _, grade in SCORING_RULES.grading:
+        before, after = int((old_grades == grade).sum()), int((new_grades == grade).sum())
+        if before or after:
+            output_buffer.append(f"  {grade:<3} {before:>9} -> {after:<9} ({after - before:+d})")
+
+    delta = new_scores - old_scores
+    changed = np.flatnonzero(new_grades != old_grades)
+    output_buffer.append(f"\n--- Grade Changes ({changed.size}) ---")
+    if not changed.size:
+        output_buffer.append("  ✅ No page changed grade.")
+    for label, order in (("Largest drops", np.argsort(delta, kind='stable')), ("Largest gains", np.argsort(-delta, kind='stable'))):
+        moved = [i for i in order[:top].tolist() if delta[i] != 0 and ((delta[i] < 0) == (label == "Largest drops"))]
+        if moved:
+            output_buffer.append(f"  {label}:")
+            for i in moved:
+                output_buffer.append(f"    > {urls[i]}: {old_scores[i]}% ({old_grades[i]}) -> {new_scores[i]}% ({new_grades[i]})")
+    output_buffer.append("="*70)
+
+    report = "\n".join(output_buffer)
+    print(report)
+    if out_path:
+        import csv
+        try:
+            with open(out_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['url', 'stored_score', 'stored_grade', 'score', 'grade'])
+                writer.writerows(zip(urls.tolist(), old_scores.tolist(), old_grades.tolist(), new_scores.tolist(), new_grades.tolist()))
+            print(f"✅ Re-scored pages saved to: {out_path}")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file. Check permissions or the path provided. ({e})")
+    return report
+
+def summarize_results_chunk(path, start, end, section_depth=1, site_root=None):
+    """SiteSummary of the records between two offsets of a bulk-audit JSONL file (runs in a worker process)."""
+    summary = SiteSummary(section_depth=section_depth)
+    for record in iter_jsonl_range(path, start, end):
+        section_path = record.get('site_path') or section_path_for(record['url'], site_root)
+        summary.add(section_path, record['score'], record['grade'], page_failed_checks(record))
+    return summary
+
+def run_summary(sources, section_depth=1, workers=None, site_root=None, json_path=None, top=10, rules_path=None):
+    """
+    Aggregates stored audits into one site summary without holding the
+    pages in memory: bulk-audit JSONL files are cut into line-aligned chunks
+    summarized by a process pool, and summaries saved by `audit --summary`
+    are loaded as they are; everything is merged. Failed checks missing from
+    older records are evaluated with the active rules (`rules_path` is the
+    --rules file, loaded again in each worker). Returns the report string.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    started = time.perf_counter()
+    summary = SiteSummary(section_depth=section_depth)
+    chunks = []
+    for path in sources:
+        if path.lower().endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = SiteSummary.from_dict(json.load(f))
+            if stored.section_depth != section_depth:
+                raise ValueError(f"'{path}' groups sections at depth {stored.section_depth}, not {section_depth}")
+            summary.merge(stored)
+        else:
+            chunks.extend((path, start, end) for start, end in jsonl_chunks(path))
+    if len(chunks) == 1:
+        summary.merge(summarize_results_chunk(*chunks[0], section_depth, site_root))
+    elif chunks:
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_scoring_rules if rules_path else None,
+                                 initargs=(rules_path,) if rules_path else ()) as executor:
+            futures = [executor.submit(summarize_results_chunk, *chunk, section_depth, site_root) for chunk in chunks]
+            for future in as_completed(futures):
+                summary.merge(future.result())
+    elapsed = time.perf_counter() - started
+
+    output_buffer = []
+    output_buffer.append("\n" + "="*70)
+    output_buffer.append("           S I T E   S C O R E   S U M M A R Y")
+    output_buffer.append("="*70)
+    output_buffer.append(f"  Sources: {', '.join(sources)}")
+    output_buffer.append(f"  Pages: {summary.pages} ({len(chunks)} chunk(s) summarized in {elapsed:.2f}s)")
+    output_buffer.extend(format_summary_report(summary, grade_order(), top=top))
+    output_buffer.append("="*70)
+
+    report = "\n".join(output_buffer)
+    print(report)
+    if json_path:
+        try:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(summary.to_dict(), f, ensure_ascii=False)
+            print(f"✅ Merged summary saved to: {json_path}")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file. Check permissions or the path provided. ({e})")
+    return report
+
+def rewrite_host(url, host):
+    """`url` served from another host: `host` is a host name (scheme kept) or scheme://host[:port]."""
+    parts = urlsplit(url)
+    scheme, _, netloc = host.rpartition('://')
+    return urlunsplit((scheme or parts.scheme, netloc, parts.path, parts.query, ''))
+
+def iter_live_records(targets, head_only=False, honor_robots=True):
+    """Audits URLs (or local files) one by one and yields their page records, for `diff` sides that are not stored runs."""
+    for position, target in enumerate(targets, 1):
+        if target.startswith(('http://', 'https://')):
+            if honor_robots:
+                allowed, rule = robots_cache().verdict(target, ROBOTS_USER_AGENT)
+                if not allowed:
+                    print(f"ℹ️ [{position}/{len(targets)}] {target} — skipped, disallowed by robots.txt ({rule})")
+                    continue
+            html_content, http_info = fetch_page(target, quiet=True, head_only=head_only)
+        else:
+            page = read_local_page(target, head_only=head_only)
+            html_content, http_info = page.html, None
+            if page.error:
+                print(f"❌ ERROR: Could not read '{target}'. ({page.error})")
+        if html_content is None:
+            continue
+        try:
+            record = build_page_record(audit_html(html_content, target, head_only=head_only, http_info=http_info))
+        except Exception as e:
+            print(f"❌ [{position}/{len(targets)}] {target} — could not be audited ({e})")
+            continue
+        print(f"✅ [{position}/{len(targets)}] {target} — {record['score']}% ({record['grade']})")
+        yield record
+
+def diff_side(source, host=None, head_only=False, honor_robots=True):
+    """
+    Page records of one `diff` side: a stored run (bulk-audit JSONL, read as
+    a stream) or a list of URLs/paths audited now, optionally fetched from
+    another `host`. Returns (records, label, hosts the URLs were rewritten from).
+    """
+    if source.lower().endswith('.jsonl'):
+        return iter_jsonl_range(source, 0, os.path.getsize(source)), source, set()
+    targets = load_audit_targets(source)
+    original_hosts = set()
+    if host:
+        original_hosts = {urlsplit(target).netloc for target in targets if target.startswith(('http://', 'https://'))}
+        targets = [rewrite_host(target, host) if target.startswith(('http://', 'https://')) else target for target in targets]
+    label = f"{source} ({len(targets)} target(s) audited live{f' on {host}' if host else ''})"
+    return iter_live_records(targets, head_only=head_only, honor_robots=honor_robots), label, original_hosts
+
+def run_diff(left, right, left_host=None, right_host=None, left_root=None, right_root=None, aliases=(),
+             out_path=None, head_only=False, honor_robots=True, max_examples=10):
+    """
+    Compares two result sets page by page (see seokit/diff.py): pages are
+    aligned on normalized path by a sort-merge join over sorted on-disk runs,
+    so memory does not grow with the number of pages. Reports field-level
+    metadata changes, pages found on one side only and score/grade moves;
+    `out_path` receives every change as JSONL. Returns the RunDiff.
+    """
+    import tempfile
+    left_records, left_label, left_hosts = diff_side(left, left_host, head_only, honor_robots)
+    right_records, right_label, right_hosts = diff_side(right, right_host, head_only, honor_robots)
+    aliases = set(aliases) | left_hosts | right_hosts
+    out_file = open(out_path, 'w', encoding='utf-8') if out_path else None
+    diff = RunDiff(max_examples=max_examples, out_file=out_file)
+    try:
+        with tempfile.TemporaryDirectory(prefix='seokit-diff-') as tmp_dir:
+            left_pages = SortedPages(left_records, tmp_dir, root=left_root)
+            right_pages = SortedPages(right_records, tmp_dir, root=right_root)
+            for key, old, new in join_pages(left_pages, right_pages, aliases):
+                diff.add(key, old, new)
+            diff.duplicates = (left_pages.duplicates, right_pages.duplicates)
+    finally:
+        if out_file:
+            out_file.close()
+    print("\n".join(format_diff_report(diff, left_label, right_label)))
+    if out_path:
+        print(f"✅ Changes saved to: {out_path}")
+    return diff
+
+# ----------------------------------------------------------------------
+# 5. AUDIT SERVER (`serve`: one warm worker pool for many requests)
+# ----------------------------------------------------------------------
+
+WARM_UP_PAGE = """<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Warm-up page</title>
+<meta name="description" content="Parsed once per worker so the first real request is not the slow one.">
+<link rel="canonical" href="https://www.example.com/"><script type="application/ld+json">{"@type": "WebSite", "name": "x"}</script>
+</head><body><h1>Warm-up</h1><img src="a.png" alt="a"><a href="/b">b</a></body></html>"""
+
+def init_serve_worker(rules_path=None):
+    """Process pool initializer for `serve`: loads the ruleset and runs one audit so imports and caches are warm."""
+    if rules_path:
+        use_scoring_rules(rules_path)
+    audit_html(WARM_UP_PAGE, 'warm-up')
+
+def serve_audit(request):
+    """
+    Audits one `serve` request in a worker process: request['html'] when
+    given (request['url'] is then only its address), otherwise the fetched
+    request['url']. Returns (HTTP status, page record as in --jsonl).
+    """
+    html_content, http_info = request['html'], None
+    source = request['url'] or 'request'
+    if html_content is None:
+        html_content, http_info = fetch_page(request['url'], quiet=True, head_only=request['head_only'])
+        if html_content is None:
+            return 502, {'error': f"Could not fetch '{request['url']}'", 'http': http_info}
+    elif request['head_only']:
+        html_content = head_section(html_content)
+    try:
+        started = time.perf_counter()
+        audit = audit_html(html_content, source, head_only=request['head_only'], http_info=http_info)
+        elapsed = time.perf_counter() - started
+        AUDIT_SECONDS_METRIC.observe(elapsed)
+    except Exception as e:
+        return 422, {'error': f"Could not audit '{source}' ({e})"}
+    record = build_page_record(audit)
+    record['audit_ms'] = round(elapsed * 1000, 3)
+    return 200, record
+
+def run_serve_command(args):
+    """Implements `seo-checker.py serve`: runs the audit server until interrupted."""
+    server = AuditServer(serve_audit, workers=args.workers, initializer=init_serve_worker,
+                         initargs=(args.rules,), max_pending=args.max_pending)
+    try:
+        server.warm_up()
+        address = server.bind(port=args.port, host=args.host, socket_path=args.socket)
+    except OSError as e:
+        print(f"❌ ERROR: Could not start the audit server. ({e})")
+        server.close()
+        return 2
+    print(f"✅ Audit server ready on {address} ({server.workers} worker(s), up to {server.max_pending} pending audits).")
+    if args.socket:
+        print(f"ℹ️ Try: curl --unix-socket {args.socket} --data-binary @page.html -H 'Content-Type: text/html' http://localhost/audit")
+    else:
+        print(f"ℹ️ Try: curl --data-binary @page.html -H 'Content-Type: text/html' {address}/audit")
+    import signal
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))     # Stop cleanly (workers included) when a service manager asks
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nℹ️ Audit server stopped.")
+    finally:
+        server.close()
+    return 0
+
+# ----------------------------------------------------------------------
+# 6. MAIN EXECUTION (User Interface)
+# ----------------------------------------------------------------------
+
+def run_interactive_menu():
+    """The original prompt-driven interface (used when no command-line arguments are given)."""
     while True:
         print("\n" + "="*70)
         print("           W E L C O M E   T O   T H E   S E O   A S S I S T A N T")
@@ -688,9 +1849,10 @@ if __name__ == "__main__":
         print("Choose your audit source:")
         print("1. Local File (HTML file on your computer)")
         print("2. Web URL (Live website address)")
-        print("3. Exit")
+        print("3. Bulk Audit (text file with one URL or file path per line)")
+        print("4. Exit")
         
-        choice = input("Enter your choice (1, 2, or 3): ").strip()
+        choice = input("Enter your choice (1, 2, 3, or 4): ").strip()
 
         if choice == '1':
             target = input("Enter the full path to the HTML file: ").strip()
@@ -708,7 +1870,359 @@ if __name__ == "__main__":
                 save_results_to_file(report_content, target)
                 break
         elif choice == '3':
+            list_file = input("Enter the path to the list file: ").strip()
+            try:
+                targets = load_audit_targets(list_file)
+            except Exception as e:
+                print(f"❌ ERROR: Could not read list file. ({e})")
+                continue
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            report_content = run_bulk_audit(targets, jsonl_path=f"site_audit_results_{timestamp}.jsonl")
+            if report_content:
+                save_results_to_file(report_content, "site")
+                break
+        elif choice == '4':
             print("Exiting SEO Assistant. Goodbye!")
             break
         else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+            print("Invalid choice. Please enter 1, 2, 3, or 4.")
+
+def run_rules_command(args):
+    """Implements `seo-checker.py rules`."""
+    if args.check:
+        try:
+            compiled = compile_scoring_rules(load_ruleset(args.check))
+        except (OSError, ValueError) as e:
+            print(f"❌ Ruleset '{args.check}' is invalid. ({e})")
+            return 1
+        print(f"✅ Ruleset '{args.check}' compiled: {len(compiled.rules)} rule(s), max score {compiled.max_score:g}.")
+        return 0
+    ruleset_json = json.dumps(default_scoring_ruleset(), indent=2)
+    if args.dump in (None, "-"):
+        print(ruleset_json)
+    else:
+        with open(args.dump, 'w', encoding='utf-8') as f:
+            f.write(ruleset_json + "\n")
+        print(f"✅ Built-in ruleset written to: {args.dump}")
+    return 0
+
+def run_sitemap_command(args):
+    """Implements `seo-checker.py sitemap`: validates sitemaps without auditing the pages."""
+    reader = SitemapReader(args.sources, session=http_session())
+    out_file = open(args.out, 'w', encoding='utf-8') if args.out else None
+    try:
+        for position, entry in enumerate(reader, 1):
+            if out_file:
+                out_file.write(entry['loc'] + "\n")
+            if position % 100000 == 0:
+                print(f"ℹ️ {position} URLs read...")
+    finally:
+        if out_file:
+            out_file.close()
+    print("\n".join(format_sitemap_report(reader)))
+    if args.out:
+        print(f"✅ {reader.urls} URL(s) saved to: {args.out} (audit them with: seo-checker.py audit --list {args.out})")
+    return 1 if any(ISSUES_BY_KIND[kind][0] == '❌' for kind in reader.issues) else 0
+
+def run_reconcile_command(args):
+    """
+    Implements `seo-checker.py reconcile`: joins the analytics log's page
+    views with the served titles of a stored audit (--jsonl) and the sitemap
+    URLs, in one streaming pass over the log.
+    """
+    if not args.jsonl and not args.sitemap:
+        print("❌ ERROR: Pass --jsonl FILE (audited titles) and/or --sitemap SOURCE to reconcile against.")
+        return 2
+    reconciler = TitleReconciler()
+    try:
+        for path in args.jsonl or ():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = loads_json(line)
+                        reconciler.add_page(record['url'], record['facts']['title'])
+        if args.sitemap:
+            sitemap = SitemapReader(args.sitemap, session=http_session())
+            for entry in sitemap:
+                reconciler.add_sitemap_url(entry['loc'])
+        reconciler.read_logs(args.log)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"❌ ERROR: Could not reconcile. ({e})")
+        return 1
+    print("\n".join(format_reconcile_report(reconciler)))
+    if args.out:
+        import csv
+        try:
+            with open(args.out, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['path', 'url', 'views', 'in_sitemap', 'served_title', 'client_title', 'title_mismatch_share'])
+                writer.writerows(reconciler.rows())
+            print(f"✅ Reconciled paths saved to: {args.out}")
+        except Exception as e:
+            print(f"❌ ERROR: Could not save file. Check permissions or the path provided. ({e})")
+    return 1 if reconciler.missing_from_sitemap() else 0
+
+def run_history_command(args):
+    """Implements `seo-checker.py history`."""
+    if not os.path.exists(args.store):
+        print(f"❌ ERROR: Audit history '{args.store}' does not exist.")
+        return 1
+    with AuditStore(args.store) as store:
+        if args.url:
+            rows = store.page_history(args.url, limit=args.runs)
+            if not rows:
+                print(f"ℹ️ No stored results for '{args.url}'.")
+                return 1
+            print(f"\n--- Score History: {args.url} ---")
+            for run_id, started_at, score, grade in rows:
+                print(f"  #{run_id:<4} {started_at}  {score:>3}% ({grade})")
+            return 0
+        print("\n".join(format_history_report(store, grade_ranks(), bucket=args.bucket, runs=args.runs)))
+    return 0
+
+def build_arg_parser():
+    """Command-line interface for non-interactive (scripted/CI) use."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="seo-checker.py",
+        description="SEO metadata auditor. Run without arguments for the interactive menu."
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command")
+
+    audit_parser = subparsers.add_parser("audit", help="Audit one or more URLs / HTML files and write a site report.")
+    audit_parser.add_argument("targets", nargs="*", help="URLs or local HTML file paths.")
+    audit_parser.add_argument("--list", dest="list_file", help="Text file with one URL or file path per line.")
+    audit_parser.add_argument("--dir", help="Audit every .html/.htm file of a static site build directory (walked like sitemap-generator.py).")
+    audit_parser.add_argument("--base-url", help="With --dir: the site's address (e.g. https://www.example.com/), so absolute internal links "
+                                                 "resolve to the built files (default: root-relative links only).")
+    audit_parser.add_argument("--manifest", help="Incremental audits: reuse the stored results of files whose size/mtime (or content) "
+                                                 "did not change since the last run with this manifest (SQLite, created if missing).")
+    audit_parser.add_argument("--jsonl", help="Write one JSON record per audited page to this file.")
+    audit_parser.add_argument("--report", help="Save the site report (text) to this file.")
+    audit_parser.add_argument("--homepage", help="Click-depth origin for the link graph (default: root of the first URL).")
+    audit_parser.add_argument("--sitemap-urls", help="Text file listing the URLs expected to be linked (orphan detection).")
+    audit_parser.add_argument("--sitemap", action="append", metavar="SOURCE",
+                              help="Audit the URLs of a sitemap or sitemap index (URL or file, .gz allowed) and validate it. Repeatable.")
+    audit_parser.add_argument("--rules", help="Scoring ruleset file (.json/.yaml) replacing the built-in rules.")
+    audit_parser.add_argument("--columns", help="Save the per-page facts as a columnar file (.npz, or .parquet with pyarrow) for `rescore`.")
+    audit_parser.add_argument("--summary", help="Save the score summary (mergeable, JSON) to this file for `summary`.")
+
+    audit_parser.add_argument("--head-only", action="store_true",
+                              help="Stop each download after </head> and skip body-level checks (images, links).")
+    audit_parser.add_argument("--max-bytes", type=int, default=MAX_FETCH_BYTES,
+                              help=f"Maximum bytes read per page (default: {MAX_FETCH_BYTES}).")
+    audit_parser.add_argument("--ignore-robots", action="store_true",
+                              help=f"Also fetch URLs that robots.txt disallows for '{ROBOTS_USER_AGENT}' (default: skip them).")
+    audit_parser.add_argument("--resource-sizes", action="store_true",
+                              help="Measure render-blocking CSS/JS with HEAD requests for the critical-path estimate.")
+    audit_parser.add_argument("--pdf", help="Save a combined summary PDF (with table of contents) to this file.")
+    audit_parser.add_argument("--pdf-dir", help="Save one structured PDF per audited page into this directory.")
+    audit_parser.add_argument("--pdf-workers", type=int, help="Processes used to render --pdf-dir PDFs (default: CPU count).")
+    audit_parser.add_argument("--store", help="Append this run to a SQLite audit history database (created if missing).")
+    audit_parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                              help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics during the run.")
+    audit_parser.add_argument("--profile", metavar="FILE",
+                              help="Profile the run: a Chrome trace of the audit stages for .json paths, cProfile statistics (pstats) otherwise.")
+    audit_parser.add_argument("--traffic", metavar="LOG",
+                              help="Tracker analytics.log (or its directory; rotated and .gz logs included): audit the busiest pages first and report traffic-weighted scores.")
+
+    status_parser = subparsers.add_parser("status", help="Status-only sweep (HEAD first): status codes, redirect chains, robots/canonical headers.")
+    status_parser.add_argument("targets", nargs="*", help="URLs to probe.")
+    status_parser.add_argument("--list", dest="list_file", help="Text file with one URL per line.")
+    status_parser.add_argument("--out", help="Write one CSV row per URL to this file.")
+    status_parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                               help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics during the sweep.")
+    status_parser.add_argument("--ignore-robots", action="store_true",
+                               help=f"Also probe URLs that robots.txt disallows for '{ROBOTS_USER_AGENT}'.")
+    status_parser.add_argument("--workers", type=int, default=STATUS_SWEEP_WORKERS,
+                               help=f"Concurrent requests (default: {STATUS_SWEEP_WORKERS}).")
+
+    sitemap_parser = subparsers.add_parser("sitemap", help="Validate sitemaps / sitemap indexes (URL or file, .gz allowed) without auditing pages.")
+    sitemap_parser.add_argument("sources", nargs="+", help="Sitemap URLs or files.")
+    sitemap_parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                                help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics while reading.")
+    sitemap_parser.add_argument("--out", help="Write the unique URLs (one per line) to this file, for `audit --list`.")
+
+    reconcile_parser = subparsers.add_parser("reconcile", help="Join analytics.log page views with served titles and sitemap URLs (JS-rewritten titles, untracked pages).")
+    reconcile_parser.add_argument("log", help="Tracker analytics.log or its directory (rotated and .gz logs included).")
+    reconcile_parser.add_argument("--jsonl", action="append", help="Per-page results written by `audit --jsonl` (served <title> per page; repeatable).")
+    reconcile_parser.add_argument("--sitemap", action="append", metavar="SOURCE",
+                                  help="Sitemap or sitemap index (URL or file, .gz allowed), e.g. written by sitemap-generator.py (repeatable).")
+    reconcile_parser.add_argument("--out", help="Write one CSV row per path to this file.")
+
+    history_parser = subparsers.add_parser("history", help="Show score trends and grade drops from an audit history database.")
+    history_parser.add_argument("store", help="SQLite database written by `audit --store`.")
+    history_parser.add_argument("--url", help="Show the score history of one page instead.")
+    history_parser.add_argument("--runs", type=int, default=10, help="Number of recent runs to show (default: 10).")
+    history_parser.add_argument("--bucket", type=int, default=10, help="Score histogram bucket width (default: 10).")
+
+    rescore_parser = subparsers.add_parser("rescore", help="Re-grade a stored audit (fact columns or JSONL) without fetching or parsing.")
+    rescore_parser.add_argument("facts", help="File written by `audit --columns` (.npz/.parquet) or `audit --jsonl`.")
+    rescore_parser.add_argument("--rules", help="Scoring ruleset file (.json/.yaml) replacing the built-in rules.")
+    rescore_parser.add_argument("--out", help="Write url, stored and new score/grade per page to this CSV file.")
+
+    summary_parser = subparsers.add_parser("summary", help="Merge stored audits (JSONL or --summary files) into one site summary: "
+                                                           "score percentiles per section, grades, most failed checks, worst pages.")
+    summary_parser.add_argument("results", nargs="+", help="Files written by `audit --jsonl` or `audit --summary` (.json).")
+    summary_parser.add_argument("--depth", type=int, default=1, help="Path segments that make up a section (default: 1, e.g. /blog).")
+    summary_parser.add_argument("--root", help="Directory local file paths are made relative to, for records without a stored site path "
+                                                "(default: working directory).")
+    summary_parser.add_argument("--workers", type=int, help="Processes summarizing JSONL chunks (default: CPU count).")
+    summary_parser.add_argument("--top", type=int, default=10, help="Number of most failed checks to list (default: 10).")
+    summary_parser.add_argument("--rules", help="Scoring ruleset file (.json/.yaml) for records without stored failed checks.")
+    summary_parser.add_argument("--json", help="Save the merged summary to this file (can be merged again).")
+
+    diff_parser = subparsers.add_parser("diff", help="Compare two audits page by page (two stored runs, or staging vs production): "
+                                                     "metadata changes and score deltas, matched by path.")
+    diff_parser.add_argument("left", help="Stored run (`audit --jsonl` file, .jsonl) or a list of URLs/paths to audit now.")
+    diff_parser.add_argument("right", help="Same, for the other side.")
+    diff_parser.add_argument("--left-host", metavar="HOST", help="Fetch the left URL list from this host instead (e.g. staging.example.com or http://localhost:8000).")
+    diff_parser.add_argument("--right-host", metavar="HOST", help="Fetch the right URL list from this host instead.")
+    diff_parser.add_argument("--left-root", metavar="DIR", help="Directory the left side's local file paths are relative to, for records without a stored site path "
+                                                                   "(default: working directory).")
+    diff_parser.add_argument("--right-root", metavar="DIR", help="Directory the right side's local file paths are relative to.")
+    diff_parser.add_argument("--alias", action="append", metavar="HOST",
+                             help="Host treated as the site itself when comparing canonical/hreflang/og:url (repeatable; rewritten hosts are included).")
+    diff_parser.add_argument("--out", help="Write every changed page (field-level changes, scores) as JSONL to this file.")
+    diff_parser.add_argument("--head-only", action="store_true", help="Audit live sides head-only.")
+    diff_parser.add_argument("--ignore-robots", action="store_true",
+                             help=f"Also fetch URLs that robots.txt disallows for '{ROBOTS_USER_AGENT}' (staging hosts often disallow everything).")
+    diff_parser.add_argument("--examples", type=int, default=10, help="Example pages shown per changed field (default: 10).")
+
+    serve_parser = subparsers.add_parser("serve", help="Run a local audit server: POST HTML (or ?url=) to /audit, get the page record as JSON.")
+    serve_parser.add_argument("--port", type=int, default=SERVE_PORT, help=f"Port to listen on (default: {SERVE_PORT}).")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1, local only).")
+    serve_parser.add_argument("--socket", metavar="PATH", help="Listen on this Unix socket instead of a port.")
+    serve_parser.add_argument("--workers", type=int, help="Audit worker processes (default: CPU count).")
+    serve_parser.add_argument("--max-pending", type=int, help="Audits queued or running before requests get 503 (default: 8 per worker).")
+    serve_parser.add_argument("--rules", help="Scoring ruleset file (.json/.yaml) replacing the built-in rules.")
+
+    rules_parser = subparsers.add_parser("rules", help="Export or check declarative scoring rulesets.")
+    rules_parser.add_argument("--dump", nargs="?", const="-", metavar="FILE", help="Write the built-in ruleset as JSON (stdout if no FILE).")
+    rules_parser.add_argument("--check", metavar="FILE", help="Validate and compile a ruleset file.")
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_interactive_menu()
+        return 0
+
+    args = build_arg_parser().parse_args(argv)
+    if getattr(args, 'rules', None) and args.command != "rules":
+        try:
+            use_scoring_rules(args.rules)
+        except (OSError, ValueError) as e:
+            print(f"❌ ERROR: Could not load scoring rules '{args.rules}'. ({e})")
+            return 2
+
+    try:
+        server = metrics.serve(args.metrics_port) if getattr(args, 'metrics_port', None) else metrics.serve_from_environment()
+    except (OSError, ValueError) as e:
+        print(f"❌ ERROR: Could not start the metrics endpoint. ({e})")
+        return 2
+    if server:
+        print(f"ℹ️ Metrics: http://127.0.0.1:{server.server_address[1]}/metrics")
+
+    if args.command == "rules":
+        return run_rules_command(args)
+    if args.command == "audit":
+        targets = list(args.targets)
+        if args.list_file:
+            targets.extend(load_audit_targets(args.list_file))
+        if args.dir:
+            if not os.path.isdir(args.dir):
+                print(f"❌ ERROR: Directory not found: {args.dir}")
+                return 2
+            targets.extend(path for path, _ in iter_site_files(args.dir, HTML_EXTENSIONS))
+        if targets and args.sitemap:
+            print("❌ ERROR: Pass either URLs/paths (--list) or --sitemap, not both.")
+            return 2
+        sitemap = SitemapReader(args.sitemap, session=http_session()) if args.sitemap else None
+        if sitemap:
+            targets = (entry['loc'] for entry in sitemap)
+        elif not targets:
+            print("❌ ERROR: No targets given. Pass URLs/paths, --list FILE or --sitemap SOURCE.")
+            return 2
+        sitemap_urls = load_audit_targets(args.sitemap_urls) if args.sitemap_urls else None
+        traffic = None
+        if args.traffic:
+            try:
+                traffic = TrafficCounts.from_logs(args.traffic)
+            except OSError as e:
+                print(f"❌ ERROR: Could not read the analytics log '{args.traffic}'. ({e})")
+                return 2
+            print(f"ℹ️ {traffic.total_views} page view(s) of {len(traffic.paths)} path(s) read from {len(traffic.files)} log file(s).")
+        manifest = None
+        if args.manifest:
+            try:
+                manifest = AuditManifest(args.manifest, args.dir or '.', manifest_fingerprint(args.head_only))
+            except sqlite3.Error as e:
+                print(f"❌ ERROR: Could not open the manifest '{args.manifest}'. ({e})")
+                return 2
+        options = dict(jsonl_path=args.jsonl, report_path=args.report,
+                       homepage=args.homepage, sitemap_urls=sitemap_urls, columns_path=args.columns, store_path=args.store,
+                       pdf_dir=args.pdf_dir, pdf_path=args.pdf, pdf_workers=args.pdf_workers,
+                       head_only=args.head_only, max_bytes=args.max_bytes, resource_sizes=args.resource_sizes,
+                       honor_robots=not args.ignore_robots, sitemap=sitemap, traffic=traffic, manifest=manifest,
+                       site_root=args.dir, base_url=args.base_url, summary_path=args.summary, run_label=audit_run_label(args))
+        report = None
+        try:
+            if args.profile:
+                report = run_profiled(args.profile, run_bulk_audit, targets, **options)
+                viewer = "chrome://tracing or https://ui.perfetto.dev" if args.profile.lower().endswith('.json') else f"python -m pstats {args.profile}"
+                print(f"✅ Profile saved to: {args.profile} (open with: {viewer})")
+            else:
+                report = run_bulk_audit(targets, **options)
+        finally:
+            if manifest:
+                # A completed --dir run saw every file, so entries of deleted pages can go
+                manifest.close(prune=bool(report and args.dir))
+        return 0 if report else 1
+    if args.command == "sitemap":
+        return run_sitemap_command(args)
+    if args.command == "status":
+        targets = list(args.targets) + (load_audit_targets(args.list_file) if args.list_file else [])
+        if not targets:
+            print("❌ ERROR: No URLs given. Pass URLs or --list FILE.")
+            return 2
+        run_status_sweep(targets, out_path=args.out, workers=max(args.workers, 1), honor_robots=not args.ignore_robots)
+        return 0
+    if args.command == "reconcile":
+        return run_reconcile_command(args)
+    if args.command == "serve":
+        return run_serve_command(args)
+    if args.command == "history":
+        return run_history_command(args)
+    if args.command == "rescore":
+        try:
+            run_rescore(args.facts, out_path=args.out)
+        except (OSError, KeyError, RuntimeError, ValueError) as e:
+            print(f"❌ ERROR: Could not re-score '{args.facts}'. ({e})")
+            return 1
+        return 0
+    if args.command == "diff":
+        try:
+            diff = run_diff(args.left, args.right, left_host=args.left_host, right_host=args.right_host,
+                            left_root=args.left_root, right_root=args.right_root, aliases=args.alias or (),
+                            out_path=args.out, head_only=args.head_only, honor_robots=not args.ignore_robots,
+                            max_examples=args.examples)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ ERROR: Could not compare the audits. ({e})")
+            return 2
+        return 1 if diff.changed_pages or diff.only_left or diff.only_right or diff.improved or diff.worsened else 0
+    if args.command == "summary":
+        try:
+            run_summary(args.results, section_depth=args.depth, workers=args.workers, site_root=args.root,
+                        json_path=args.json, top=args.top, rules_path=args.rules)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ ERROR: Could not summarize the results. ({e})")
+            return 1
+        return 0
+
+    build_arg_parser().print_help()
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
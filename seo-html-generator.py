@@ -3,6 +3,126 @@ from tkinter import ttk, filedialog, messagebox, Toplevel, scrolledtext
 import os
 import json
 from datetime import datetime
+from seokit.schema import build_json_ld, buildable_schema_types
+
+# ----------------------------------------------------------------------
+# HTML rendering (no GUI: `v` is the settings dictionary of the form, see
+# SeoHtmlGeneratorApp.get_current_settings)
+# ----------------------------------------------------------------------
+
+def generate_json_ld(v):
+    """Generates the structured data script based on the selected schema type."""
+    
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    schema_type = v['schema_type']
+
+    # Builders live in the registry shared with seo-checker.py (seokit/schema.py)
+    try:
+        data = build_json_ld(schema_type, v, current_date)
+    except KeyError:
+        return "<!-- ERROR: JSON-LD Schema Type not recognized or missing. -->"
+    except ValueError as e:
+        return f"<!-- WARNING: {e} -->"
+
+    json_content = json.dumps(data, indent=4)
+    
+    return f"""<script type="application/ld+json">
+{json_content}
+</script>"""
+    
+def generate_header_content(v):
+    """Generates the content to be placed directly inside an existing <head> tag."""
+    
+    json_ld_block = generate_json_ld(v)
+
+    header_content = f"""
+    <!-- Google Tag (gtag.js) -->
+    <script async src="https://www.googletagmanager.com/gtag/js?id={v['gtag_id']}"></script>
+    <script>
+      window.dataLayer = window.dataLayer || [];
+      function gtag(){{dataLayer.push(arguments);}}
+      gtag('js', new Date());
+      gtag('config', '{v['gtag_id']}');
+    </script>
+
+    <!-- JSON-LD Structured Data (For Rich Snippets) -->
+{json_ld_block}
+    
+    <!-- Canonical Link - High Priority -->
+    <link rel="canonical" href="{v['site_url']}" />
+
+    <title>{v['title']}</title>
+
+    <!-- Basic Meta Tags for SEO -->
+    <meta name="description" content="{v['description']}">
+    <meta name="keywords" content="{v['keywords']}">
+    <meta name="author" content="{v['author']}">
+
+    <!-- External CSS for Consistency (Normalize.css) -->
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/normalize/8.0.1/normalize.min.css">
+
+    <!-- Comprehensive Favicon and Manifest Links - Uses root-relative URLs (/favicon.ico) -->
+    <link rel="icon" href="/favicon.ico" sizes="any">
+    <link rel="icon" href="/favicon-32x32.png" type="image/png" sizes="32x32">
+    <link rel="icon" href="/favicon-16x16.png" type="image/png" sizes="16x16">
+    <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png">
+    <link rel="manifest" href="/site.webmanifest">
+    
+    <!-- Open Graph / Facebook / LinkedIn Meta Tags -->
+    <meta property="og:title" content="{v['title']}">
+    <meta property="og:description" content="{v['description']}">
+    <meta property="og:url" content="{v['site_url']}">
+    <meta property="og:type" content="{v['og_type']}">
+    <meta property="og:image" content="{v['image_url']}">
+
+    <!-- Twitter Card Meta Tags -->
+    <meta name="twitter:card" content="summary_large_image">
+    <meta name="twitter:site" content="{v['twitter_handle']}">
+    <meta name="twitter:creator" content="{v['twitter_handle']}">
+    <meta name="twitter:title" content="{v['title']}">
+    <meta name="twitter:description" content="{v['description']}">
+    <meta name="twitter:image" content="{v['image_url']}">
+"""
+    return header_content.strip()
+
+def generate_full_html_content(v):
+    """Constructs the full HTML document string."""
+    
+    header_content = generate_header_content(v)
+
+    # Construct the HTML structure
+    html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+
+{header_content}
+
+    <!-- Optional: Basic Styling for the Blank Page -->
+    <style>
+        body {{ font-family: sans-serif; margin: 20px; background-color: #f4f4f9; }}
+        h1 {{ color: #333; }}
+        code {{ background-color: #eee; padding: 2px 4px; border-radius: 3px; }}
+        .header-info {{ border: 1px solid #ccc; padding: 15px; background-color: #fff; margin-bottom: 20px; border-radius: 8px; }}
+    </style>
+</head>
+<body>
+    <div class="header-info">
+        <h1>{v['title']}</h1>
+        <p><strong>Description:</strong> {v['description']}</p>
+        <p>This is your generated SEO-optimized HTML boilerplate page. All necessary meta tags, JSON-LD, and Google Analytics code are included in the <code>&lt;head&gt;</code> section.</p>
+        <p>Start adding your main content here!</p>
+    </div>
+
+    <!-- START MAIN PAGE CONTENT HERE -->
+
+
+    <!-- END MAIN PAGE CONTENT HERE -->
+</body>
+</html>
+"""
+    return html_content
 
 class SeoHtmlGeneratorApp:
     def __init__(self, master):
@@ -134,7 +254,7 @@ class SeoHtmlGeneratorApp:
         schema_frame.grid(row=current_row, column=0, columnspan=2, sticky="ew", pady=5)
         ttk.Label(schema_frame, text="JSON-LD Schema Type:", style='SchemaType.TLabel').pack(side=tk.LEFT, padx=(0, 10))
 
-        schema_options = ["TechArticle", "FAQPage"]
+        schema_options = buildable_schema_types()
         self.schema_combo = ttk.Combobox(schema_frame, textvariable=self.vars["schema_type"], values=schema_options, state="readonly", width=20)
         self.schema_combo.pack(side=tk.LEFT, padx=(0, 20))
         self.schema_combo.bind("<<ComboboxSelected>>", self.toggle_schema_inputs)
@@ -357,167 +477,15 @@ class SeoHtmlGeneratorApp:
 
     def generate_json_ld(self, v):
         """Generates the structured data script based on the selected schema type."""
-        
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        schema_type = v['schema_type']
-        
-        data = {"@context": "https://schema.org"}
-        
-        if schema_type == "TechArticle":
-            data.update({
-                "@type": "TechArticle",
-                "headline": v['title'], 
-                "alternativeHeadline": "A generic headline for the demo tech article.", 
-                "articleBody": v['description'], 
-                "articleSection": ["Introduction", "Key Concepts", "Conclusion"],
-                "keywords": v['keywords'], 
-                "datePublished": current_date, 
-                "dateModified": current_date, 
-                "url": v['site_url'],
-                "image": v['json_ld_logo'],
-                "author": {
-                    "@type": "Person",
-                    "name": v['author']
-                },
-                "publisher": {
-                    "@type": "Organization",
-                    "name": v['json_ld_name'],
-                    "email": "info@example.com", 
-                    "logo": {
-                        "@type": "ImageObject",
-                        "url": v['json_ld_logo']
-                    }
-                },
-                "mainEntityOfPage": {
-                    "@type": "WebPage",
-                    "@id": v['site_url']
-                }
-            })
-            
-        elif schema_type == "FAQPage":
-            if not v['faq_pairs']:
-                return "<!-- WARNING: FAQPage schema selected, but no Q&A pairs were added. The generated schema will be empty. -->"
-            
-            faq_list = []
-            for pair in v['faq_pairs']:
-                faq_list.append({
-                    "@type": "Question",
-                    "name": pair['question'],
-                    "acceptedAnswer": {
-                        "@type": "Answer",
-                        "text": pair['answer']
-                    }
-                })
-
-            data.update({
-                "@type": "FAQPage",
-                "headline": v['title'],
-                "url": v['site_url'],
-                "mainEntity": faq_list
-            })
-            
-        else:
-            return "<!-- ERROR: JSON-LD Schema Type not recognized or missing. -->"
+        return generate_json_ld(v)
 
-        json_content = json.dumps(data, indent=4)
-        
-        return f"""<script type="application/ld+json">
-{json_content}
-</script>"""
-        
     def generate_header_content(self, v):
         """Generates the content to be placed directly inside an existing <head> tag."""
-        
-        json_ld_block = self.generate_json_ld(v)
-
-        header_content = f"""
-    <!-- Google Tag (gtag.js) -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id={v['gtag_id']}"></script>
-    <script>
-      window.dataLayer = window.dataLayer || [];
-      function gtag(){{dataLayer.push(arguments);}}
-      gtag('js', new Date());
-      gtag('config', '{v['gtag_id']}');
-    </script>
-
-    <!-- JSON-LD Structured Data (For Rich Snippets) -->
-{json_ld_block}
-    
-    <!-- Canonical Link - High Priority -->
-    <link rel="canonical" href="{v['site_url']}" />
-
-    <title>{v['title']}</title>
-
-    <!-- Basic Meta Tags for SEO -->
-    <meta name="description" content="{v['description']}">
-    <meta name="keywords" content="{v['keywords']}">
-    <meta name="author" content="{v['author']}">
-
-    <!-- External CSS for Consistency (Normalize.css) -->
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/normalize/8.0.1/normalize.min.css">
-
-    <!-- Comprehensive Favicon and Manifest Links - Uses root-relative URLs (/favicon.ico) -->
-    <link rel="icon" href="/favicon.ico" sizes="any">
-    <link rel="icon" href="/favicon-32x32.png" type="image/png" sizes="32x32">
-    <link rel="icon" href="/favicon-16x16.png" type="image/png" sizes="16x16">
-    <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png">
-    <link rel="manifest" href="/site.webmanifest">
-    
-    <!-- Open Graph / Facebook / LinkedIn Meta Tags -->
-    <meta property="og:title" content="{v['title']}">
-    <meta property="og:description" content="{v['description']}">
-    <meta property="og:url" content="{v['site_url']}">
-    <meta property="og:type" content="{v['og_type']}">
-    <meta property="og:image" content="{v['image_url']}">
-
-    <!-- Twitter Card Meta Tags -->
-    <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:site" content="{v['twitter_handle']}">
-    <meta name="twitter:creator" content="{v['twitter_handle']}">
-    <meta name="twitter:title" content="{v['title']}">
-    <meta name="twitter:description" content="{v['description']}">
-    <meta name="twitter:image" content="{v['image_url']}">
-"""
-        return header_content.strip()
+        return generate_header_content(v)
 
     def generate_full_html_content(self, v):
         """Constructs the full HTML document string."""
-        
-        header_content = self.generate_header_content(v)
-
-        # Construct the HTML structure
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-
-{header_content}
-
-    <!-- Optional: Basic Styling for the Blank Page -->
-    <style>
-        body {{ font-family: sans-serif; margin: 20px; background-color: #f4f4f9; }}
-        h1 {{ color: #333; }}
-        code {{ background-color: #eee; padding: 2px 4px; border-radius: 3px; }}
-        .header-info {{ border: 1px solid #ccc; padding: 15px; background-color: #fff; margin-bottom: 20px; border-radius: 8px; }}
-    </style>
-</head>
-<body>
-    <div class="header-info">
-        <h1>{v['title']}</h1>
-        <p><strong>Description:</strong> {v['description']}</p>
-        <p>This is your generated SEO-optimized HTML boilerplate page. All necessary meta tags, JSON-LD, and Google Analytics code are included in the <code>&lt;head&gt;</code> section.</p>
-        <p>Start adding your main content here!</p>
-    </div>
-
-    <!-- START MAIN PAGE CONTENT HERE -->
-
-
-    <!-- END MAIN PAGE CONTENT HERE -->
-</body>
-</html>
-"""
-        return html_content
+        return generate_full_html_content(v)
 
     def generate_html(self):
         """Saves the content based on the selected output format."""
@@ -0,0 +1,9 @@
+"""
+Shared building blocks for the SEO toolkit scripts (seo-checker.py,
+seo-html-generator.py and sitemap-generator.py).
+
+Modules in this package must stay cheap to import: heavy optional
+dependencies are imported inside the functions that need them.
+"""
+
+__version__ = "2.1.0"
@@ -0,0 +1,138 @@
+"""
+Columnar storage of per-page facts (NumPy .npz, or Parquet when pyarrow is installed).
+
+Bulk audits append one facts dictionary per page; the writer keeps one list
+per column and writes typed arrays at close. Strings are stored Arrow-style
+(one UTF-8 byte buffer plus an offsets array) so a million titles cost their
+actual length, not the length of the longest title times a million.
+
+Reading only decodes the columns that are asked for, which is what makes
+re-scoring a stored corpus nearly instant: the ruleset names the facts it
+needs and nothing else is touched.
+"""
+
+import json
+
+SCHEMA_KEY = '__schema__'
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Columnar fact files require NumPy. Install it with: pip install numpy")
+    return numpy
+
+
+def _kind_of(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'str'
+
+
+class FactsColumnWriter:
+    """Accumulates page rows column by column and writes them on close()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = {}       # name -> list of values
+        self.kinds = {}         # name -> 'bool' | 'int' | 'float' | 'str'
+        self.rows = 0
+
+    def append(self, row):
+        """Appends one row (dict). Columns missing from a row are filled with empty values."""
+        for name, value in row.items():
+            if name not in self.columns:
+                self.columns[name] = [None] * self.rows
+                self.kinds[name] = _kind_of(value)
+            self.columns[name].append(value)
+        self.rows += 1
+        for values in self.columns.values():
+            if len(values) < self.rows:
+                values.append(None)
+
+    def close(self):
+        if self.path.lower().endswith('.parquet'):
+            self._write_parquet()
+        else:
+            self._write_npz()
+        return self.path
+
+    def _typed(self, name):
+        kind = self.kinds[name]
+        values = self.columns[name]
+        if kind == 'str':
+            return ['' if v is None else str(v) for v in values]
+        default = {'bool': False, 'int': 0, 'float': 0.0}[kind]
+        return [default if v is None else v for v in values]
+
+    def _write_npz(self):
+        np = _numpy()
+        arrays = {SCHEMA_KEY: np.frombuffer(json.dumps(self.kinds).encode('utf-8'), dtype=np.uint8)}
+        for name, kind in self.kinds.items():
+            values = self._typed(name)
+            if kind == 'str':
+                encoded = [v.encode('utf-8') for v in values]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                np.cumsum([len(b) for b in encoded], out=offsets[1:])
+                arrays[f"{name}.offsets"] = offsets
+                arrays[f"{name}.data"] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            else:
+                arrays[name] = np.array(values, dtype={'bool': np.bool_, 'int': np.int64, 'float': np.float64}[kind])
+        with open(self.path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    def _write_parquet(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow. Install it with: pip install pyarrow (or use a .npz path)")
+        table = pa.table({name: self._typed(name) for name in self.kinds})
+        pq.write_table(table, self.path)
+
+
+def load_fact_columns(path, columns=None):
+    """
+    Loads a fact file into {column: NumPy array}. String columns come back as
+    object arrays. `columns` restricts loading (and string decoding) to the
+    given names; unknown names raise KeyError.
+    """
+    np = _numpy()
+    if path.lower().endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Reading Parquet requires pyarrow. Install it with: pip install pyarrow")
+        table = pq.read_table(path, columns=list(columns) if columns else None)
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+    with np.load(path) as archive:
+        kinds = json.loads(archive[SCHEMA_KEY].tobytes().decode('utf-8'))
+        wanted = list(kinds) if columns is None else list(columns)
+        loaded = {}
+        for name in wanted:
+            if name not in kinds:
+                raise KeyError(f"Column '{name}' is not stored in {path}")
+            if kinds[name] == 'str':
+                offsets = archive[f"{name}.offsets"]
+                data = archive[f"{name}.data"].tobytes()
+                bounds = offsets.tolist()
+                loaded[name] = np.array([data[a:b].decode('utf-8') for a, b in zip(bounds, bounds[1:])], dtype=object)
+            else:
+                loaded[name] = archive[name]
+        return loaded
+
+
+def column_names(path):
+    """Returns the stored column names (and their kinds) without loading any data."""
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return {field.name: str(field.type) for field in pq.read_schema(path)}
+    np = _numpy()
+    with np.load(path) as archive:
+        return json.loads(archive[SCHEMA_KEY].tobytes().decode('utf-8'))
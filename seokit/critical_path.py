@@ -0,0 +1,218 @@
+"""
+Critical rendering path analysis.
+
+Walks the document head in source order and models what the browser must
+download (or execute) before the first render: synchronous scripts,
+stylesheets that apply to screen, @import chains and large inline scripts.
+The result lists each resource, the third-party origins involved and how
+the resource hints on the page (preconnect, preload, ...) line up with
+them. It also includes an estimated render-blocking cost under a slow
+mobile connection.
+
+Resource sizes are optional: pass `sizes`, either {absolute URL: bytes} or a
+callable taking the blocking URLs and returning such a dict (for example
+fetch.ResourceSizeCache.sizes). Unknown sizes use DEFAULT_RESOURCE_BYTES.
+"""
+
+import re
+from urllib.parse import urljoin, urlsplit
+
+# Connection model (Lighthouse "slow 4G" mobile throttling)
+ASSUMED_RTT_MS = 150
+ASSUMED_THROUGHPUT_BYTES_PER_MS = 1638.4 * 1024 / 8 / 1000
+CONNECTION_SETUP_RTTS = 3               # DNS + TCP + TLS for an origin without preconnect
+DEFAULT_RESOURCE_BYTES = 30 * 1024      # Used when the size of a blocking resource is unknown
+INLINE_SCRIPT_LIMIT = 10 * 1024         # Inline scripts above this size are reported
+INLINE_PARSE_BYTES_PER_MS = 1024        # Rough parse/compile rate of inline script on a mid-range phone
+MAX_USEFUL_PRECONNECTS = 6
+
+_IMPORT_RE = re.compile(r"@import\s+(?:url\(\s*)?[\"']?([^\"')\s;]+)", re.IGNORECASE)
+
+
+def origin_of(url):
+    """scheme://host[:port] of an absolute http(s) URL, '' otherwise."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return ''
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def _absolute(base_url, href):
+    if href.startswith('//'):
+        return 'https:' + href
+    return urljoin(base_url, href) if base_url else href
+
+
+def _is_executable_script(script):
+    """Classic or module JavaScript; data blocks (JSON-LD, templates, ...) are never executed."""
+    script_type = (script.get('type') or '').strip().lower()
+    return not script_type or 'javascript' in script_type or 'ecmascript' in script_type or script_type == 'module'
+
+
+def _stylesheet_blocks(link):
+    """A stylesheet blocks rendering unless its media query cannot match a screen (print, ...)."""
+    if link.has_attr('disabled'):
+        return False
+    media = (link.get('media') or 'all').strip().lower()
+    return media in ('', 'all', 'screen') or 'screen' in media or media.startswith(('(', 'only screen'))
+
+
+def analyze_critical_path(soup, page_url='', sizes=None):
+    """
+    Returns a dictionary with the head resources in load order, blocking
+    bytes, third-party origins, hint cross-checks, image dimension findings
+    and an estimated render-blocking cost in milliseconds. `page_url` (the
+    page or its canonical URL) resolves relative URLs and decides which
+    origins are third-party.
+    """
+    head = soup.head or soup
+    page_origin = origin_of(page_url)
+    resources = []
+
+    def add(kind, url, blocking, reason, size=None, chained=False):
+        resources.append({'kind': kind, 'url': url, 'origin': origin_of(url), 'blocking': blocking,
+                          'reason': reason, 'bytes': size, 'chained': chained})
+
+    for tag in head.find_all(['script', 'link', 'style']):
+        if tag.name == 'script':
+            if not _is_executable_script(tag):
+                continue
+            src = tag.get('src')
+            is_module = (tag.get('type') or '').strip().lower() == 'module'
+            # async/defer are boolean attributes: presence counts, even when the value is empty
+            deferred = tag.has_attr('async') or tag.has_attr('defer') or is_module
+            if src:
+                add('script', _absolute(page_url, src), not deferred,
+                    'async' if tag.has_attr('async') else 'defer' if deferred else 'synchronous script in <head>')
+            else:
+                code = tag.string or ''
+                size = len(code.encode('utf-8'))
+                if size:
+                    add('inline-script', '', size > INLINE_SCRIPT_LIMIT and not is_module,
+                        f'inline script ({size / 1024:.1f} KB)', size=size)
+        elif tag.name == 'link':
+            rel = [r.lower() for r in (tag.get('rel') or [])]
+            if 'stylesheet' in rel and tag.get('href') and 'alternate' not in rel:
+                blocking = _stylesheet_blocks(tag)
+                add('stylesheet', _absolute(page_url, tag['href']), blocking,
+                    'stylesheet' if blocking else f"media=\"{tag.get('media')}\" (non-blocking)")
+        else:
+            css = tag.string or ''
+            for match in _IMPORT_RE.finditer(css):
+                add('import', _absolute(page_url, match.group(1)), True, '@import in inline <style>', chained=True)
+            if css.strip():
+                add('inline-style', '', False, f'inline style ({len(css) / 1024:.1f} KB)', size=len(css.encode('utf-8')))
+
+    # Sizes are only looked up for blocking resources, the only ones the estimate uses
+    if sizes:
+        blocking_urls = [r['url'] for r in resources if r['blocking'] and r['url']]
+        known = sizes(blocking_urls) if callable(sizes) else sizes
+        for r in resources:
+            if r['url'] and r['bytes'] is None:
+                r['bytes'] = known.get(r['url'])
+
+    # Resource hints actually present
+    hints = {}
+    for link in soup.find_all('link', rel=True):
+        rel = [r.lower() for r in link.get('rel') or []]
+        for hint in ('preconnect', 'dns-prefetch', 'preload', 'modulepreload', 'prefetch', 'prerender'):
+            if hint in rel and link.get('href'):
+                hints.setdefault(hint, []).append({'url': _absolute(page_url, link['href']), 'as': link.get('as', '')})
+    preconnected = {origin_of(h['url']) for h in hints.get('preconnect', [])}
+    dns_prefetched = {origin_of(h['url']) for h in hints.get('dns-prefetch', [])}
+    preloaded = {h['url'] for h in hints.get('preload', []) + hints.get('modulepreload', [])}
+
+    blocking = [r for r in resources if r['blocking']]
+    used_origins = {r['origin'] for r in resources if r['origin']}
+    third_party = sorted(o for o in used_origins if o and o != page_origin)
+    blocking_third_party = sorted({r['origin'] for r in blocking if r['origin'] and r['origin'] != page_origin})
+    missing_preconnect = [o for o in blocking_third_party if o not in preconnected]
+    unused_preconnects = sorted(o for o in preconnected if o and o not in used_origins)
+    preload_without_as = [h['url'] for h in hints.get('preload', []) if not h['as']]
+    late_discovered = [r['url'] for r in blocking if r['chained'] and r['url'] not in preloaded]
+
+    # Images: missing dimensions (layout shift) and a lazy-loaded first image (likely LCP)
+    images = soup.find_all('img')
+    missing_dimensions = [img.get('src', '') for img in images if not (img.get('width') and img.get('height'))]
+    first_image_lazy = bool(images) and (images[0].get('loading') or '').lower() == 'lazy'
+
+    # Estimated cost: blocking fetches run in parallel (the slowest one counts), share the
+    # bandwidth, @import adds a serial round trip after its parent, inline scripts add parse time
+    fetched = [r for r in blocking if r['url']]
+    blocking_bytes = sum(r['bytes'] if r['bytes'] is not None else DEFAULT_RESOURCE_BYTES for r in fetched)
+    latency = 0.0
+    for r in fetched:
+        setup = 0 if (not r['origin'] or r['origin'] == page_origin or r['origin'] in preconnected) else CONNECTION_SETUP_RTTS
+        if r['origin'] in dns_prefetched and setup:
+            setup -= 1
+        latency = max(latency, (setup + 1 + (1 if r['chained'] else 0)) * ASSUMED_RTT_MS)
+    inline_bytes = sum(r['bytes'] or 0 for r in blocking if not r['url'])
+    estimated_ms = round(latency + blocking_bytes / ASSUMED_THROUGHPUT_BYTES_PER_MS + inline_bytes / INLINE_PARSE_BYTES_PER_MS) if blocking else 0
+
+    # Parser-blocking scripts outside the head still delay everything after them
+    body_blocking = [s.get('src') for s in soup.find_all('script', src=True)
+                     if s.find_parent('head') is None and soup.head is not None and _is_executable_script(s)
+                     and not (s.has_attr('async') or s.has_attr('defer') or (s.get('type') or '').lower() == 'module')]
+
+    return {
+        'page_origin': page_origin,
+        'resources': resources,
+        'blocking_scripts': [r['url'] for r in blocking if r['kind'] == 'script'],
+        'blocking_stylesheets': [r['url'] for r in blocking if r['kind'] == 'stylesheet'],
+        'imports': [r['url'] for r in resources if r['kind'] == 'import'],
+        'large_inline_scripts': [r['bytes'] for r in blocking if r['kind'] == 'inline-script'],
+        'body_blocking_scripts': body_blocking,
+        'blocking_bytes': blocking_bytes + inline_bytes,
+        'unknown_sizes': sum(1 for r in fetched if r['bytes'] is None),
+        'third_party_origins': third_party,
+        'missing_preconnect': missing_preconnect,
+        'unused_preconnects': unused_preconnects,
+        'too_many_preconnects': len(preconnected) > MAX_USEFUL_PRECONNECTS,
+        'preload_without_as': preload_without_as,
+        'late_discovered': late_discovered,
+        'hints': {name: len(items) for name, items in hints.items()},
+        'images_total': len(images),
+        'images_missing_dimensions': missing_dimensions,
+        'first_image_lazy': first_image_lazy,
+        'estimated_blocking_ms': estimated_ms,
+    }
+
+
+def critical_path_findings(analysis, max_examples=5):
+    """Turns analyze_critical_path() output into the report lines used by seo-checker.py."""
+    lines = []
+    for url in analysis['blocking_scripts'][:max_examples]:
+        lines.append(f'⚠️ Render-blocking script: {url[:80]} (add `defer` or `async`).')
+    for url in analysis['blocking_stylesheets'][:max_examples]:
+        lines.append(f'⚠️ Render-blocking stylesheet: {url[:80]} (inline critical CSS, load the rest with media/preload).')
+    for url in analysis['imports'][:max_examples]:
+        lines.append(f'❌ CSS @import of {url[:80]}: fetched only after the parent CSS is parsed. Use <link rel="stylesheet"> instead.')
+    for size in analysis['large_inline_scripts']:
+        lines.append(f'⚠️ Large inline script in <head> ({size / 1024:.1f} KB) blocks parsing. Move it to an external deferred file.')
+    if analysis['body_blocking_scripts']:
+        lines.append(f'ℹ️ {len(analysis["body_blocking_scripts"])} synchronous script(s) in <body> block parsing of the content after them.')
+    for origin in analysis['missing_preconnect']:
+        lines.append(f'⚠️ Blocking resources from {origin} without <link rel="preconnect" href="{origin}">.')
+    for origin in analysis['unused_preconnects']:
+        lines.append(f'ℹ️ preconnect to {origin} is not used by any resource in <head>.')
+    if analysis['too_many_preconnects']:
+        lines.append(f'⚠️ More than {MAX_USEFUL_PRECONNECTS} preconnect hints; extra connections compete for bandwidth.')
+    for url in analysis['preload_without_as'][:max_examples]:
+        lines.append(f'⚠️ <link rel="preload" href="{url[:80]}"> has no `as` attribute and will be fetched twice.')
+    for url in analysis['late_discovered'][:max_examples]:
+        lines.append(f'ℹ️ {url[:80]} is discovered late (@import); consider <link rel="preload" as="style">.')
+    missing = analysis['images_missing_dimensions']
+    if missing:
+        lines.append(f'⚠️ {len(missing)} of {analysis["images_total"]} image(s) lack width/height attributes (layout shift).')
+    if analysis['first_image_lazy']:
+        lines.append('⚠️ The first <img> is loading="lazy"; if it is the main (LCP) image, load it eagerly.')
+
+    estimate = analysis['estimated_blocking_ms']
+    unknown = f", {analysis['unknown_sizes']} size(s) assumed" if analysis['unknown_sizes'] else ''
+    if estimate:
+        flag = '❌' if estimate > 2000 else '⚠️' if estimate > 800 else 'ℹ️'
+        lines.append(f'{flag} Estimated render-blocking cost: ~{estimate} ms on slow 4G '
+                     f'({analysis["blocking_bytes"] / 1024:.0f} KB blocking{unknown}).')
+    if not lines:
+        lines.append('✅ No render-blocking resources detected in <head>.')
+    return lines
@@ -0,0 +1,333 @@
+"""
+Field-level comparison of two audit result sets (two nightly runs, or a
+staging build against production).
+
+Pages are aligned on their normalized path (host, query and index file
+ignored, see traffic.normalize_path; local files by the site path stored
+with their record) with a sort-merge join, so neither side is ever held in
+memory: each side's records are reduced to the compared fields, sorted in
+runs of RUN_RECORDS and spilled to temporary files, and the sorted runs are
+streamed back through a k-way merge. Memory stays at one run per side while
+sorting and one record per run while joining.
+
+URLs inside the compared fields (canonical, hreflang, og:url) are made
+relative when they point to a host audited on either side or to one of the
+`aliases` (e.g. the production host named in a staging page's canonical),
+so staging, production and a local build compare equal. The hosts are
+collected while sorting, so URLs are made relative as pages are joined.
+"""
+
+import heapq
+import json
+import os
+import tempfile
+from collections import Counter
+from urllib.parse import urlsplit
+
+from seokit.jsonld import loads as loads_json
+from seokit.traffic import normalize_path
+
+RUN_RECORDS = 20000             # Records sorted in memory before a run is spilled to disk
+MAX_EXAMPLES = 10               # Changed pages kept per field for the report
+LIST_FIELDS = ('hreflang', 'json_ld_types')
+FIELDS = ('status', 'title', 'description', 'canonical', 'robots', 'hreflang', 'open_graph', 'twitter_card', 'json_ld_types')
+
+
+def page_key(record, root=None):
+    """
+    Join key of a page record: its normalized path. Local files use the
+    site path stored by the audit; older records without one are taken
+    relative to `root` (default: working directory).
+    """
+    url = record['url']
+    if not url.startswith(('http://', 'https://')):
+        url = record.get('site_path') or os.path.relpath(url, root or '.').replace(os.path.sep, '/')
+    return normalize_path(url)
+
+
+def _relative(url, hosts):
+    """`url` without scheme and host when it points to one of `hosts` (the page's own host and its aliases)."""
+    if not url:
+        return url
+    parts = urlsplit(url)
+    if parts.netloc.lower() not in hosts:
+        return url
+    return (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+
+def comparable(record):
+    """The compared fields of a bulk-audit page record (as written by `audit --jsonl`), URLs as audited."""
+    facts = record['facts']
+    return {
+        'url': record['url'],
+        'score': record['score'],
+        'grade': record['grade'],
+        'status': facts.get('http_status', 0),
+        'title': facts['title'],
+        'description': facts['description'],
+        'canonical': facts['canonical'],
+        'robots': facts['robots'],
+        'hreflang': [[item.get('hreflang', ''), item.get('href', '')] for item in record.get('hreflang') or ()],
+        'open_graph': dict(record.get('open_graph') or {}),
+        'twitter_card': dict(record.get('twitter_card') or {}),
+        'json_ld_types': sorted(record.get('json_ld_types') or ()),
+    }
+
+
+def relative_fields(fields, hosts):
+    """Comparable fields with the URLs pointing to one of `hosts` made relative (hreflang as sorted 'code href' entries)."""
+    fields = dict(fields)
+    fields['canonical'] = _relative(fields['canonical'], hosts)
+    fields['hreflang'] = sorted(f"{code} {_relative(href, hosts)}" for code, href in fields['hreflang'])
+    if 'og:url' in fields['open_graph']:
+        fields['open_graph'] = dict(fields['open_graph'], **{'og:url': _relative(fields['open_graph']['og:url'], hosts)})
+    return fields
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield tuple(loads_json(line))
+
+
+class SortedPages:
+    """
+    External sort of page records: iterating yields (key, comparable fields)
+    in key order. Records are sorted in runs of `run_records` spilled to
+    `tmp_dir` and merged back; when a path appears more than once, its
+    first record is kept and the others are counted in `duplicates`. The
+    hosts of the audited URLs are collected in `hosts` (complete once the
+    first item is out). Iterate once.
+    """
+
+    def __init__(self, records, tmp_dir, root=None, run_records=RUN_RECORDS):
+        self.records = records
+        self.tmp_dir = tmp_dir
+        self.root = root
+        self.run_records = run_records
+        self.runs = 0
+        self.duplicates = 0
+        self.hosts = set()
+
+    def _spill(self, batch, paths):
+        batch.sort(key=lambda item: item[0])        # Stable: the first record of a key stays first
+        fd, path = tempfile.mkstemp(suffix='.jsonl', dir=self.tmp_dir)
+        paths.append(path)
+        with open(fd, 'w', encoding='utf-8') as f:
+            for item in batch:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        batch.clear()
+
+    def __iter__(self):
+        paths = []
+        batch = []
+        try:
+            for record in self.records:
+                if record['url'].startswith(('http://', 'https://')):
+                    self.hosts.add(urlsplit(record['url']).netloc.lower())
+                batch.append((page_key(record, self.root), comparable(record)))
+                if len(batch) >= self.run_records:
+                    self._spill(batch, paths)
+            if paths and batch:
+                self._spill(batch, paths)
+            self.runs = len(paths) or 1
+            if paths:
+                merged = heapq.merge(*(_read_run(path) for path in paths), key=lambda item: item[0])
+            else:
+                batch.sort(key=lambda item: item[0])
+                merged = batch
+            previous = None
+            for key, fields in merged:
+                if key == previous:
+                    self.duplicates += 1
+                    continue
+                previous = key
+                yield key, fields
+        finally:
+            for path in paths:
+                os.unlink(path)
+
+
+def merge_join(left, right):
+    """Full outer join of two key-sorted streams of (key, value): yields (key, left value or None, right value or None)."""
+    missing = object()
+    left, right = iter(left), iter(right)
+    a = next(left, missing)
+    b = next(right, missing)
+    while a is not missing or b is not missing:
+        if b is missing or (a is not missing and a[0] < b[0]):
+            yield a[0], a[1], None
+            a = next(left, missing)
+        elif a is missing or b[0] < a[0]:
+            yield b[0], None, b[1]
+            b = next(right, missing)
+        else:
+            yield a[0], a[1], b[1]
+            a = next(left, missing)
+            b = next(right, missing)
+
+
+def join_pages(left, right, aliases=()):
+    """
+    merge_join() of two SortedPages with the URLs of both sides made relative
+    to the same hosts: those audited on either side plus `aliases`.
+    """
+    hosts = None
+    for key, old, new in merge_join(left, right):
+        if hosts is None:           # Both sides are sorted by now, so their hosts are known
+            hosts = frozenset(host.lower() for host in aliases) | left.hosts | right.hosts
+        yield key, old and relative_fields(old, hosts), new and relative_fields(new, hosts)
+
+
+def field_changes(old, new):
+    """
+    [(field, old value, new value)] between the comparable fields of one
+    page. Mappings are compared per property; for lists, the values are the
+    removed and the added entries.
+    """
+    changes = []
+    for field in FIELDS:
+        before, after = old[field], new[field]
+        if before == after:
+            continue
+        if isinstance(before, dict):
+            for name in sorted(set(before) | set(after)):
+                if before.get(name) != after.get(name):
+                    changes.append((f"{field}.{name}", before.get(name), after.get(name)))
+        elif isinstance(before, list):         # Multisets: duplicated entries count
+            removed = sorted((Counter(before) - Counter(after)).elements())
+            added = sorted((Counter(after) - Counter(before)).elements())
+            changes.append((field, removed, added))
+        else:
+            changes.append((field, before, after))
+    return changes
+
+
+class RunDiff:
+    """
+    Accumulates the joined pages of two result sets: changed fields (with a
+    few examples each), pages only on one side, score deltas and grade
+    moves. Every change can also be streamed to a JSONL file (`out_file`).
+    """
+
+    def __init__(self, max_examples=MAX_EXAMPLES, out_file=None):
+        self.max_examples = max_examples
+        self.out_file = out_file
+        self.matched = 0
+        self.changed_pages = 0
+        self.only_left = 0
+        self.only_right = 0
+        self.only_examples = {'left': [], 'right': []}
+        self.field_counts = {}
+        self.field_examples = {}    # field -> [(key, old, new)]
+        self.score_delta = 0
+        self.improved = 0
+        self.worsened = 0
+        self.grade_moves = {}       # (old grade, new grade) -> pages
+        self._drops = []            # Bounded heaps of (delta, key, ...) for the largest moves
+        self._gains = []
+        self.duplicates = (0, 0)    # Paths skipped on the left / right side (set by the caller)
+
+    def _keep(self, heap, item):
+        if len(heap) < self.max_examples:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, key, old, new):
+        if new is None or old is None:
+            side = 'left' if new is None else 'right'
+            page = old or new
+            if side == 'left':
+                self.only_left += 1
+            else:
+                self.only_right += 1
+            if len(self.only_examples[side]) < self.max_examples:
+                self.only_examples[side].append(page['url'])
+            if self.out_file:
+                self.out_file.write(json.dumps({'path': key, 'only_in': side, 'url': page['url'], 'score': page['score']},
+                                               ensure_ascii=False) + "\n")
+            return
+        self.matched += 1
+        changes = field_changes(old, new)
+        delta = new['score'] - old['score']
+        self.score_delta += delta
+        if delta:
+            if delta > 0:
+                self.improved += 1
+                self._keep(self._gains, (delta, key, old['score'], new['score']))
+            else:
+                self.worsened += 1
+                self._keep(self._drops, (-delta, key, old['score'], new['score']))
+        if old['grade'] != new['grade']:
+            move = (old['grade'], new['grade'])
+            self.grade_moves[move] = self.grade_moves.get(move, 0) + 1
+        if changes:
+            self.changed_pages += 1
+            for field, before, after in changes:
+                self.field_counts[field] = self.field_counts.get(field, 0) + 1
+                examples = self.field_examples.setdefault(field, [])
+                if len(examples) < self.max_examples:
+                    examples.append((key, before, after))
+        if self.out_file and (changes or delta):
+            self.out_file.write(json.dumps({'path': key, 'left_url': old['url'], 'right_url': new['url'],
+                                            'score': [old['score'], new['score']], 'grade': [old['grade'], new['grade']],
+                                            'changes': [{'field': field, 'left': before, 'right': after} for field, before, after in changes]},
+                                           ensure_ascii=False) + "\n")
+
+    def largest_moves(self):
+        """([(path, old score, new score)] of the largest drops, same for the largest gains), largest first."""
+        return ([(key, old, new) for _, key, old, new in sorted(self._drops, reverse=True)],
+                [(key, old, new) for _, key, old, new in sorted(self._gains, reverse=True)])
+
+
+def _short(value, limit=80):
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return repr(text[:limit] + '…' if len(text) > limit else text)
+
+
+def format_diff_report(diff, left_label, right_label):
+    """Formats a RunDiff."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           A U D I T   D I F F")
+    lines.append("="*70)
+    lines.append(f"  Left:  {left_label}")
+    lines.append(f"  Right: {right_label}")
+    lines.append(f"  Pages matched by path: {diff.matched} (only left: {diff.only_left}, only right: {diff.only_right})")
+    for side, count in zip(('left', 'right'), diff.duplicates):
+        if count:
+            lines.append(f"  ⚠️ {count} duplicate path(s) on the {side} side (first record kept).")
+    if diff.matched:
+        lines.append(f"  Pages with changed metadata: {diff.changed_pages}")
+        lines.append(f"  Score: {diff.improved} page(s) up, {diff.worsened} down, average change {diff.score_delta / diff.matched:+.2f} points")
+
+    lines.append(f"\n--- Changed Fields ({len(diff.field_counts)}) ---")
+    if not diff.field_counts:
+        lines.append("  ✅ No metadata changed on the matched pages.")
+    for field, count in sorted(diff.field_counts.items(), key=lambda item: (-item[1], item[0])):
+        lines.append(f"  ⚠️ {field}: {count} page(s)")
+        for key, before, after in diff.field_examples[field]:
+            if field in LIST_FIELDS:
+                lines.append(f"     {key}: removed {_short(before)}, added {_short(after)}")
+            else:
+                lines.append(f"     {key}: {_short(before)} -> {_short(after)}")
+
+    if diff.grade_moves:
+        lines.append(f"\n--- Grade Changes ({sum(diff.grade_moves.values())}) ---")
+        for (before, after), count in sorted(diff.grade_moves.items(), key=lambda item: -item[1]):
+            lines.append(f"  {before:<3} -> {after:<3} {count:>9}")
+    drops, gains = diff.largest_moves()
+    for label, moves in (("Largest Score Drops", drops), ("Largest Score Gains", gains)):
+        if moves:
+            lines.append(f"\n--- {label} ({len(moves)}) ---")
+            for key, before, after in moves:
+                lines.append(f"  > {key}: {before}% -> {after}%")
+
+    for side, count in (('left', diff.only_left), ('right', diff.only_right)):
+        if count:
+            lines.append(f"\n--- Only on the {side.title()} Side ({count}) ---")
+            for url in diff.only_examples[side]:
+                lines.append(f"  ❌ {url}")
+    lines.append("="*70)
+    return lines
@@ -0,0 +1,351 @@
+"""
+Streaming HTML download with early termination.
+
+The response body is read in chunks, decoded incrementally and fed to a
+small HTMLParser that only watches for the end of <head>. In head-only mode
+the connection is closed as soon as the head is complete, so a 2 MB page
+with a 20 KB head costs 20 KB. Every download is capped at `max_bytes`.
+
+Works on any response object with iter_content() and close() (requests
+with stream=True). The second half of the module holds the HTTP helpers:
+a pooled session, redirects followed by hand so every hop is recorded, the
+SEO-relevant response headers, and HEAD-first status probes.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+from seokit.metrics import CACHE_REQUESTS
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+SNIFF_BYTES = 2048          # <meta charset> must appear this early (HTML spec: 1024, with some slack)
+
+# Elements allowed inside <head>; any other start tag means the body has begun
+HEAD_ELEMENTS = frozenset(('html', 'head', 'title', 'meta', 'link', 'script', 'style', 'base', 'noscript', 'template'))
+# Head elements whose content is not head content (e.g. a tracking pixel <img> in <noscript>)
+HEAD_CONTAINERS = frozenset(('noscript', 'template'))
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+def _valid_encoding(name):
+    try:
+        return codecs.lookup(name).name
+    except (LookupError, TypeError):
+        return None
+
+
+def detect_charset(content_type, first_bytes, default='utf-8'):
+    """
+    Picks the encoding the way browsers do: byte order mark, then the
+    Content-Type charset, then <meta charset> / http-equiv in the first bytes.
+    """
+    for bom, encoding in _BOMS:
+        if first_bytes.startswith(bom):
+            return encoding
+    match = _HEADER_CHARSET_RE.search(content_type or '')
+    if match and _valid_encoding(match.group(1)):
+        return _valid_encoding(match.group(1))
+    match = _META_CHARSET_RE.search(first_bytes[:SNIFF_BYTES])
+    if match and _valid_encoding(match.group(1).decode('ascii', 'ignore')):
+        return _valid_encoding(match.group(1).decode('ascii'))
+    return default
+
+
+class HeadEndDetector(HTMLParser):
+    """Incremental parser that flags the end of the document head (and where it is)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.head_complete = False
+        self.head_end = None        # (line, column) of the tag that ended the head
+        self._contained = 0         # Open <noscript>/<template> elements: their children do not end the head
+
+    def _complete(self):
+        if not self.head_complete:
+            self.head_complete = True
+            self.head_end = self.getpos()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self._complete()
+        elif tag in HEAD_CONTAINERS:
+            self._contained += 1
+        elif tag not in HEAD_ELEMENTS and not self._contained:
+            self._complete()
+
+    def handle_endtag(self, tag):
+        if tag in HEAD_CONTAINERS:
+            self._contained = max(self._contained - 1, 0)
+        elif tag in ('head', 'html'):
+            self._complete()
+
+
+def _offset_of(text, position):
+    """Converts an HTMLParser (line, column) position into a string offset."""
+    line, column = position
+    offset = 0
+    for _ in range(line - 1):
+        offset = text.index('\n', offset) + 1
+    return offset + column
+
+
+def read_html_stream(response, head_only=False, max_bytes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reads and decodes a streamed response. Returns (text, info) where info is
+    {'encoding', 'bytes', 'stopped_after_head', 'truncated'}. With head_only,
+    the text ends where the head ends. The response is always closed.
+    """
+    info = {'encoding': None, 'bytes': 0, 'stopped_after_head': False, 'truncated': False}
+    content_type = getattr(response, 'headers', {}).get('Content-Type', '')
+    decoder = None
+    pending = b''               # Bytes held back until the charset is known
+    parts = []
+    detector = HeadEndDetector() if head_only else None
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            if max_bytes is not None and info['bytes'] + len(chunk) > max_bytes:
+                chunk = chunk[:max(max_bytes - info['bytes'], 0)]
+                info['truncated'] = True
+            info['bytes'] += len(chunk)
+
+            if decoder is None:
+                pending += chunk
+                if len(pending) < SNIFF_BYTES and not info['truncated']:
+                    continue
+                info['encoding'] = detect_charset(content_type, pending)
+                decoder = codecs.getincrementaldecoder(info['encoding'])(errors='replace')
+                chunk, pending = pending, b''
+
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if detector is not None:
+                detector.feed(text)
+                if detector.head_complete:
+                    info['stopped_after_head'] = True
+                    break
+            if info['truncated']:
+                break
+
+        if decoder is None:         # Short body: everything is still pending
+            info['encoding'] = detect_charset(content_type, pending)
+            decoder = codecs.getincrementaldecoder(info['encoding'])(errors='replace')
+            parts.append(decoder.decode(pending))
+            if detector is not None:
+                detector.feed(parts[-1])
+        parts.append(decoder.decode(b'', final=True))
+    finally:
+        response.close()
+    text = ''.join(parts)
+    if detector is not None and detector.head_end is not None:
+        info['stopped_after_head'] = True
+        text = text[:_offset_of(text, detector.head_end)]
+    return text, info
+
+
+def decode_head(buffer, encoding, errors='strict', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Decodes `buffer` (bytes or mmap) chunk by chunk until the document head
+    ends; the rest is never decoded. Returns (text up to the end of the
+    head, whether the head ended).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    detector = HeadEndDetector()
+    parts = []
+    for start in range(0, len(buffer), chunk_size):
+        parts.append(decoder.decode(buffer[start:start + chunk_size]))
+        detector.feed(parts[-1])
+        if detector.head_complete:
+            break
+    else:
+        parts.append(decoder.decode(b'', final=True))
+    text = ''.join(parts)
+    if detector.head_end is None:
+        return text, False
+    return text[:_offset_of(text, detector.head_end)], True
+
+
+def head_section(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """The document up to the end of its head (all of it if the head never ends), scanned chunk by chunk."""
+    detector = HeadEndDetector()
+    for start in range(0, len(text), chunk_size):
+        detector.feed(text[start:start + chunk_size])
+        if detector.head_complete:
+            return text[:_offset_of(text, detector.head_end)]
+    return text
+
+
+# ----------------------------------------------------------------------
+# HTTP: pooled session, manual redirects and response-header facts
+# ----------------------------------------------------------------------
+
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+COMPRESSED_ENCODINGS = ('gzip', 'br', 'deflate', 'zstd')
+
+
+def new_session(headers=None, pool_size=10):
+    """A requests.Session whose connection pool fits `pool_size` concurrent requests (no automatic retries)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _release(response):
+    """Drains a small response body so its connection goes back to the pool."""
+    try:
+        for _ in response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+            pass
+    finally:
+        response.close()
+
+
+def request_with_redirects(session, url, method='GET', timeout=15, max_redirects=MAX_REDIRECTS):
+    """
+    Sends the request and follows redirects by hand on the same pooled
+    session, recording every hop. Returns (final response, chain) where chain
+    is [(url, status)] for each redirect response. The final response is
+    streamed (not yet read). Redirect loops and overly long chains raise
+    requests.TooManyRedirects.
+    """
+    import requests
+    from urllib.parse import urljoin
+    chain = []
+    seen = {url}
+    while True:
+        response = session.request(method, url, timeout=timeout, stream=True, allow_redirects=False)
+        if response.status_code not in REDIRECT_STATUSES or 'Location' not in response.headers:
+            return response, chain
+        chain.append((url, response.status_code))
+        _release(response)
+        url = urljoin(url, response.headers['Location'])
+        if url in seen or len(chain) >= max_redirects:
+            raise requests.TooManyRedirects(f"Redirect {'loop' if url in seen else 'chain too long'}: "
+                                            + ' -> '.join(u for u, _ in chain) + f" -> {url}")
+        seen.add(url)
+        if response.status_code == 303:
+            method = 'GET'
+
+
+def _x_robots_values(response):
+    """X-Robots-Tag values of a response, one per header line (requests folds repeated headers into one)."""
+    raw_headers = getattr(response.raw, 'headers', None)
+    if hasattr(raw_headers, 'getlist'):
+        return raw_headers.getlist('X-Robots-Tag')
+    value = response.headers.get('X-Robots-Tag')
+    return [value] if value else []
+
+
+def response_facts(response, chain):
+    """Status, redirect chain and SEO-relevant response headers of a final response."""
+    headers = response.headers
+    x_robots = _x_robots_values(response)
+    link_canonical = (response.links.get('canonical') or {}).get('url', '')
+    encoding = headers.get('Content-Encoding', '').lower()
+    return {
+        'Status': response.status_code,
+        'Final_URL': response.url,
+        'Redirect_Chain': [{'url': url, 'status': status} for url, status in chain],
+        'X_Robots_Tag': ' | '.join(x_robots),       # For display; header lines are kept apart in X_Robots_Tags
+        'X_Robots_Tags': x_robots,
+        'Link_Canonical': link_canonical,
+        'Content_Type': headers.get('Content-Type', ''),
+        'Content_Encoding': encoding,
+        'Compressed': any(name in encoding for name in COMPRESSED_ENCODINGS),
+        'Cache_Control': headers.get('Cache-Control', ''),
+        'Expires': headers.get('Expires', ''),
+        'ETag': headers.get('ETag', ''),
+        'Last_Modified': headers.get('Last-Modified', ''),
+        'Vary': headers.get('Vary', ''),
+        'Elapsed_Ms': round(response.elapsed.total_seconds() * 1000),
+    }
+
+
+def x_robots_noindex(x_robots_tags):
+    """
+    True when an X-Robots-Tag value sets noindex/none for all crawlers or for
+    Googlebot. Takes one header value or a list of them (one per header
+    line); a user-agent prefix only scopes the rest of its own header.
+    """
+    if isinstance(x_robots_tags, str):
+        x_robots_tags = [x_robots_tags]
+    for value in x_robots_tags:
+        agent = None
+        for part in value.lower().split(','):
+            part = part.strip()
+            if ':' in part:
+                name, rest = (piece.strip() for piece in part.split(':', 1))
+                if name not in ('unavailable_after', 'max-snippet', 'max-image-preview', 'max-video-preview'):
+                    agent, part = name, rest    # "googlebot: noindex" applies to the following directives too
+            if part in ('noindex', 'none') and agent in (None, 'googlebot'):
+                return True
+    return False
+
+
+def probe_status(session, url, timeout=10):
+    """
+    Status-only check: HEAD first (GET when HEAD is not allowed), following
+    redirects on the pooled session. Returns response_facts() plus 'Method',
+    or {'Error': message} on network failure.
+    """
+    import requests
+    try:
+        response, chain = request_with_redirects(session, url, method='HEAD', timeout=timeout)
+        method = 'HEAD'
+        if response.status_code in (405, 501):
+            _release(response)
+            response, chain = request_with_redirects(session, url, method='GET', timeout=timeout)
+            method = 'GET'
+        facts = response_facts(response, chain)
+        _release(response)          # Back to the pool: a bare close() drops the keep-alive connection
+        facts['Method'] = method
+        return facts
+    except requests.RequestException as e:
+        return {'Error': str(e)}
+
+
+class ResourceSizeCache:
+    """
+    Sizes of page resources (CSS, JS) from concurrent HEAD requests, cached
+    per URL for the lifetime of the object so shared assets are only asked
+    for once per audit. Unknown sizes (no Content-Length, errors) are None.
+    """
+
+    def __init__(self, session, workers=8, timeout=10):
+        self.session = session
+        self.workers = workers
+        self.timeout = timeout
+        self.cache = {}
+
+    def _head(self, url):
+        try:
+            response, _ = request_with_redirects(self.session, url, method='HEAD', timeout=self.timeout)
+            _release(response)
+            length = response.headers.get('Content-Length')
+            return int(length) if length and length.isdigit() and response.status_code < 400 else None
+        except Exception:
+            return None
+
+    def sizes(self, urls):
+        """Returns {url: bytes or None} for the http(s) URLs given, fetching the ones not cached yet."""
+        from concurrent.futures import ThreadPoolExecutor
+        wanted = {url for url in urls if url.startswith(('http://', 'https://'))}
+        missing = [url for url in wanted if url not in self.cache]
+        CACHE_REQUESTS.inc('resource_sizes', 'hit', amount=len(wanted) - len(missing))
+        CACHE_REQUESTS.inc('resource_sizes', 'miss', amount=len(missing))
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                for url, size in zip(missing, executor.map(self._head, missing)):
+                    self.cache[url] = size
+        return {url: self.cache[url] for url in wanted}
@@ -0,0 +1,264 @@
+"""
+Cross-page hreflang validation for bulk audits.
+
+Pages are added as they stream in. Every hreflang annotation is stored as an
+integer edge (page -> alternate, language) and both ends are merged into one
+cluster with union-find. Only pages that carry hreflang tags or are the
+target of one get a node; any other page costs a 9-byte entry (URL hash and
+flags) that is looked up once at the end, in case a later page points at it.
+Once the audit ends, each cluster is checked for return links, self
+references, x-default consistency, conflicting alternates, relative hrefs
+and targets that are non-canonical, noindex or broken.
+"""
+
+import hashlib
+import re
+from array import array
+from urllib.parse import urljoin, urlsplit
+
+from seokit.site_index import normalize_url
+
+# ISO 639-1/2 language, optional ISO 15924 script, optional ISO 3166-1 region or UN M.49 area
+HREFLANG_CODE_RE = re.compile(r"^[a-z]{2,3}(-[a-z]{4})?(-([a-z]{2}|\d{3}))?$", re.IGNORECASE)
+# Frequent mistakes that match the pattern but are not valid codes
+COMMON_HREFLANG_MISTAKES = {'en-uk': 'en-gb', 'jp': 'ja', 'cn': 'zh', 'gr': 'el', 'dk': 'da', 'se': 'sv'}
+
+X_DEFAULT = 'x-default'
+
+CANONICAL_OK = 1                # Flags of pages recorded without a node
+NOINDEX = 2
+
+
+def _url_hash(key):
+    """64-bit hash of a normalized URL, identical in every process (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def check_hreflang_code(code):
+    """Returns None for a valid hreflang value, otherwise a short explanation."""
+    lowered = code.strip().lower()
+    if lowered == X_DEFAULT:
+        return None
+    if lowered in COMMON_HREFLANG_MISTAKES:
+        return f"'{code}' is not a valid code (did you mean '{COMMON_HREFLANG_MISTAKES[lowered]}'?)"
+    if not HREFLANG_CODE_RE.match(lowered):
+        return f"'{code}' is not a valid language[-script][-region] code"
+    return None
+
+
+class HreflangValidator:
+    """Incremental hreflang cluster builder (union-find over integer URL ids)."""
+
+    def __init__(self):
+        self._ids = {}              # normalized URL -> id
+        self.urls = []              # id -> URL as first seen
+        self._parent = array('l')   # union-find forest
+        self._size = array('l')
+        self.audited = {}           # id -> {'canonical_ok': bool, 'noindex': bool} for audited pages
+        self.broken = set()         # ids of pages that failed to load
+        self._langs = {}            # hreflang value -> small int
+        self.lang_names = []
+        self.edge_src = array('l')  # hreflang edges: page -> alternate, language id
+        self.edge_dst = array('l')
+        self.edge_lang = array('l')
+        self._edge_keys = set()     # (src << 32) | dst, for return-link lookups
+        self.invalid_codes = []     # (page id, message)
+        self.relative_hrefs = []    # (page id, message)
+        self._other_hashes = array('Q')     # Audited pages without a node: URL hash
+        self._other_flags = array('B')      # ... and CANONICAL_OK | NOINDEX
+        self._broken_hashes = array('Q')    # Broken pages without a node
+
+    def _node(self, url):
+        key = normalize_url(url)
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = self._ids[key] = len(self.urls)
+            self.urls.append(url)
+            self._parent.append(node_id)
+            self._size.append(1)
+        return node_id
+
+    def _find(self, node_id):
+        parent = self._parent
+        root = node_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node_id] != root:      # Path compression
+            parent[node_id], node_id = root, parent[node_id]
+        return root
+
+    def _union(self, a, b):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+    def _lang(self, code):
+        code = code.strip().lower()
+        lang_id = self._langs.get(code)
+        if lang_id is None:
+            lang_id = self._langs[code] = len(self.lang_names)
+            self.lang_names.append(code)
+        return lang_id
+
+    def add_page(self, url, canonical, noindex, hreflang_tags):
+        """
+        Adds one audited page with its canonical, robots noindex flag and
+        hreflang tags. Returns the page's node id, or None when the page has
+        no tags and no page has pointed at it yet.
+        """
+        key = normalize_url(url)
+        canonical_key = normalize_url(canonical)
+        canonical_ok = not canonical_key or canonical_key == key
+        if not hreflang_tags and key not in self._ids:
+            self._other_hashes.append(_url_hash(key))
+            self._other_flags.append((CANONICAL_OK if canonical_ok else 0) | (NOINDEX if noindex else 0))
+            return None
+        src = self._node(url)
+        self.audited[src] = {'canonical_ok': canonical_ok, 'noindex': bool(noindex)}
+        for tag in hreflang_tags:
+            code, href = tag.get('hreflang', ''), tag.get('href', '')
+            problem = check_hreflang_code(code)
+            if problem:
+                self.invalid_codes.append((src, problem))
+            if not href or href == 'N/A':
+                continue
+            parts = urlsplit(href)
+            if not (parts.scheme and parts.netloc):
+                absolute = urljoin(url, href)
+                self.relative_hrefs.append((src, f"href '{href}' ({code}) is not fully qualified (resolved to {absolute})"))
+                href = absolute
+            dst = self._node(href)
+            self.edge_src.append(src)
+            self.edge_dst.append(dst)
+            self.edge_lang.append(self._lang(code))
+            self._edge_keys.add((src << 32) | dst)
+            self._union(src, dst)
+        return src
+
+    def mark_broken(self, url):
+        """Records a page that failed to load (a broken hreflang target if referenced)."""
+        node_id = self._ids.get(normalize_url(url))
+        if node_id is None:
+            self._broken_hashes.append(_url_hash(normalize_url(url)))
+        else:
+            self.broken.add(node_id)
+
+    def _resolve_targets(self):
+        """Moves the pages recorded without a node that turned out to be hreflang targets onto their nodes."""
+        pending = {_url_hash(key): node_id for key, node_id in self._ids.items()
+                   if node_id not in self.audited and node_id not in self.broken}
+        if not pending:
+            return
+        for url_hash, flags in zip(self._other_hashes, self._other_flags):
+            node_id = pending.get(url_hash)
+            if node_id is not None:
+                self.audited[node_id] = {'canonical_ok': bool(flags & CANONICAL_OK), 'noindex': bool(flags & NOINDEX)}
+        for url_hash in self._broken_hashes:
+            node_id = pending.get(url_hash)
+            if node_id is not None:
+                self.broken.add(node_id)
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def validate(self):
+        """
+        Checks every cluster and returns {'clusters': n, 'issues': [...]} where
+        each issue is (page URL, check name, message).
+        """
+        self._resolve_targets()
+        issues = []
+        x_default = self._langs.get(X_DEFAULT)
+        has_self = set()
+        cluster_x_defaults = {}     # cluster root -> set of x-default targets
+        cluster_langs = {}          # (cluster root, language) -> set of targets
+        page_langs = {}             # (page, language) -> target
+
+        for src, dst, lang in zip(self.edge_src, self.edge_dst, self.edge_lang):
+            url = self.urls[src]
+            if src == dst:
+                has_self.add(src)
+            elif dst in self.audited and ((dst << 32) | src) not in self._edge_keys:
+                issues.append((url, 'Missing_Return_Link',
+                               f"{self.urls[dst]} ({self.lang_names[lang]}) does not link back with hreflang"))
+
+            previous = page_langs.setdefault((src, lang), dst)
+            if previous != dst:
+                issues.append((url, 'Conflicting_Alternates',
+                               f"'{self.lang_names[lang]}' points at both {self.urls[previous]} and {self.urls[dst]}"))
+
+            root = self._find(src)
+            if lang == x_default:
+                cluster_x_defaults.setdefault(root, set()).add(dst)
+            else:
+                cluster_langs.setdefault((root, lang), set()).add(dst)
+
+            if dst in self.broken:
+                issues.append((url, 'Broken_Target', f"{self.urls[dst]} ({self.lang_names[lang]}) failed to load"))
+            elif dst in self.audited:
+                target = self.audited[dst]
+                if target['noindex']:
+                    issues.append((url, 'Noindex_Target', f"{self.urls[dst]} ({self.lang_names[lang]}) is noindex"))
+                if not target['canonical_ok']:
+                    issues.append((url, 'Non_Canonical_Target',
+                                   f"{self.urls[dst]} ({self.lang_names[lang]}) canonicalizes to another URL"))
+
+        annotated = set(self.edge_src)
+        for src in sorted(annotated - has_self):
+            issues.append((self.urls[src], 'Missing_Self_Reference', "hreflang set does not include the page itself"))
+
+        for page_id, message in self.invalid_codes:
+            issues.append((self.urls[page_id], 'Invalid_Code', message))
+        for page_id, message in self.relative_hrefs:
+            issues.append((self.urls[page_id], 'Relative_Href', message))
+
+        roots = {self._find(src) for src in annotated}
+        for root in roots:
+            targets = cluster_x_defaults.get(root, set())
+            if len(targets) > 1:
+                example = self.urls[root]
+                issues.append((example, 'Inconsistent_X_Default',
+                               f"cluster declares {len(targets)} different x-default URLs: "
+                               + ', '.join(self.urls[t] for t in sorted(targets)[:3])))
+        for (root, lang), targets in cluster_langs.items():
+            if len(targets) > 1:
+                issues.append((self.urls[root], 'Inconsistent_Cluster',
+                               f"'{self.lang_names[lang]}' maps to {len(targets)} different URLs within one cluster"))
+
+        return {'clusters': len(roots), 'clusters_without_x_default': len(roots - set(cluster_x_defaults)), 'issues': issues}
+
+    def page_findings(self, validation):
+        """Returns {normalized page URL: issue count} for the audited pages with hreflang issues."""
+        findings = {}
+        for url, _, _ in validation['issues']:
+            key = normalize_url(url)
+            findings[key] = findings.get(key, 0) + 1
+        return findings
+
+
+def format_hreflang_report(validation, max_examples=10):
+    """Formats HreflangValidator.validate() output as report lines."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           H R E F L A N G   C L U S T E R   V A L I D A T I O N")
+    lines.append("="*70)
+    lines.append(f"  Clusters: {validation['clusters']} ({validation['clusters_without_x_default']} without x-default)")
+
+    by_check = {}
+    for url, check, message in validation['issues']:
+        by_check.setdefault(check, []).append((url, message))
+    if not by_check:
+        lines.append("  ✅ All hreflang annotations are reciprocal and point at indexable canonical pages.")
+    for check, items in sorted(by_check.items(), key=lambda item: -len(item[1])):
+        lines.append(f"\n--- {check.replace('_', ' ')} ({len(items)}) ---")
+        for url, message in items[:max_examples]:
+            lines.append(f"  ⚠️ {url}: {message}")
+        if len(items) > max_examples:
+            lines.append(f"  ... and {len(items) - max_examples} more")
+    lines.append("="*70)
+    return lines
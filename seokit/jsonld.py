@@ -0,0 +1,154 @@
+"""
+JSON-LD graph indexing for seo-checker.py.
+
+Real sites (Yoast, RankMath, ...) rarely emit one flat object: they emit a
+single @graph holding many entities that point at each other through @id
+references, or top-level arrays. The index below walks every decoded script
+of a page exactly once, merges repeated @id nodes, records references and
+validates each entity against the compiled schema registry, so the cost is
+linear in the size of the JSON.
+"""
+
+import json
+
+try:
+    import orjson # Optional: pip install orjson (much faster decoding)
+except ImportError:
+    orjson = None
+
+
+def loads(text):
+    """Decodes a JSON document with orjson when it is installed, json otherwise."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def types_of(node):
+    """Normalizes @type (string or list) to a tuple of type names."""
+    schema_type = node.get('@type')
+    if isinstance(schema_type, str):
+        return (schema_type,)
+    if isinstance(schema_type, list):
+        return tuple(t for t in schema_type if isinstance(t, str))
+    return ()
+
+
+def is_reference(node):
+    """True for pure references such as {"@id": "https://example.com/#org"}."""
+    return isinstance(node, dict) and len(node) == 1 and '@id' in node
+
+
+def describe_types(document):
+    """Short, human-readable summary of the entity types declared by one script."""
+    if isinstance(document, dict):
+        if isinstance(document.get('@graph'), list):
+            inner = [t for t in (describe_types(n) for n in document['@graph']) if t != 'Unknown Type']
+            return f"@graph[{', '.join(inner)}]"
+        types = types_of(document)
+        return '/'.join(types) if types else 'Unknown Type'
+    if isinstance(document, list):
+        inner = [t for t in (describe_types(n) for n in document) if t != 'Unknown Type']
+        return f"[{', '.join(inner)}]"
+    return 'Unknown Type'
+
+
+class JsonLdIndex:
+    """Indexes every entity of a page's JSON-LD by @id."""
+
+    def __init__(self):
+        self.by_id = {}         # @id -> node (merged when the same @id is declared more than once)
+        self.entities = []      # (label, node, node_id) for every typed entity, @id duplicates collapsed
+        self.references = []    # (label, referenced @id) for every pure reference
+        self._merged = set()    # @ids whose by_id entry is already a private copy
+        self._typed_ids = set() # @ids already listed in self.entities
+
+    def add(self, document):
+        """Walks one decoded JSON-LD document (dict, list or @graph container)."""
+        stack = [(document, '')]
+        while stack:
+            node, parent_label = stack.pop()
+            if isinstance(node, list):
+                stack.extend((item, parent_label) for item in reversed(node))
+                continue
+            if not isinstance(node, dict):
+                continue
+
+            node_id = node.get('@id') if isinstance(node.get('@id'), str) else None
+            if node_id is not None and len(node) == 1:
+                self.references.append((parent_label, node_id))
+                continue
+
+            types = types_of(node)
+            label = parent_label
+            if types:
+                label = f"{parent_label} > {'/'.join(types)}" if parent_label else '/'.join(types)
+
+            if node_id is not None:
+                if node_id in self.by_id:
+                    self._merge(node_id, node)
+                else:
+                    self.by_id[node_id] = node
+                    if types:
+                        self._add_entity(label, node, node_id)
+            elif types:
+                self._add_entity(label, node, None)
+
+            children = [value for key, value in node.items() if key != '@context' and isinstance(value, (dict, list))]
+            stack.extend((child, label) for child in reversed(children))
+        return self
+
+    def _add_entity(self, label, node, node_id):
+        self.entities.append((label, node, node_id))
+        if node_id is not None:
+            self._typed_ids.add(node_id)
+
+    def _merge(self, node_id, node):
+        """Merges a repeated declaration of @id into the indexed node (first non-empty value wins)."""
+        existing = self.by_id[node_id]
+        if node_id not in self._merged:
+            existing = self.by_id[node_id] = dict(existing)
+            self._merged.add(node_id)
+        had_types = types_of(existing)
+        for key, value in node.items():
+            if key == '@type':
+                continue
+            if not existing.get(key):
+                existing[key] = value
+        new_types = [t for t in types_of(node) if t not in had_types]
+        if new_types:
+            existing['@type'] = list(had_types) + new_types
+            if node_id not in self._typed_ids:
+                self._add_entity('/'.join(types_of(existing)), existing, node_id)
+
+    def resolve(self, value):
+        """Returns the indexed node for a reference, the value itself otherwise (None if dangling)."""
+        if is_reference(value):
+            return self.by_id.get(value['@id'])
+        return value
+
+    def unresolved_references(self):
+        """Returns (label, @id) for every reference whose target is not declared on the page."""
+        return [(label, ref) for label, ref in self.references if ref not in self.by_id]
+
+    def iter_entities(self):
+        """Yields (label, node) for every unique typed entity, with repeated @id declarations merged."""
+        for label, node, node_id in self.entities:
+            yield label, (self.by_id[node_id] if node_id is not None else node)
+
+
+def validate_index(index, validators):
+    """
+    Validates every indexed entity against the compiled validators.
+
+    Returns a list of (label, schema_type, missing_properties) tuples. A
+    property holding an @id reference counts as present; dangling references
+    are reported separately by JsonLdIndex.unresolved_references().
+    """
+    findings = []
+    for label, node in index.iter_entities():
+        for schema_type in types_of(node):
+            validator = validators.get(schema_type)
+            if validator is not None:
+                findings.append((label, schema_type, validator(node)))
+    return findings
@@ -0,0 +1,302 @@
+"""
+Internal link graph for bulk audits.
+
+URLs are interned to integer node ids as pages stream in; edges are kept in
+two flat integer arrays and compacted into CSR form (indptr/indices) once
+the audit is finished. All analysis (click depth, PageRank, orphans, broken
+targets) runs on those arrays with NumPy, which keeps a million-edge site
+within a few seconds and a few tens of megabytes.
+
+NumPy is only needed for finalize()/analyze(): pip install numpy
+"""
+
+from array import array
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+# Node status values
+STATUS_UNKNOWN = 0   # Linked to, but never audited
+STATUS_OK = 1        # Audited successfully
+STATUS_BROKEN = 2    # Audit failed (fetch/read error)
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_MAX_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-9
+
+
+def resolve_internal_links(page_url, hrefs):
+    """
+    Resolves raw <a href> values against the page URL and keeps only links to
+    the same host (scheme-insensitive), without fragments. mailto:, tel:,
+    javascript: and similar links are dropped.
+    """
+    base = urlsplit(page_url)
+    host = base.netloc.lower()
+    internal = []
+    for href in hrefs:
+        href = href.strip()
+        if not href or href.startswith('#'):
+            continue
+        url = urldefrag(urljoin(page_url, href))[0]
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https', 'file') or parts.netloc.lower() != host:
+            continue
+        internal.append(url)
+    return internal
+
+
+def _node_key(url):
+    """Normalized form used for interning (trailing slash and host case ignored)."""
+    # Plain string slicing: this runs once per link, so urlsplit() would dominate build time
+    host_start = url.find('://') + 3
+    path_start = url.find('/', host_start)
+    if path_start < 0:
+        return url.lower() + '/'
+    path, sep, query = url[path_start:].partition('?')
+    return url[:path_start].lower() + (path.rstrip('/') or '/') + sep + query
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Link graph analysis requires NumPy. Install it with: pip install numpy")
+    return numpy
+
+
+class LinkGraph:
+    """Compact directed graph of internal links (integer node ids, CSR adjacency)."""
+
+    def __init__(self):
+        self._ids = {}                  # normalized URL -> node id
+        self.urls = []                  # node id -> URL (first spelling seen)
+        self.status = array('b')        # node id -> STATUS_*
+        self._src = array('l')          # edge list, appended while pages stream in
+        self._dst = array('l')
+        self.indptr = None              # CSR form, built by finalize()
+        self.indices = None
+
+    def node(self, url):
+        """Returns the node id of a URL, creating it on first sight."""
+        key = _node_key(url)
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = self._ids[key] = len(self.urls)
+            self.urls.append(url)
+            self.status.append(STATUS_UNKNOWN)
+        return node_id
+
+    def lookup(self, url):
+        """Returns the node id of a URL, or None if it never appeared."""
+        return self._ids.get(_node_key(url))
+
+    def add_page(self, url, internal_links):
+        """Records a successfully audited page and its outgoing internal links."""
+        src = self.node(url)
+        self.status[src] = STATUS_OK
+        for link in internal_links:
+            dst = self.node(link)
+            if dst != src:
+                self._src.append(src)
+                self._dst.append(dst)
+        self.indptr = self.indices = None
+
+    def mark_broken(self, url):
+        """Records a page whose fetch or audit failed."""
+        self.status[self.node(url)] = STATUS_BROKEN
+
+    @property
+    def node_count(self):
+        return len(self.urls)
+
+    def finalize(self):
+        """Builds the CSR arrays (duplicate edges removed). Returns (indptr, indices)."""
+        np = _numpy()
+        n = self.node_count
+        edge_dtype = np.dtype(f'i{self._src.itemsize}')
+        src = np.frombuffer(self._src, dtype=edge_dtype).astype(np.int64)
+        dst = np.frombuffer(self._dst, dtype=edge_dtype).astype(np.int64)
+        keys = np.unique(src * max(n, 1) + dst)      # sorted by (src, dst), duplicates removed
+        src, dst = keys // max(n, 1), keys % max(n, 1)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = dst
+        return self.indptr, self.indices
+
+    def _ensure_csr(self):
+        if self.indptr is None:
+            self.finalize()
+        return self.indptr, self.indices
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def in_degree(self):
+        np = _numpy()
+        _, indices = self._ensure_csr()
+        return np.bincount(indices, minlength=self.node_count)
+
+    def click_depth(self, start):
+        """Breadth-first click depth from `start` (node id). Unreachable nodes get -1."""
+        np = _numpy()
+        indptr, indices = self._ensure_csr()
+        depth = np.full(self.node_count, -1, dtype=np.int64)
+        depth[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            starts, counts = indptr[frontier], indptr[frontier + 1] - indptr[frontier]
+            total = int(counts.sum())
+            if not total:
+                break
+            # Gather all neighbours of the frontier in one vectorized step
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            neighbours = np.unique(indices[offsets])
+            neighbours = neighbours[depth[neighbours] < 0]
+            level += 1
+            depth[neighbours] = level
+            frontier = neighbours
+        return depth
+
+    def pagerank(self, damping=PAGERANK_DAMPING, max_iterations=PAGERANK_MAX_ITERATIONS, tolerance=PAGERANK_TOLERANCE):
+        """Internal PageRank by vectorized power iteration (dangling mass spread uniformly)."""
+        np = _numpy()
+        indptr, indices = self._ensure_csr()
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+        out_degree = np.diff(indptr)
+        edge_src = np.repeat(np.arange(n), out_degree)
+        dangling = out_degree == 0
+        inv_out = np.zeros(n)
+        inv_out[~dangling] = 1.0 / out_degree[~dangling]
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            flow = np.bincount(indices, weights=(rank * inv_out)[edge_src], minlength=n)
+            new_rank = damping * (flow + rank[dangling].sum() / n) + (1.0 - damping) / n
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < tolerance:
+                break
+        return rank
+
+    def analyze(self, homepage=None, sitemap_urls=None, top=20):
+        """
+        Runs the full analysis and returns a dictionary with orphan pages,
+        click-depth statistics, broken internal targets and the top PageRank
+        pages. `sitemap_urls` (iterable) defines the pages expected to be
+        linked; without it every audited page is expected.
+        """
+        np = _numpy()
+        indptr, indices = self._ensure_csr()
+        status = np.frombuffer(self.status, dtype=np.int8).copy()
+        in_degree = self.in_degree()
+        audited = status == STATUS_OK
+
+        expected = np.zeros(self.node_count, dtype=bool)
+        if sitemap_urls is not None:
+            for url in sitemap_urls:
+                node_id = self.lookup(url)
+                if node_id is not None:
+                    expected[node_id] = True
+            never_seen = [url for url in sitemap_urls if self.lookup(url) is None]
+        else:
+            expected = audited.copy()
+            never_seen = []
+
+        home_id = self.lookup(homepage) if homepage else None
+        if home_id is not None:
+            expected[home_id] = False
+        orphan_ids = np.flatnonzero(expected & (in_degree == 0))
+
+        depth = self.click_depth(home_id) if home_id is not None else None
+        rank = self.pagerank()
+
+        # Broken targets: failed pages that other pages still link to
+        broken_ids = np.flatnonzero((status == STATUS_BROKEN) & (in_degree > 0))
+        broken = []
+        if broken_ids.size:
+            edge_src = np.repeat(np.arange(self.node_count), np.diff(indptr))
+            is_broken = np.zeros(self.node_count, dtype=bool)
+            is_broken[broken_ids] = True
+            mask = is_broken[indices]
+            linking = {}
+            for src, dst in zip(edge_src[mask].tolist(), indices[mask].tolist()):
+                linking.setdefault(dst, []).append(src)
+            for dst in broken_ids.tolist():
+                sources = linking.get(dst, [])
+                broken.append({'url': self.urls[dst], 'inbound': len(sources),
+                               'linked_from': [self.urls[s] for s in sources[:5]]})
+            broken.sort(key=lambda item: item['inbound'], reverse=True)
+
+        analysis = {
+            'nodes': self.node_count,
+            'edges': int(indices.size),
+            'audited': int(audited.sum()),
+            'not_audited_targets': int(((status == STATUS_UNKNOWN) & (in_degree > 0)).sum()),
+            'orphans': [self.urls[i] for i in orphan_ids.tolist()],
+            'sitemap_urls_never_seen': never_seen,
+            'broken_targets': broken,
+            'homepage': homepage if home_id is not None else None,
+            'depth_histogram': {},
+            'unreachable': [],
+            'pagerank_top': [],
+        }
+        if depth is not None:
+            reached = depth[audited & (depth >= 0)]
+            values, counts = np.unique(reached, return_counts=True)
+            analysis['depth_histogram'] = {int(v): int(c) for v, c in zip(values, counts)}
+            analysis['unreachable'] = [self.urls[i] for i in np.flatnonzero(audited & (depth < 0)).tolist()]
+            analysis['depth'] = depth
+        if rank.size:
+            candidates = np.flatnonzero(audited)
+            order = candidates[np.argsort(-rank[candidates], kind='stable')][:top]
+            analysis['pagerank_top'] = [(self.urls[i], float(rank[i])) for i in order.tolist()]
+            analysis['pagerank'] = rank
+        return analysis
+
+
+def format_link_graph_report(analysis, max_examples=20):
+    """Formats LinkGraph.analyze() output as report lines."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           I N T E R N A L   L I N K   G R A P H")
+    lines.append("="*70)
+    lines.append(f"  Nodes: {analysis['nodes']} ({analysis['audited']} audited, {analysis['not_audited_targets']} linked but not audited)")
+    lines.append(f"  Unique internal links: {analysis['edges']}")
+
+    lines.append(f"\n--- Orphan Pages: no internal links pointing to them ({len(analysis['orphans'])}) ---")
+    if not analysis['orphans']:
+        lines.append("  ✅ Every expected page has at least one inbound internal link.")
+    for url in analysis['orphans'][:max_examples]:
+        lines.append(f"  ⚠️ {url}")
+    if len(analysis['orphans']) > max_examples:
+        lines.append(f"  ... and {len(analysis['orphans']) - max_examples} more")
+    if analysis['sitemap_urls_never_seen']:
+        lines.append(f"  ℹ️ {len(analysis['sitemap_urls_never_seen'])} sitemap URL(s) were neither audited nor linked.")
+
+    lines.append("\n--- Click Depth from Homepage ---")
+    if analysis['homepage'] is None:
+        lines.append("  (Homepage not among the audited/linked pages; depth not computed)")
+    else:
+        lines.append(f"  Homepage: {analysis['homepage']}")
+        for level, count in sorted(analysis['depth_histogram'].items()):
+            flag = '⚠️' if level > 3 else '  '
+            lines.append(f"  {flag} Depth {level}: {count} page(s)")
+        if analysis['unreachable']:
+            lines.append(f"  ❌ {len(analysis['unreachable'])} audited page(s) cannot be reached from the homepage:")
+            for url in analysis['unreachable'][:max_examples]:
+                lines.append(f"     - {url}")
+
+    lines.append(f"\n--- Broken Internal Targets ({len(analysis['broken_targets'])}) ---")
+    if not analysis['broken_targets']:
+        lines.append("  ✅ No internal links point at failed pages.")
+    for item in analysis['broken_targets'][:max_examples]:
+        lines.append(f"  ❌ {item['url']} ({item['inbound']} inbound link(s), e.g. from {', '.join(item['linked_from'][:2])})")
+
+    lines.append("\n--- Top Internal PageRank ---")
+    for url, score in analysis['pagerank_top']:
+        lines.append(f"  > {score:.5f}  {url}")
+    lines.append("="*70)
+    return lines
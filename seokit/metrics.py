@@ -0,0 +1,306 @@
+"""
+Process-wide metrics for long runs (bulk audits, status sweeps, sitemap
+builds), exposed in the Prometheus text format on a local HTTP endpoint.
+
+Counters and histograms are updated from hot loops and worker threads, so
+each thread writes to its own shard (a plain dictionary only that thread
+touches) and nothing is locked on update; shards are merged when /metrics is
+scraped. The shards of threads that have exited (one per connection in a
+threading server) are folded into a retired total, so the number of shards
+stays at the number of live writing threads. Gauges hold a single current
+value per label set.
+
+Work done in worker processes is counted in the workers' own registries;
+a worker sends collect_delta() back with its results and the parent adds it
+with merge_delta(), so the parent's endpoint covers the whole pool.
+
+    PAGES = metrics.counter('seokit_pages_total', 'Pages audited, by result.', ('result',))
+    PAGES.inc('ok')
+    metrics.serve(9108)         # http://127.0.0.1:9108/metrics
+"""
+
+import os
+import threading
+from bisect import bisect_left
+
+METRICS_PORT_ENV = 'SEOKIT_METRICS_PORT'
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Sharded:
+    """
+    Base for metrics with one private shard (dictionary) per writing thread.
+    Subclasses define _merge(total, shard), which adds a shard into a total.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labels)
+        self._local = threading.local()
+        self._shards = []               # (writing thread, its shard)
+        self._retired = {}              # Merged shards of threads that have exited
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:            # Once per thread, not per update
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _retire_dead(self):
+        """Folds the shards of exited threads into the retired total (call with the lock held)."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:                       # No more writes can happen: safe to merge without copying
+                self._merge(self._retired, shard)
+        self._shards = live
+
+    def _totals(self):
+        """All shards merged into one dictionary."""
+        with self._lock:
+            self._retire_dead()
+            total = {}
+            self._merge(total, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            self._merge(total, dict(shard))
+        return total
+
+    def _add(self, changes):
+        """Adds changes counted elsewhere (another process) to the retired total."""
+        with self._lock:
+            self._merge(self._retired, changes)
+
+
+class Counter(_Sharded):
+    kind = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def _merge(self, total, shard):
+        for key, value in shard.items():
+            total[key] = total.get(key, 0) + value
+
+    def _difference(self, current, previous):
+        return {key: value - previous.get(key, 0) for key, value in current.items() if value != previous.get(key, 0)}
+
+    def values(self):
+        """{label values: total} merged over all threads."""
+        return self._totals()
+
+    def samples(self):
+        for key, value in sorted(self.values().items()):
+            yield self.name + _labels(self.labelnames, key), value
+
+
+class Histogram(_Sharded):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        shard = self._shard()
+        row = shard.get(label_values)
+        if row is None:
+            row = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]   # bucket counts, +Inf, sum
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def _merge(self, total, shard):
+        for key, row in shard.items():
+            merged = total.setdefault(key, [0] * len(row[:-1]) + [0.0])
+            for index, value in enumerate(list(row)):
+                merged[index] += value
+
+    def _difference(self, current, previous):
+        changes = {}
+        for key, row in current.items():
+            before = previous.get(key)
+            if row != before:
+                changes[key] = [a - b for a, b in zip(row, before)] if before else row
+        return changes
+
+    def values(self):
+        """{label values: (per-bucket counts with +Inf last, sum)} merged over all threads."""
+        return {key: (row[:-1], row[-1]) for key, row in self._totals().items()}
+
+    def samples(self):
+        bounds = self.buckets + (float('inf'),)
+        for key, (counts, total) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield self.name + '_bucket' + _labels(self.labelnames, key, f'le="{_format_value(float(bound))}"'), cumulative
+            yield self.name + '_sum' + _labels(self.labelnames, key), total
+            yield self.name + '_count' + _labels(self.labelnames, key), cumulative
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, *label_values):
+        self._values[label_values] = value
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def values(self):
+        return dict(self._values)
+
+    def samples(self):
+        for key, value in sorted(self.values().items()):
+            yield self.name + _labels(self.labelnames, key), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._sent = {}                 # name -> totals at the last collect_delta()
+        self.server = None
+
+    def _get(self, cls, name, help_text, labels, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **options)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def collect_delta(self):
+        """
+        Counter and histogram changes since the previous call, as a picklable
+        dict: a worker process returns it with its results and the parent
+        passes it to merge_delta().
+        """
+        with self._lock:
+            metrics = [metric for metric in self._metrics.values() if isinstance(metric, _Sharded)]
+        delta = {}
+        for metric in metrics:
+            totals = metric._totals()
+            changes = metric._difference(totals, self._sent.get(metric.name, {}))
+            self._sent[metric.name] = totals
+            if changes:
+                delta[metric.name] = (metric.kind, metric.help, metric.labelnames, getattr(metric, 'buckets', None), changes)
+        return delta
+
+    def merge_delta(self, delta):
+        """Adds the changes collected by collect_delta() in another process to the metrics of this one."""
+        for name, (kind, help_text, labels, buckets, changes) in delta.items():
+            if kind == 'histogram':
+                metric = self.histogram(name, help_text, labels, buckets=buckets)
+            else:
+                metric = self.counter(name, help_text, labels)
+            metric._add(changes)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serves GET /metrics from a daemon thread. Returns the server (port 0 picks a free port)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='seokit-metrics', daemon=True).start()
+        return self.server
+
+
+REGISTRY = MetricsRegistry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+serve = REGISTRY.serve
+collect_delta = REGISTRY.collect_delta
+merge_delta = REGISTRY.merge_delta
+
+# Shared by several modules
+CACHE_REQUESTS = counter('seokit_cache_requests_total', 'Cache lookups, by cache and result (hit or miss).', ('cache', 'result'))
+QUEUE_DEPTH = gauge('seokit_queue_depth', 'Work items submitted but not finished, by queue.', ('queue',))
+
+
+def serve_from_environment():
+    """Starts the endpoint on $SEOKIT_METRICS_PORT when it is set. Returns the server or None."""
+    port = os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    return serve(int(port))
@@ -0,0 +1,395 @@
+"""
+Structured PDF rendering for audit reports (fpdf2).
+
+Reports are described as small documents (plain dicts, so they can be sent
+to worker processes):
+
+    {'title': 'SEO Audit', 'subtitle': 'https://www.example.com/',
+     'score': 88, 'grade': 'A-',
+     'blocks': [('heading', 'Core SEO Tags'),
+                ('table', [('Canonical URL', 'https://...'), ...]),
+                ('text', '✅ Title length is optimal.'),
+                ('code', '<link rel="canonical" href="...">')]}
+
+Each block is laid out with a few cell calls instead of pushing the whole
+report through one multi_cell. The core Helvetica font is used whenever a
+document fits in latin-1 (no font file to load); otherwise a Unicode TTF is
+located once per process and embedded. Emoji statuses are mapped to short
+text labels either way, since the common TTF fonts lack those glyphs.
+
+PdfBatch spreads per-page PDFs over a process pool while pages are still
+being audited. render_combined() writes one summary PDF with a table of
+contents.
+"""
+
+import os
+import re
+
+from seokit.metrics import QUEUE_DEPTH
+
+# Emoji statuses used in the reports -> (label, RGB colour)
+STATUS_LABELS = {
+    '✅': ('[OK]', (0, 128, 0)),
+    '❌': ('[X]', (200, 0, 0)),
+    '⚠️': ('[!]', (205, 120, 0)),
+    '⚠': ('[!]', (205, 120, 0)),
+    'ℹ️': ('[i]', (0, 90, 170)),
+    '💡': ('Tip:', (0, 90, 170)),
+}
+# Decorative symbols dropped from headings and text
+DECORATIONS = ('🌟', '🌐', '🛠️', '🛠', '✨', '🎉')
+
+UNICODE_FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',
+    'C:\\Windows\\Fonts\\arial.ttf',
+)
+
+LABEL_WIDTH = 55        # mm, first column of two-column tables
+LINE_HEIGHT = 5
+MAX_CELL_CHARS = 400    # Long values (snippets, URLs) are cut to keep tables readable
+BATCH_SIZE = 16         # Documents per worker task
+
+_SPACED_TITLE_RE = re.compile(r"^(?:\S ){3,}\S")
+_HEADING_RE = re.compile(r"^-{3}\s*(.+?)\s*-{3}$")
+
+
+def find_unicode_font():
+    """Path of a Unicode TTF font (SEOKIT_PDF_FONT overrides the search), or None."""
+    override = os.environ.get('SEOKIT_PDF_FONT')
+    if override and os.path.exists(override):
+        return override
+    return next((path for path in UNICODE_FONT_CANDIDATES if os.path.exists(path)), None)
+
+
+def _unspace(title):
+    """'S I T E   R E P O R T' -> 'SITE REPORT'."""
+    return ' '.join(word.replace(' ', '') for word in title.split('   ') if word.strip())
+
+
+def lines_to_blocks(lines):
+    """
+    Turns the text report lines (as built by seo-checker.py) into document
+    blocks: '--- X ---' lines and spaced banner titles become headings,
+    separator lines are dropped and ```html fences become code blocks.
+    """
+    blocks = []
+    code = None
+    for raw in '\n'.join(lines).split('\n'):
+        line = raw.rstrip()
+        stripped = line.strip()
+        if code is not None:
+            if stripped.startswith('```'):
+                if stripped[3:]:
+                    code.append(stripped[3:])
+                blocks.append(('code', '\n'.join(code)))
+                code = None
+            elif stripped.endswith('```'):
+                code.append(stripped[:-3])
+                blocks.append(('code', '\n'.join(code)))
+                code = None
+            else:
+                code.append(line)
+            continue
+        if not stripped or set(stripped) <= set('=#'):
+            continue
+        if stripped.startswith('```'):
+            code = []
+            continue
+        heading = _HEADING_RE.match(stripped)
+        if heading:
+            blocks.append(('heading', heading.group(1)))
+        elif _SPACED_TITLE_RE.match(_strip_decorations(stripped)):
+            blocks.append(('heading', _unspace(_strip_decorations(stripped))))
+        else:
+            blocks.append(('text', stripped))
+    if code:
+        blocks.append(('code', '\n'.join(code)))
+    return blocks
+
+
+def _strip_decorations(text):
+    for symbol in DECORATIONS:
+        text = text.replace(symbol, '')
+    return text.strip()
+
+
+def _document_text(document):
+    """Yields every string of a document (used to pick the font)."""
+    yield document.get('title', '')
+    yield document.get('subtitle', '')
+    for block in document.get('blocks', []):
+        if block[0] == 'table':
+            for row in block[1]:
+                yield from (str(cell) for cell in row)
+        else:
+            yield str(block[1])
+
+
+class PdfRenderer:
+    """Lays out documents with fpdf2. One instance per process; the font lookup happens once."""
+
+    def __init__(self, font_path=None):
+        from fpdf import FPDF # Requires: pip install fpdf2
+        self._fpdf_class = FPDF
+        self.font_path = font_path or find_unicode_font()
+        self.bold_font_path = None
+        if self.font_path:
+            bold = self.font_path.replace('.ttf', '-Bold.ttf')
+            self.bold_font_path = bold if os.path.exists(bold) else None
+
+    # ------------------------------------------------------------------
+    # Text handling
+    # ------------------------------------------------------------------
+
+    def _needs_unicode(self, document):
+        for text in _document_text(document):
+            try:
+                self._clean(text).encode('latin-1')
+            except UnicodeEncodeError:
+                return True
+        return False
+
+    def _clean(self, text):
+        text = _strip_decorations(str(text).replace('**', ''))
+        for symbol, (label, _) in STATUS_LABELS.items():
+            if symbol in text:
+                text = text.replace(symbol, label)
+        return text.replace('\ufe0f', '').replace('—', '-').replace('’', "'")
+
+    def _new_pdf(self, unicode_text):
+        pdf = self._fpdf_class()
+        pdf.set_auto_page_break(True, margin=15)
+        pdf.set_margins(15, 15, 15)
+        if unicode_text and self.font_path:
+            pdf.add_font('report', '', self.font_path)
+            pdf.add_font('report', 'B', self.bold_font_path or self.font_path)
+            pdf.seokit_font, pdf.seokit_latin1 = 'report', False
+        else:
+            pdf.seokit_font, pdf.seokit_latin1 = 'helvetica', True
+        return pdf
+
+    def _text(self, pdf, text):
+        text = self._clean(text)
+        if pdf.seokit_latin1:
+            text = text.encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def _status_colour(self, raw):
+        for symbol, (_, colour) in STATUS_LABELS.items():
+            if str(raw).lstrip(' >-').startswith(symbol) or f"({symbol}" in str(raw):
+                return colour
+        return None
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _title(self, pdf, document):
+        pdf.set_font(pdf.seokit_font, 'B', 16)
+        pdf.cell(0, 9, self._text(pdf, document.get('title', 'SEO Audit Report')), new_x='LMARGIN', new_y='NEXT')
+        pdf.set_font(pdf.seokit_font, '', 9)
+        if document.get('subtitle'):
+            pdf.multi_cell(0, LINE_HEIGHT, self._text(pdf, document['subtitle']), new_x='LMARGIN', new_y='NEXT')
+        if document.get('score') is not None:
+            pdf.ln(2)
+            pdf.set_font(pdf.seokit_font, 'B', 12)
+            pdf.set_fill_color(235, 240, 250)
+            pdf.cell(0, 9, self._text(pdf, f"Score: {document['score']}%    Grade: {document.get('grade', '')}"),
+                     fill=True, new_x='LMARGIN', new_y='NEXT')
+        pdf.ln(3)
+
+    def _heading(self, pdf, text):
+        if pdf.get_y() > pdf.h - 40:
+            pdf.add_page()
+        pdf.ln(2)
+        pdf.set_font(pdf.seokit_font, 'B', 11)
+        pdf.set_text_color(20, 40, 90)
+        pdf.multi_cell(0, 6, self._text(pdf, text), new_x='LMARGIN', new_y='NEXT')
+        pdf.set_draw_color(180, 190, 210)
+        pdf.line(pdf.l_margin, pdf.get_y(), pdf.w - pdf.r_margin, pdf.get_y())
+        pdf.set_text_color(0, 0, 0)
+        pdf.ln(1)
+
+    def _table(self, pdf, rows):
+        pdf.set_font(pdf.seokit_font, '', 9)
+        value_width = pdf.w - pdf.l_margin - pdf.r_margin - LABEL_WIDTH
+        for row in rows:
+            label, value = (row[0], ' | '.join(str(cell) for cell in row[1:])) if len(row) > 1 else ('', row[0])
+            value = str(value)
+            if len(value) > MAX_CELL_CHARS:
+                value = value[:MAX_CELL_CHARS] + '...'
+            if pdf.get_y() > pdf.h - 20:
+                pdf.add_page()
+            pdf.set_font(pdf.seokit_font, 'B', 9)
+            pdf.cell(LABEL_WIDTH, LINE_HEIGHT, self._text(pdf, label)[:40])
+            pdf.set_font(pdf.seokit_font, '', 9)
+            colour = self._status_colour(value)
+            if colour:
+                pdf.set_text_color(*colour)
+            pdf.multi_cell(value_width, LINE_HEIGHT, self._text(pdf, value) or '-', new_x='LMARGIN', new_y='NEXT')
+            pdf.set_text_color(0, 0, 0)
+
+    def _paragraph(self, pdf, text):
+        pdf.set_font(pdf.seokit_font, '', 9)
+        colour = self._status_colour(text)
+        if colour:
+            pdf.set_text_color(*colour)
+        pdf.multi_cell(0, LINE_HEIGHT, self._text(pdf, text), new_x='LMARGIN', new_y='NEXT')
+        pdf.set_text_color(0, 0, 0)
+
+    def _code(self, pdf, text):
+        pdf.set_font('courier', '', 8)
+        pdf.set_fill_color(245, 245, 245)
+        code = text.encode('latin-1', 'replace').decode('latin-1')
+        pdf.multi_cell(0, 4, code.rstrip(), fill=True, new_x='LMARGIN', new_y='NEXT')
+        pdf.ln(1)
+
+    def _blocks(self, pdf, blocks, sections=False):
+        for block in blocks:
+            kind = block[0]
+            if kind == 'heading':
+                if sections:
+                    pdf.start_section(self._text(pdf, block[1])[:80], level=1)
+                self._heading(pdf, block[1])
+            elif kind == 'table':
+                self._table(pdf, block[1])
+            elif kind == 'code':
+                self._code(pdf, block[1])
+            else:
+                self._paragraph(pdf, block[1])
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def render(self, document):
+        """Returns the laid-out FPDF object for one document."""
+        pdf = self._new_pdf(self._needs_unicode(document))
+        pdf.add_page()
+        self._title(pdf, document)
+        self._blocks(pdf, document.get('blocks', []))
+        return pdf
+
+    def write(self, document, path):
+        self.render(document).output(path)
+        return path
+
+    def render_combined(self, path, summary, documents=(), toc_title='Contents'):
+        """
+        Writes one PDF: a table of contents, the `summary` document, then every
+        document in `documents` as its own TOC section.
+        """
+        documents = list(documents)
+        unicode_text = self._needs_unicode(summary) or any(self._needs_unicode(d) for d in documents)
+        pdf = self._new_pdf(unicode_text)
+        entries = 1 + sum(1 for b in summary.get('blocks', []) if b[0] == 'heading') + len(documents)
+        pdf.add_page()
+        pdf.insert_toc_placeholder(self._toc_renderer(toc_title), pages=max(1, -(-entries // 48)))
+
+        pdf.add_page()
+        pdf.start_section(self._text(pdf, summary.get('title', 'Summary'))[:80])
+        self._title(pdf, summary)
+        self._blocks(pdf, summary.get('blocks', []), sections=True)
+        for document in documents:
+            pdf.add_page()
+            pdf.start_section(self._text(pdf, document.get('subtitle') or document.get('title', ''))[:80])
+            self._title(pdf, document)
+            self._blocks(pdf, document.get('blocks', []))
+        pdf.output(path)
+        return path
+
+    def _toc_renderer(self, toc_title):
+        def render_toc(pdf, outline):
+            pdf.set_font(pdf.seokit_font, 'B', 16)
+            pdf.cell(0, 10, toc_title, new_x='LMARGIN', new_y='NEXT')
+            pdf.set_font(pdf.seokit_font, '', 9)
+            for section in outline:
+                indent = '    ' * section.level
+                link = pdf.add_link(page=section.page_number)
+                width = pdf.w - pdf.l_margin - pdf.r_margin - 15
+                pdf.cell(width, LINE_HEIGHT, f"{indent}{section.name}"[:110], link=link)
+                pdf.cell(15, LINE_HEIGHT, str(section.page_number), align='R', link=link, new_x='LMARGIN', new_y='NEXT')
+        return render_toc
+
+
+# ----------------------------------------------------------------------
+# Parallel rendering
+# ----------------------------------------------------------------------
+
+_WORKER_RENDERER = None
+
+
+def _render_batch(jobs):
+    """Worker entry point: renders [(document, path)], returns [(path, error or None)]."""
+    global _WORKER_RENDERER
+    if _WORKER_RENDERER is None:
+        _WORKER_RENDERER = PdfRenderer()
+    outcome = []
+    for document, path in jobs:
+        try:
+            _WORKER_RENDERER.write(document, path)
+            outcome.append((path, None))
+        except Exception as e:
+            outcome.append((path, str(e)))
+    return outcome
+
+
+class PdfBatch:
+    """
+    Renders documents in a process pool while they are still being produced.
+    submit() queues (document, path); in-flight work is bounded so memory
+    stays flat on large audits. close() waits and returns [(path, error)] for
+    the failures.
+    """
+
+    def __init__(self, workers=None, batch_size=BATCH_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        from concurrent.futures import ProcessPoolExecutor
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._batch = []
+        self._futures = set()
+        self.written = 0
+        self.failures = []
+
+    def submit(self, document, path):
+        self._batch.append((document, path))
+        if len(self._batch) >= self.batch_size:
+            self._dispatch()
+
+    def _dispatch(self):
+        from concurrent.futures import FIRST_COMPLETED, wait
+        if not self._batch:
+            return
+        while len(self._futures) >= self.workers * 2:
+            done, self._futures = wait(self._futures, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        self._futures.add(self.executor.submit(_render_batch, self._batch))
+        self._batch = []
+        QUEUE_DEPTH.set(len(self._futures), 'pdf')
+
+    def _collect(self, futures):
+        for future in futures:
+            for path, error in future.result():
+                if error:
+                    self.failures.append((path, error))
+                else:
+                    self.written += 1
+
+    def close(self):
+        self._dispatch()
+        self._collect(self._futures)
+        self._futures = set()
+        QUEUE_DEPTH.set(0, 'pdf')
+        self.executor.shutdown()
+        return self.failures
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
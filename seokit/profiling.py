@@ -0,0 +1,198 @@
+"""
+Stage timing spans for the audit pipeline.
+
+Code marks its stages either with a span:
+
+    with span('score'):
+        ...
+
+or, for consecutive stages of one function, with laps (each mark() closes
+the stage that started at the previous mark):
+
+    laps = stage_laps()
+    soup = BeautifulSoup(...)
+    laps.mark('parse')
+
+While profiling is disabled (the default) both return a shared no-op
+object, so an instrumented call costs one attribute check. When enabled,
+every stage duration goes into a per-run log2 histogram, into the timings
+of the page currently being audited (begin_page/end_page, per thread) and,
+optionally, into a Chrome trace-event list (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import threading
+from time import perf_counter_ns
+
+HISTOGRAM_BUCKETS = 40          # Bucket i holds durations below 2**i ns (the last one is open-ended)
+
+
+class _NoOp:
+    """Span and laps stand-in while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mark(self, name):
+        pass
+
+
+_NO_OP = _NoOp()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+        return False
+
+
+class _Laps:
+    __slots__ = ('profiler', 'start')
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.start = perf_counter_ns()
+
+    def mark(self, name):
+        end = perf_counter_ns()
+        self.profiler.record(name, self.start, end)
+        self.start = end
+
+
+class StageHistogram:
+    """Count, total, maximum and log2-bucketed distribution of one stage's durations (ns)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[min(duration.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (ns) of the bucket holding the given percentile."""
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(1 << index, self.max)
+        return self.max
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}        # stage -> StageHistogram
+        self.trace = None           # Chrome trace events, when enabled with trace=True
+        self._origin = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, trace=False):
+        self.enabled = True
+        self.histograms = {}
+        self.trace = [] if trace else None
+        self._origin = perf_counter_ns()
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, name, start, end):
+        duration = end - start
+        page = getattr(self._local, 'page', None)
+        if page is not None:
+            page[name] = page.get(name, 0) + duration
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = StageHistogram()
+            histogram.add(duration)
+            if self.trace is not None:
+                self.trace.append({'name': name, 'ph': 'X', 'ts': (start - self._origin) / 1000, 'dur': duration / 1000,
+                                   'pid': os.getpid(), 'tid': threading.get_ident()})
+
+    def begin_page(self):
+        """Starts collecting the stage timings of one page (in this thread)."""
+        if self.enabled:
+            self._local.page = {}
+
+    def end_page(self):
+        """Returns the stage timings (ms) collected since begin_page(), or None when disabled."""
+        page = getattr(self._local, 'page', None)
+        self._local.page = None
+        if page is None:
+            return None
+        return {name: round(duration / 1e6, 3) for name, duration in page.items()}
+
+    def summary_lines(self):
+        """Stage timing histogram summary for the reports."""
+        lines = []
+        grand_total = sum(histogram.total for histogram in self.histograms.values()) or 1
+        lines.append(f"\n--- Stage Timings ({len(self.histograms)} stage(s)) ---")
+        lines.append(f"  {'Stage':<16} {'Calls':>8} {'Total':>10} {'Mean':>10} {'p50':>10} {'p99':>10} {'Max':>10}")
+        for name, histogram in sorted(self.histograms.items(), key=lambda item: item[1].total, reverse=True):
+            lines.append(f"  {name:<16} {histogram.count:>8} {histogram.total / 1e9:>9.2f}s "
+                         f"{histogram.total / histogram.count / 1e6:>8.2f}ms {histogram.percentile(0.5) / 1e6:>8.2f}ms "
+                         f"{histogram.percentile(0.99) / 1e6:>8.2f}ms {histogram.max / 1e6:>8.2f}ms"
+                         f"  ({histogram.total / grand_total:.0%})")
+        lines.append("  ℹ️ p50/p99 are upper bounds of log2 buckets.")
+        return lines
+
+    def write_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace or [], 'displayTimeUnit': 'ms'}, f)
+
+
+PROFILER = Profiler()
+
+
+def span(name):
+    """Times a `with` block as stage `name` (no-op while profiling is disabled)."""
+    return _Span(PROFILER, name) if PROFILER.enabled else _NO_OP
+
+
+def stage_laps():
+    """Times consecutive stages with mark(name) (no-op while profiling is disabled)."""
+    return _Laps(PROFILER) if PROFILER.enabled else _NO_OP
+
+
+def run_profiled(path, function, *args, **kwargs):
+    """
+    Calls `function` with stage spans enabled and writes a profile of the
+    call to `path`: a Chrome trace of the spans for .json paths, cProfile
+    statistics (pstats format) otherwise. Returns the function's result.
+    """
+    trace = path.lower().endswith('.json')
+    PROFILER.enable(trace=trace)
+    if trace:
+        try:
+            return function(*args, **kwargs)
+        finally:
+            PROFILER.write_trace(path)
+    import cProfile
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(function, *args, **kwargs)
+    finally:
+        profile.dump_stats(path)
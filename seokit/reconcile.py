@@ -0,0 +1,172 @@
+"""
+Reconciliation of tracked page views with the server-side view of a site.
+
+The analytics tracker reports document.title as the browser saw it, after
+any JavaScript ran; the audit extracts <title> from the served HTML, which
+is what most crawlers index. Both are joined on normalized path with a hash
+join: the audited pages and sitemap locations (thousands to millions of
+paths) form the build side, held in one dictionary, and the log events
+(possibly tens of millions) are the probe side, streamed once. Memory grows
+with the number of distinct paths, never with the number of events.
+"""
+
+from seokit.site_index import normalize_text
+from seokit.traffic import PAGE_LOAD, iter_page_events, log_files, log_period, normalize_path
+
+MAX_TITLE_VARIANTS = 5          # Distinct client-side titles kept per page (the rest are only counted)
+TITLE_MISMATCH_SHARE = 0.5      # A page is flagged when at least this share of its views saw another title
+
+
+class _Page:
+    __slots__ = ('url', 'title', 'title_key', 'in_sitemap', 'views', 'mismatched', 'variants')
+
+    def __init__(self, url):
+        self.url = url
+        self.title = None           # Server-rendered <title> (None if the page was not audited)
+        self.title_key = None
+        self.in_sitemap = False
+        self.views = 0
+        self.mismatched = 0         # Views whose pageTitle differs from the server title
+        self.variants = {}          # client title -> views (at most MAX_TITLE_VARIANTS)
+
+
+class TitleReconciler:
+    """
+    Build the join table with add_page() / add_sitemap_url(), then stream
+    the logs through read_logs(). Paths tracked in the logs but absent from
+    the table are counted in `untracked` (path -> views).
+    """
+
+    def __init__(self):
+        self.pages = {}             # normalized path -> _Page
+        self.untracked = {}         # normalized path -> views (tracked, but neither audited nor in the sitemap)
+        self.has_sitemap = False
+        self.files = []
+        self.events = 0
+        self.malformed = 0
+        self.first_seen = None
+        self.last_seen = None
+        self._keys = {}             # raw location -> normalized path
+
+    def _page(self, url):
+        key = normalize_path(url)
+        page = self.pages.get(key)
+        if page is None:
+            page = self.pages[key] = _Page(url)
+        return page
+
+    def add_page(self, url, title):
+        """Adds an audited page and its server-rendered <title>."""
+        page = self._page(url)
+        page.url = url
+        page.title = title or ''
+        page.title_key = normalize_text(title)
+
+    def add_sitemap_url(self, url):
+        self.has_sitemap = True
+        self._page(url).in_sitemap = True
+
+    def read_logs(self, path):
+        """Probes the join table with every PAGE_LOAD event of the log (and its rotated siblings)."""
+        files = log_files(path)
+        if not files:
+            raise FileNotFoundError(f"No analytics log found at {path}")
+        pages, untracked, keys = self.pages, self.untracked, self._keys
+        for file_path in files:
+            self.files.append(file_path)
+            first_line = line = None
+            for line, event in iter_page_events(file_path):
+                if event is None:
+                    self.malformed += 1
+                    continue
+                if event['action'] != PAGE_LOAD:
+                    continue
+                if first_line is None:
+                    first_line = line
+                self.events += 1
+                location = event.get('location')
+                key = keys.get(location)
+                if key is None:
+                    key = keys[location] = normalize_path(location)
+                page = pages.get(key)
+                if page is None:
+                    untracked[key] = untracked.get(key, 0) + 1
+                    continue
+                page.views += 1
+                if page.title_key is None:
+                    continue
+                client_title = event.get('pageTitle') or ''
+                if client_title == page.title or normalize_text(client_title) == page.title_key:
+                    continue
+                page.mismatched += 1
+                if client_title in page.variants or len(page.variants) < MAX_TITLE_VARIANTS:
+                    page.variants[client_title] = page.variants.get(client_title, 0) + 1
+            first, last = log_period(first_line, line)
+            if first and (self.first_seen is None or first < self.first_seen):
+                self.first_seen = first
+            if last and (self.last_seen is None or last > self.last_seen):
+                self.last_seen = last
+
+    def title_mismatches(self):
+        """Audited pages whose client-side title differs for at least TITLE_MISMATCH_SHARE of their views, busiest first."""
+        flagged = [page for page in self.pages.values()
+                   if page.mismatched and page.mismatched >= page.views * TITLE_MISMATCH_SHARE]
+        return sorted(flagged, key=lambda page: page.views, reverse=True)
+
+    def missing_from_sitemap(self):
+        """[(path, views)] of tracked paths that are not in the sitemap, busiest first."""
+        if not self.has_sitemap:
+            return []
+        missing = [(key, views) for key, views in self.untracked.items()]
+        missing.extend((key, page.views) for key, page in self.pages.items() if page.views and not page.in_sitemap)
+        return sorted(missing, key=lambda item: item[1], reverse=True)
+
+    def rows(self):
+        """One row per joined path: (path, url, views, in_sitemap, server title, top client title, mismatch share)."""
+        for key, page in self.pages.items():
+            top_variant = max(page.variants, key=page.variants.get) if page.variants else ''
+            share = page.mismatched / page.views if page.views else 0.0
+            yield (key, page.url, page.views, page.in_sitemap, page.title or '', top_variant, round(share, 3))
+        for key, views in self.untracked.items():
+            yield (key, '', views, False, '', '', 0.0)
+
+
+def format_reconcile_report(reconciler, max_examples=20):
+    """Formats the title and sitemap reconciliation findings."""
+    lines = []
+    audited = sum(1 for page in reconciler.pages.values() if page.title is not None)
+    listed = sum(1 for page in reconciler.pages.values() if page.in_sitemap)
+    lines.append("\n" + "="*70)
+    lines.append("           T R A C K E D   V S   S E R V E D")
+    lines.append("="*70)
+    lines.append(f"  Page views: {reconciler.events} in {len(reconciler.files)} log file(s)"
+                 + (f" ({reconciler.first_seen} - {reconciler.last_seen})" if reconciler.first_seen else ""))
+    lines.append(f"  Joined against: {audited} audited page(s), {listed} sitemap URL(s)")
+    if reconciler.malformed:
+        lines.append(f"  ⚠️ {reconciler.malformed} malformed page event line(s) skipped.")
+
+    if audited:
+        mismatches = reconciler.title_mismatches()
+        lines.append(f"\n--- Client-Side Title Differs From Served <title> ({len(mismatches)}) ---")
+        if not mismatches:
+            lines.append("  ✅ Visitors see the served <title> on every audited page.")
+        else:
+            lines.append("  ℹ️ The title is rewritten by JavaScript: crawlers that do not render JS index the served one.")
+        for page in mismatches[:max_examples]:
+            client_title = max(page.variants, key=page.variants.get) if page.variants else ''
+            lines.append(f"  ⚠️ {page.url} ({page.mismatched}/{page.views} views)")
+            lines.append(f"     served: {page.title!r}")
+            lines.append(f"     client: {client_title!r}")
+
+    if reconciler.has_sitemap:
+        missing = reconciler.missing_from_sitemap()
+        lines.append(f"\n--- Tracked Pages Missing From the Sitemap ({len(missing)}) ---")
+        if not missing:
+            lines.append("  ✅ Every tracked page is listed in the sitemap.")
+        for key, views in missing[:max_examples]:
+            lines.append(f"  ❌ {key} ({views} view(s))")
+        unvisited = sum(1 for page in reconciler.pages.values() if page.in_sitemap and not page.views)
+        if unvisited:
+            lines.append(f"  ℹ️ {unvisited} sitemap URL(s) had no tracked page views in this period.")
+    lines.append("="*70)
+    return lines
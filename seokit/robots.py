@@ -0,0 +1,223 @@
+"""
+robots.txt parsing and matching with Google semantics.
+
+Rules are grouped by user-agent token (groups naming the same token are
+merged; a crawler uses its own group when one exists, otherwise the "*"
+group). Within a group the longest matching pattern wins and Allow wins a
+tie; "*" matches any run of characters and a trailing "$" anchors the end
+of the URL path. urllib.robotparser uses first-match order instead, which
+gives different answers for many real files.
+
+Each group is compiled once: plain prefix rules go into a dictionary keyed
+by the prefix and are looked up by slicing the path at each distinct rule
+length, wildcard rules into regular expressions checked longest first, so
+a URL costs a handful of dictionary lookups whatever the size of the file.
+
+RobotsCache fetches each host's file once per TTL and applies Google's
+error handling: 4xx means no restrictions, 5xx or a network error means
+the whole host is disallowed.
+"""
+
+import re
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from seokit.metrics import CACHE_REQUESTS
+
+GOOGLEBOT = 'googlebot'
+DEFAULT_TTL = 24 * 3600             # Google caches robots.txt for up to a day
+ERROR_TTL = 5 * 60                  # Server errors are retried sooner
+MAX_ROBOTS_BYTES = 500 * 1024       # Google ignores anything after the first 500 KiB
+MAX_ROBOTS_REDIRECTS = 5
+
+_SAFE_CHARS = "/?=&;:@!$'()*+,%-._~"
+_ESCAPE_RE = re.compile(r"%[0-9a-fA-F]{2}")
+_TOKEN_RE = re.compile(r"[A-Za-z_-]+")
+
+
+def _normalize(text):
+    """Percent-encodes non-ASCII and unsafe characters and upper-cases existing escapes."""
+    return _ESCAPE_RE.sub(lambda m: m.group(0).upper(), quote(text, safe=_SAFE_CHARS))
+
+
+def url_path(url):
+    """The part of a URL robots.txt rules are matched against: path plus query, normalized."""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    return _normalize(path)
+
+
+def _pattern_regex(pattern):
+    anchored = pattern.endswith('$')
+    body = pattern[:-1] if anchored else pattern
+    regex = '.*'.join(re.escape(piece) for piece in body.split('*'))
+    return re.compile(regex + (r'\Z' if anchored else ''), re.DOTALL)
+
+
+class RuleMatcher:
+    """Compiled Allow/Disallow rules of one group."""
+
+    __slots__ = ('prefixes', 'lengths', 'patterns')
+
+    def __init__(self, rules):
+        self.prefixes = {}          # Plain prefix -> allowed (Allow wins a tie)
+        self.patterns = []          # (length, allowed, match, pattern), longest first
+        for allowed, pattern in rules:
+            if '*' in pattern or pattern.endswith('$'):
+                self.patterns.append((len(pattern), allowed, _pattern_regex(pattern).match, pattern))
+            else:
+                self.prefixes[pattern] = self.prefixes.get(pattern, False) or allowed
+        self.lengths = sorted({len(prefix) for prefix in self.prefixes}, reverse=True)
+        self.patterns.sort(key=lambda rule: (rule[0], rule[1]), reverse=True)
+
+    def match(self, path):
+        """Returns (allowed, rule) for a normalized path; rule is None when nothing matched."""
+        best = None                 # (length, allowed, pattern)
+        size = len(path)
+        for length in self.lengths:
+            if length <= size:
+                allowed = self.prefixes.get(path[:length])
+                if allowed is not None:
+                    best = (length, allowed, path[:length])
+                    break
+        for length, allowed, match, pattern in self.patterns:
+            if best is not None and (length, allowed) <= best[:2]:
+                break
+            if match(path):
+                best = (length, allowed, pattern)
+                break
+        if best is None:
+            return True, None
+        return best[1], ('Allow: ' if best[1] else 'Disallow: ') + best[2]
+
+
+class RobotsTxt:
+    """A parsed robots.txt file."""
+
+    def __init__(self, groups=None, sitemaps=(), status=200, disallow_all=False):
+        self.groups = groups or {}      # user-agent token -> [(allowed, pattern)]
+        self.sitemaps = list(sitemaps)
+        self.status = status            # HTTP status of the fetch (0: network error)
+        self.disallow_all = disallow_all
+        self._matchers = {}
+
+    @classmethod
+    def parse(cls, text, status=200):
+        """Parses robots.txt content (lines after MAX_ROBOTS_BYTES are ignored)."""
+        groups, sitemaps = {}, []
+        agents, in_rules = [], False
+        for line in text[:MAX_ROBOTS_BYTES].splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            key, value = (part.strip() for part in line.split(':', 1))
+            key = key.lower().replace(' ', '-')
+            if key in ('user-agent', 'useragent'):
+                if in_rules:        # A user-agent line after rules starts a new group
+                    agents, in_rules = [], False
+                token = '*' if value.startswith('*') else (_TOKEN_RE.match(value) or [''])[0].lower()
+                if token:
+                    agents.append(token)
+                    groups.setdefault(token, [])
+            elif key in ('allow', 'disallow'):
+                in_rules = True
+                if not value or not agents:
+                    continue        # Empty rules match nothing; rules before any user-agent are ignored
+                if not value.startswith(('/', '*')):
+                    value = '/' + value
+                for token in agents:
+                    groups[token].append((key == 'allow', _normalize(value)))
+            elif key == 'sitemap' and value:
+                sitemaps.append(value)
+        return cls(groups, sitemaps, status=status)
+
+    def matcher(self, user_agent):
+        """The compiled group that applies to `user_agent` (its own group, else "*")."""
+        token = (_TOKEN_RE.match(user_agent) or [''])[0].lower()
+        if token not in self._matchers:
+            rules = self.groups.get(token, self.groups.get('*', []))
+            self._matchers[token] = RuleMatcher(rules)
+        return self._matchers[token]
+
+    def verdict(self, url, user_agent=GOOGLEBOT):
+        """Returns (allowed, rule) for a URL; rule is the deciding line, or None."""
+        if self.disallow_all:
+            return False, f'robots.txt unavailable (status {self.status or "error"}): whole site disallowed'
+        path = url_path(url)
+        if path == '/robots.txt':
+            return True, None
+        return self.matcher(user_agent).match(path)
+
+    def allowed(self, url, user_agent=GOOGLEBOT):
+        return self.verdict(url, user_agent)[0]
+
+
+class RobotsCache:
+    """
+    robots.txt per host (scheme://host:port), fetched on first use through
+    `session` and kept for `ttl` seconds. Safe to share between threads;
+    concurrent requests for the same host wait for a single fetch.
+    """
+
+    def __init__(self, session, ttl=DEFAULT_TTL, timeout=10):
+        self.session = session
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries = {}          # origin -> (expires at, RobotsTxt)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, origin):
+        """Downloads and parses origin/robots.txt, applying Google's status handling."""
+        import requests
+        from seokit.fetch import request_with_redirects
+        try:
+            response, _ = request_with_redirects(self.session, origin + '/robots.txt', timeout=self.timeout,
+                                                 max_redirects=MAX_ROBOTS_REDIRECTS)
+        except requests.RequestException:
+            return RobotsTxt(status=0, disallow_all=True)
+        try:
+            status = response.status_code
+            if status >= 500 or status == 429:
+                return RobotsTxt(status=status, disallow_all=True)
+            if status >= 400:
+                return RobotsTxt(status=status)
+            body = b''
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                body += chunk
+                if len(body) >= MAX_ROBOTS_BYTES:
+                    break
+            return RobotsTxt.parse(body[:MAX_ROBOTS_BYTES].decode('utf-8', 'replace'), status=status)
+        except requests.RequestException:
+            return RobotsTxt(status=0, disallow_all=True)
+        finally:
+            response.close()
+
+    def for_url(self, url):
+        """The RobotsTxt governing `url` (fetched now if missing or expired)."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc.lower()}"
+        entry = self._entries.get(origin)
+        if entry and entry[0] > time.monotonic():
+            CACHE_REQUESTS.inc('robots', 'hit')
+            return entry[1]
+        CACHE_REQUESTS.inc('robots', 'miss')
+        with self._lock:
+            lock = self._locks.setdefault(origin, threading.Lock())
+        with lock:
+            entry = self._entries.get(origin)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            robots = self.fetch(origin)
+            ttl = min(self.ttl, ERROR_TTL) if robots.disallow_all else self.ttl
+            self._entries[origin] = (time.monotonic() + ttl, robots)
+            return robots
+
+    def verdict(self, url, user_agent=GOOGLEBOT):
+        return self.for_url(url).verdict(url, user_agent)
+
+    def allowed(self, url, user_agent=GOOGLEBOT):
+        return self.for_url(url).verdict(url, user_agent)[0]
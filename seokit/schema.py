@@ -0,0 +1,153 @@
+"""
+Shared schema.org (JSON-LD) registry.
+
+Every supported type declares the properties Google requires for Rich
+Results, the recommended (optional) properties, and optionally a builder
+used by seo-html-generator.py to emit the markup. seo-checker.py compiles
+the same registry into validators, so the generator and the checker can
+never disagree about what a "complete" schema looks like.
+"""
+
+# --- REGISTRY ---
+# Maps schema type -> {'required': tuple, 'optional': tuple, 'builder': callable or None}
+SCHEMA_REGISTRY = {}
+
+
+def register_schema_type(schema_type, required=(), optional=(), builder=None):
+    """
+    Adds (or replaces) a schema type in the shared registry.
+
+    `builder(v, today)` receives the generator settings dictionary and the
+    current date (YYYY-MM-DD) and returns the JSON-LD object without its
+    @context. It may raise ValueError with a user-facing message when the
+    settings are insufficient to build the schema.
+    """
+    SCHEMA_REGISTRY[schema_type] = {
+        'required': tuple(required),
+        'optional': tuple(optional),
+        'builder': builder,
+    }
+
+
+def required_properties():
+    """Returns {schema_type: [required properties]} for every registered type."""
+    return {name: list(spec['required']) for name, spec in SCHEMA_REGISTRY.items() if spec['required']}
+
+
+def buildable_schema_types():
+    """Returns the schema types the generator can emit, in registration order."""
+    return [name for name, spec in SCHEMA_REGISTRY.items() if spec['builder']]
+
+
+def build_json_ld(schema_type, v, today):
+    """Builds a complete JSON-LD object (including @context) for the given type."""
+    spec = SCHEMA_REGISTRY.get(schema_type)
+    if not spec or not spec['builder']:
+        raise KeyError(schema_type)
+    data = {"@context": "https://schema.org"}
+    data.update(spec['builder'](v, today))
+    return data
+
+
+# ----------------------------------------------------------------------
+# VALIDATION (Used by seo-checker.py)
+# ----------------------------------------------------------------------
+
+def _compile_validator(required):
+    """Returns a closure that lists the required properties missing (or empty) on an object."""
+    if not required:
+        return lambda obj: []
+
+    def validate(obj):
+        get = obj.get
+        return [prop for prop in required if not get(prop)]
+
+    return validate
+
+
+def compile_validators(registry=None):
+    """
+    Compiles the registry into {schema_type: validator}. Only types with
+    required properties get a validator; everything else is informational.
+    """
+    registry = SCHEMA_REGISTRY if registry is None else registry
+    return {name: _compile_validator(spec['required']) for name, spec in registry.items() if spec['required']}
+
+
+# ----------------------------------------------------------------------
+# BUILDERS (Used by seo-html-generator.py)
+# ----------------------------------------------------------------------
+
+def _build_article(schema_type):
+    def build(v, today):
+        return {
+            "@type": schema_type,
+            "headline": v['title'],
+            "alternativeHeadline": "A generic headline for the demo tech article.",
+            "articleBody": v['description'],
+            "articleSection": ["Introduction", "Key Concepts", "Conclusion"],
+            "keywords": v['keywords'],
+            "datePublished": today,
+            "dateModified": today,
+            "url": v['site_url'],
+            "image": v['json_ld_logo'],
+            "author": {
+                "@type": "Person",
+                "name": v['author']
+            },
+            "publisher": {
+                "@type": "Organization",
+                "name": v['json_ld_name'],
+                "email": "info@example.com",
+                "logo": {
+                    "@type": "ImageObject",
+                    "url": v['json_ld_logo']
+                }
+            },
+            "mainEntityOfPage": {
+                "@type": "WebPage",
+                "@id": v['site_url']
+            }
+        }
+    return build
+
+
+def _build_faq_page(v, today):
+    if not v.get('faq_pairs'):
+        raise ValueError("FAQPage schema selected, but no Q&A pairs were added. The generated schema will be empty.")
+
+    faq_list = []
+    for pair in v['faq_pairs']:
+        faq_list.append({
+            "@type": "Question",
+            "name": pair['question'],
+            "acceptedAnswer": {
+                "@type": "Answer",
+                "text": pair['answer']
+            }
+        })
+
+    return {
+        "@type": "FAQPage",
+        "headline": v['title'],
+        "url": v['site_url'],
+        "mainEntity": faq_list
+    }
+
+
+# --- DEFAULT TYPES (Simplified Google set) ---
+ARTICLE_OPTIONAL = ("author", "publisher", "dateModified", "url", "mainEntityOfPage", "keywords",
+                    "articleBody", "articleSection", "alternativeHeadline")
+
+register_schema_type("TechArticle", ["headline", "image", "datePublished"], ARTICLE_OPTIONAL, _build_article("TechArticle"))
+register_schema_type("FAQPage", ["mainEntity"], ["headline", "url"], _build_faq_page)
+register_schema_type("Article", ["headline", "image", "datePublished"], ARTICLE_OPTIONAL, _build_article("Article"))
+register_schema_type("NewsArticle", ["headline", "image", "datePublished", "dateModified"],
+                     [p for p in ARTICLE_OPTIONAL if p != "dateModified"], _build_article("NewsArticle"))
+register_schema_type("Product", ["name", "image", "description", "offers"],
+                     ["brand", "sku", "gtin", "aggregateRating", "review"])
+register_schema_type("Recipe", ["name", "image", "description", "aggregateRating", "recipeIngredient"],
+                     ["author", "prepTime", "cookTime", "totalTime", "recipeYield", "recipeInstructions", "nutrition"])
+# Nested entities Google checks inside FAQPage
+register_schema_type("Question", ["name", "acceptedAnswer"])
+register_schema_type("Answer", ["text"])
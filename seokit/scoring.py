@@ -0,0 +1,308 @@
+"""
+Declarative scoring rules.
+
+A ruleset is plain data (a dict, or a JSON/YAML file) describing how the
+per-page facts produced by seo-checker.py turn into a score:
+
+    {
+      "max_score": 100,
+      "grading_scale": {"95": "A+", "90": "A", ..., "0": "F"},
+      "params": {"max_title_chars": 60},
+      "rules": [
+        {"id": "Canonical_Present", "weight": 20, "severity": "critical",
+         "when": {"field": "canonical", "op": "present"}},
+        {"id": "Title_Optimal", "weight": 15,
+         "when": {"all": [{"field": "title_length", "op": ">", "value": 0},
+                          {"field": "title_length", "op": "<=", "value": "$max_title_chars"}]},
+         "partial": [{"when": {"field": "title_length", "op": ">", "value": "$max_title_chars"}, "credit": 0.5}]},
+        {"id": "Schema_Valid", "weight": 15,
+         "ratio": {"numerator": "schema_valid", "denominator": "schema_checked", "empty": 0}}
+      ],
+      "site_penalties": {"Duplicate_Title": 5}
+    }
+
+Values starting with "$" refer to "params". Predicates support the
+operators in OPERATORS plus "all", "any" and "not" combinators. A rule
+either has "when" (full credit when true, optional "partial" credits
+otherwise) or "ratio" (credit = numerator / denominator, "invert" for
+1 - ratio, "empty" when the denominator is 0). Rules with "penalty": true
+deduct their weight when the predicate holds and do not count towards the
+maximum.
+
+compile_ruleset() turns the data into closures once; CompiledRuleset.score()
+scores one facts dictionary and score_columns() scores whole column arrays
+(NumPy) in one pass.
+"""
+
+import json
+import operator
+
+# Comparison operators usable in predicates: name -> (scalar function, takes a value)
+OPERATORS = {
+    'present': (bool, False),
+    'absent': (lambda x: not x, False),
+    'true': (bool, False),
+    'false': (lambda x: not x, False),
+    '==': (operator.eq, True),
+    '!=': (operator.ne, True),
+    '>': (operator.gt, True),
+    '>=': (operator.ge, True),
+    '<': (operator.lt, True),
+    '<=': (operator.le, True),
+    'contains': (lambda x, v: v in str(x).lower(), True),
+    'not_contains': (lambda x, v: v not in str(x).lower(), True),
+}
+
+SEVERITIES = ('critical', 'warning', 'info')
+
+
+class RulesetError(ValueError):
+    """Raised for malformed rulesets, with the offending rule in the message."""
+
+
+def load_ruleset(path):
+    """Reads a ruleset from a .json, .yaml or .yml file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml # Optional: pip install pyyaml
+            except ImportError:
+                raise RulesetError("YAML rulesets require PyYAML. Install it with: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _param(value, params, rule_id):
+    if isinstance(value, str) and value.startswith('$'):
+        try:
+            return params[value[1:]]
+        except KeyError:
+            raise RulesetError(f"Rule '{rule_id}': unknown parameter '{value}'.")
+    return value
+
+
+def _compile_predicate(spec, params, rule_id):
+    """Returns (scalar closure over a facts dict, vector closure over a columns dict)."""
+    if 'all' in spec or 'any' in spec:
+        combine_all = 'all' in spec
+        parts = [_compile_predicate(part, params, rule_id) for part in spec['all' if combine_all else 'any']]
+        scalars = [p[0] for p in parts]
+        vectors = [p[1] for p in parts]
+        if combine_all:
+            def scalar(facts):
+                return all(check(facts) for check in scalars)
+
+            def vector(columns, np):
+                result = vectors[0](columns, np)
+                for check in vectors[1:]:
+                    result = result & check(columns, np)
+                return result
+        else:
+            def scalar(facts):
+                return any(check(facts) for check in scalars)
+
+            def vector(columns, np):
+                result = vectors[0](columns, np)
+                for check in vectors[1:]:
+                    result = result | check(columns, np)
+                return result
+        return scalar, vector
+
+    if 'not' in spec:
+        inner_scalar, inner_vector = _compile_predicate(spec['not'], params, rule_id)
+        return (lambda facts: not inner_scalar(facts)), (lambda columns, np: ~inner_vector(columns, np))
+
+    field, op = spec.get('field'), spec.get('op')
+    if not field or op not in OPERATORS:
+        raise RulesetError(f"Rule '{rule_id}': predicate needs a 'field' and an 'op' from {sorted(OPERATORS)}.")
+    function, takes_value = OPERATORS[op]
+    if takes_value:
+        value = _param(spec.get('value'), params, rule_id)
+        if isinstance(value, str) and op in ('contains', 'not_contains'):
+            value = value.lower()
+
+        def scalar(facts):
+            return function(facts.get(field), value)
+
+        if op in ('contains', 'not_contains'):
+            def vector(columns, np):
+                return np.array([function(x, value) for x in columns[field]], dtype=bool)
+        else:
+            def vector(columns, np):
+                return np.asarray(function(columns[field], value), dtype=bool)
+    else:
+        def scalar(facts):
+            return function(facts.get(field))
+
+        def vector(columns, np):
+            column = columns[field]
+            if column.dtype.kind in 'US':
+                truthy = np.char.str_len(column) > 0
+            else:
+                truthy = column.astype(bool)
+            return truthy if op in ('present', 'true') else ~truthy
+    return scalar, vector
+
+
+def _predicate_fields(spec):
+    """Fact names a predicate reads."""
+    if 'all' in spec or 'any' in spec:
+        return set().union(*(_predicate_fields(part) for part in spec.get('all') or spec.get('any')))
+    if 'not' in spec:
+        return _predicate_fields(spec['not'])
+    return {spec['field']}
+
+
+def _rule_fields(rule):
+    if 'ratio' in rule:
+        return {rule['ratio']['numerator'], rule['ratio']['denominator']}
+    fields = _predicate_fields(rule['when'])
+    for partial in rule.get('partial', []):
+        fields |= _predicate_fields(partial['when'])
+    return fields
+
+
+def _compile_rule(rule, params):
+    rule_id = rule.get('id') or '?'
+    weight = float(_param(rule.get('weight', 0), params, rule_id))
+    severity = rule.get('severity', 'warning')
+    if severity not in SEVERITIES:
+        raise RulesetError(f"Rule '{rule_id}': severity must be one of {SEVERITIES}.")
+
+    if 'ratio' in rule:
+        ratio = rule['ratio']
+        numerator, denominator = ratio.get('numerator'), ratio.get('denominator')
+        if not numerator or not denominator:
+            raise RulesetError(f"Rule '{rule_id}': 'ratio' needs 'numerator' and 'denominator' fields.")
+        invert, empty = bool(ratio.get('invert')), float(ratio.get('empty', 0))
+
+        def credit(facts):
+            total = facts.get(denominator) or 0
+            if total <= 0:
+                return empty
+            value = (facts.get(numerator) or 0) / total
+            return 1 - value if invert else value
+
+        def credit_vector(columns, np):
+            total = columns[denominator].astype(float)
+            safe = np.where(total > 0, total, 1.0)
+            value = columns[numerator].astype(float) / safe
+            if invert:
+                value = 1 - value
+            return np.where(total > 0, value, empty)
+    else:
+        if 'when' not in rule:
+            raise RulesetError(f"Rule '{rule_id}': needs either 'when' or 'ratio'.")
+        full_scalar, full_vector = _compile_predicate(rule['when'], params, rule_id)
+        partials = [(_compile_predicate(p['when'], params, rule_id), float(p.get('credit', 0.5)))
+                    for p in rule.get('partial', [])]
+
+        def credit(facts):
+            if full_scalar(facts):
+                return 1.0
+            for (check, _), partial_credit in partials:
+                if check(facts):
+                    return partial_credit
+            return 0.0
+
+        def credit_vector(columns, np):
+            # Evaluate in reverse so earlier (higher-priority) branches overwrite later ones
+            result = None
+            for (_, check), partial_credit in reversed(partials):
+                mask = check(columns, np)
+                result = np.where(mask, partial_credit, 0.0 if result is None else result)
+            full = full_vector(columns, np)
+            return np.where(full, 1.0, 0.0 if result is None else result)
+
+    return {
+        'id': rule_id,
+        'weight': weight,
+        'severity': severity,
+        'penalty': bool(rule.get('penalty')),
+        'credit': credit,
+        'credit_vector': credit_vector,
+    }
+
+
+class CompiledRuleset:
+    """A ruleset compiled into a flat list of closures."""
+
+    def __init__(self, ruleset, known_fields=None):
+        params = ruleset.get('params', {})
+        self.source = ruleset
+        self.params = params
+        self.rules = [_compile_rule(rule, params) for rule in ruleset.get('rules', [])]
+        if known_fields is not None:
+            for rule in ruleset.get('rules', []):
+                unknown = sorted(_rule_fields(rule) - set(known_fields))
+                if unknown:
+                    raise RulesetError(f"Rule '{rule.get('id') or '?'}': unknown fact field(s) {', '.join(unknown)}; "
+                                       f"available: {', '.join(sorted(known_fields))}.")
+        # Facts read by at least one rule (lets callers load only those columns)
+        self.fields = set().union(*(_rule_fields(rule) for rule in ruleset.get('rules', [])))
+        self.max_score = float(ruleset.get('max_score') or sum(r['weight'] for r in self.rules if not r['penalty']) or 100)
+        # Sorted once: [(threshold, grade)] highest first
+        scale = ruleset.get('grading_scale') or {0: 'F'}
+        self.grading = sorted(((float(k), v) for k, v in scale.items()), reverse=True)
+        self.site_penalties = dict(ruleset.get('site_penalties', {}))
+
+    def grade(self, percentage):
+        for threshold, grade in self.grading:
+            if percentage >= threshold:
+                return grade
+        return 'N/A'
+
+    def failed_rules(self, facts):
+        """Rule ids that earned less than full credit (or penalties that fired)."""
+        failed = []
+        for rule in self.rules:
+            credit = rule['credit'](facts)
+            if (rule['penalty'] and credit) or (not rule['penalty'] and credit < 1):
+                failed.append(rule['id'])
+        return failed
+
+    def score(self, facts):
+        """Scores one facts dictionary. Returns (percentage, letter grade)."""
+        points = 0.0
+        for rule in self.rules:
+            credit = rule['credit'](facts)
+            points += -rule['weight'] * credit if rule['penalty'] else rule['weight'] * credit
+        percentage = max(round((points / self.max_score) * 100), 0)
+        return percentage, self.grade(percentage)
+
+    def score_columns(self, columns):
+        """
+        Scores many pages at once. `columns` maps fact names to equal-length
+        NumPy arrays. Returns (percentages int array, grades array).
+        """
+        import numpy as np
+        length = len(next(iter(columns.values()))) if columns else 0
+        points = np.zeros(length)
+        for rule in self.rules:
+            credit = rule['credit_vector'](columns, np)
+            points = points - rule['weight'] * credit if rule['penalty'] else points + rule['weight'] * credit
+        percentages = np.maximum(np.rint((points / self.max_score) * 100), 0).astype(np.int64)
+        return percentages, self.grade_columns(percentages)
+
+    def grade_columns(self, percentages):
+        """Vectorized grade lookup for an integer percentage array."""
+        import numpy as np
+        thresholds = np.array([t for t, _ in reversed(self.grading)])    # ascending
+        grades = np.array([g for _, g in reversed(self.grading)] + ['N/A'])
+        positions = np.searchsorted(thresholds, percentages, side='right') - 1
+        return np.where(positions >= 0, grades[np.clip(positions, 0, None)], grades[-1])
+
+    def apply_site_penalties(self, percentage, findings):
+        """Deducts the ruleset's site penalties for each finding name. Returns (percentage, grade)."""
+        adjusted = max(percentage - sum(self.site_penalties.get(name, 0) for name in findings), 0)
+        return adjusted, self.grade(adjusted)
+
+
+def compile_ruleset(ruleset, known_fields=None):
+    """
+    Validates and compiles a ruleset dictionary. With `known_fields` (the
+    fact names pages provide), rules reading any other field are rejected.
+    """
+    if not isinstance(ruleset, dict) or not isinstance(ruleset.get('rules'), list):
+        raise RulesetError("A ruleset must be a mapping with a 'rules' list.")
+    return CompiledRuleset(ruleset, known_fields)
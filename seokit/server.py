@@ -0,0 +1,222 @@
+"""
+Long-lived audit server: one warm process pool answering many audit
+requests over localhost HTTP or a Unix socket, so callers such as a CMS
+publish hook pay neither interpreter startup nor parser warm-up per page.
+
+    POST /audit                     body: the HTML (text/html), or JSON
+                                    {"html": ..., "url": ..., "head_only": true}
+    POST /audit?url=https://...     the server fetches the page itself
+    GET  /health                    {"status": "ok", "workers": n, "pending": n}
+    GET  /metrics                   Prometheus text format (server and workers)
+
+Audits run in a process pool (parsing is CPU-bound, so threads would queue
+on the GIL); each worker is warmed up by the initializer and keeps its own
+HTTP session and caches across requests. Connections are handled by
+threads and kept alive (HTTP/1.1). At most `max_pending` audits are queued
+or running; beyond that requests are answered 503 at once instead of piling
+up. The audit callable receives the request dict and returns (HTTP status,
+JSON-serializable payload); it must be picklable (a module-level function).
+Workers send their metric changes (fetches, cache hits, parse timings, ...)
+back with every result, so /metrics covers the audits as well.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from seokit.fetch import detect_charset
+from seokit.metrics import QUEUE_DEPTH, collect_delta, counter, histogram, merge_delta, render
+
+DEFAULT_PORT = 8731
+MAX_BODY_BYTES = 5 * 1024 * 1024
+PENDING_PER_WORKER = 8          # Queued + running audits allowed per worker before answering 503
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+REQUESTS_METRIC = counter('seokit_serve_requests_total', 'Audit server requests, by endpoint and HTTP status.', ('endpoint', 'status'))
+REQUEST_SECONDS_METRIC = histogram('seokit_serve_request_seconds', 'Audit server time per /audit request (queueing included).')
+
+
+class ServeError(Exception):
+    """A request the server answers with an error status instead of an audit."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_audit_request(path, content_type, body):
+    """
+    Builds the audit request dict ({'html', 'url', 'head_only'}) from the
+    query string and body of a /audit request. Raises ServeError (400).
+    """
+    query = {key: values[-1] for key, values in parse_qs(urlsplit(path).query).items()}
+    request = {'html': None, 'url': query.get('url'), 'head_only': query.get('head_only', '').lower() in TRUE_VALUES}
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if body and media_type == 'application/json':
+        try:
+            fields = json.loads(body)
+        except ValueError as e:
+            raise ServeError(400, f"Invalid JSON body ({e})")
+        if not isinstance(fields, dict):
+            raise ServeError(400, "The JSON body must be an object")
+        for name in ('html', 'url'):
+            if fields.get(name) is not None and not isinstance(fields[name], str):
+                raise ServeError(400, f"'{name}' must be a string")
+        request['html'] = fields.get('html')
+        request['url'] = fields.get('url') or request['url']
+        request['head_only'] = bool(fields.get('head_only', request['head_only']))
+    elif body:
+        request['html'] = body.decode(detect_charset(content_type, body), errors='replace')
+    if request['html'] is None and not request['url']:
+        raise ServeError(400, "Send the HTML as the request body, or a url to fetch")
+    if request['html'] is None and not request['url'].startswith(('http://', 'https://')):
+        raise ServeError(400, "Only http(s) URLs can be fetched")
+    return request
+
+
+def _init_worker(initializer, initargs):
+    """Process pool initializer: runs the caller's initializer, then drops the metrics of its warm-up."""
+    if initializer:
+        initializer(*initargs)
+    collect_delta()
+
+
+def _audit_in_worker(audit, request):
+    """Runs one audit in a worker process. Returns (status, payload, metric changes since the previous audit)."""
+    status, payload = audit(request)
+    return status, payload, collect_delta()
+
+
+class AuditServer:
+    def __init__(self, audit, workers=None, initializer=None, initargs=(), max_pending=None, max_body_bytes=MAX_BODY_BYTES):
+        from concurrent.futures import ProcessPoolExecutor
+        self.audit = audit
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.max_body_bytes = max_body_bytes
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(initializer, initargs))
+        self.httpd = None
+        self.address = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """
+        Starts every worker process now (running the initializer) instead of
+        on the first requests. Call it before bind(), so the workers do not
+        inherit the listening socket.
+        """
+        from concurrent.futures import wait
+        wait([self.executor.submit(time.sleep, 0.05) for _ in range(self.workers)])
+
+    def _track(self, change):
+        with self._lock:
+            self._pending += change
+            QUEUE_DEPTH.set(self._pending, 'serve')
+
+    def run_audit(self, request):
+        """Runs one audit in the pool. Returns (status, payload); 503 when max_pending audits are in flight."""
+        if not self._slots.acquire(blocking=False):
+            return 503, {'error': f"Server busy ({self.max_pending} audits pending), retry later"}
+        self._track(1)
+        try:
+            status, payload, metric_changes = self.executor.submit(_audit_in_worker, self.audit, request).result()
+            merge_delta(metric_changes)
+            return status, payload
+        except Exception as e:              # A worker died or the payload could not be pickled
+            return 500, {'error': f"Audit failed ({e})"}
+        finally:
+            self._track(-1)
+            self._slots.release()
+
+    def health(self):
+        return {'status': 'ok', 'workers': self.workers, 'pending': self._pending, 'max_pending': self.max_pending}
+
+    def _handler(self, tcp=True):
+        from http.server import BaseHTTPRequestHandler
+        server = self
+
+        class AuditHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # Keep-alive: one connection serves many audits
+            disable_nagle_algorithm = tcp   # Headers and body are separate writes: don't hold the body for an ACK
+
+            def _reply(self, endpoint, status, payload, content_type='application/json'):
+                body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type + '; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                REQUESTS_METRIC.inc(endpoint, str(status))
+
+            def do_GET(self):
+                endpoint = urlsplit(self.path).path
+                if endpoint == '/health':
+                    self._reply(endpoint, 200, server.health())
+                elif endpoint == '/metrics':
+                    self._reply(endpoint, 200, render().encode('utf-8'), 'text/plain; version=0.0.4')
+                elif endpoint == '/audit':
+                    self._audit(b'')
+                else:
+                    self._reply('other', 404, {'error': f"Unknown endpoint {endpoint}"})
+
+            def do_POST(self):
+                if urlsplit(self.path).path != '/audit':
+                    self._reply('other', 404, {'error': "POST to /audit"})
+                    return
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > server.max_body_bytes:
+                    self.close_connection = True    # The unread body cannot be skipped
+                    self._reply('/audit', 413, {'error': f"Body exceeds {server.max_body_bytes} bytes"})
+                    return
+                self._audit(self.rfile.read(length) if length else b'')
+
+            def _audit(self, body):
+                started = time.perf_counter()
+                try:
+                    request = parse_audit_request(self.path, self.headers.get('Content-Type'), body)
+                except ServeError as e:
+                    self._reply('/audit', e.status, {'error': str(e)})
+                    return
+                status, payload = server.run_audit(request)
+                REQUEST_SECONDS_METRIC.observe(time.perf_counter() - started)
+                self._reply('/audit', status, payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return AuditHandler
+
+    def bind(self, port=DEFAULT_PORT, host='127.0.0.1', socket_path=None):
+        """Binds to a Unix socket (socket_path) or host:port. Returns the address callers should use."""
+        import socketserver
+        from http.server import ThreadingHTTPServer
+        if socket_path:
+            if not hasattr(socketserver, 'UnixStreamServer'):
+                raise OSError("Unix sockets are not available on this platform; use a port instead")
+
+            class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+                daemon_threads = True
+
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)      # Left behind by a server that did not shut down cleanly
+            self.httpd = UnixHTTPServer(socket_path, self._handler(tcp=False))
+            self.address = f"unix:{socket_path}"
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), self._handler())
+            self.httpd.daemon_threads = True
+            self.address = f"http://{host}:{self.httpd.server_address[1]}"
+        return self.address
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def close(self):
+        if self.httpd:
+            self.httpd.server_close()
+            if self.address.startswith('unix:') and os.path.exists(self.address[5:]):
+                os.unlink(self.address[5:])
+        self.executor.shutdown(cancel_futures=True)
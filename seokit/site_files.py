@@ -0,0 +1,253 @@
+"""
+Local static-site builds: the directory walker shared by sitemap-generator.py
+and `seo-checker.py audit --dir`, a read-ahead pool for the files, and the
+manifest that makes repeated directory audits incremental.
+
+The manifest (SQLite) keeps, per file path relative to the site root, the
+size, mtime and content digest seen at the last audit together with the page
+record and raw links it produced. A file whose size and mtime are unchanged
+is not even opened; one with a new mtime but the same size is read and
+hashed, and reused if its content is unchanged (static site generators
+rewrite every file on each build). Only new or edited pages are parsed.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+
+from seokit.fetch import SNIFF_BYTES, decode_head, detect_charset
+
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', 'tmp', 'temp', 'logs'}
+HTML_EXTENSIONS = ('.html', '.htm')
+READ_WORKERS = 8
+READ_AHEAD = 64             # Files read (or checked) ahead of the page being audited
+BATCH_SIZE = 5000
+MMAP_THRESHOLD = 256 * 1024     # Smaller files are cheaper to read() than to map
+LEGACY_ENCODING = 'cp1252'      # What browsers assume for undeclared pages that are not valid UTF-8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name    TEXT PRIMARY KEY,
+    value   TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    digest      TEXT NOT NULL,
+    record      TEXT NOT NULL,
+    links       TEXT NOT NULL
+);
+"""
+
+
+def iter_site_files(root_folder, extensions, skip_dirs=SKIP_DIRS):
+    """
+    Walks a site directory like os.walk (top-down, files before
+    subdirectories, SKIP_DIRS pruned, symlinked directories not followed)
+    and yields (file path, path relative to the root with forward slashes)
+    for every file with one of the given extensions (case-insensitive).
+    """
+    stack = [(root_folder, '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as scan:
+                entries = list(scan)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name not in skip_dirs and not entry.is_symlink():
+                    subdirectories.append((entry.path, prefix + entry.name + '/'))
+            elif entry.name.lower().endswith(extensions):
+                yield entry.path, prefix + entry.name
+        stack.extend(reversed(subdirectories))
+
+
+def file_digest(content):
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _decode(content, head_only):
+    """
+    Decodes file content (bytes or mmap): BOM or <meta charset> in the first
+    bytes, else UTF-8, else LEGACY_ENCODING. Returns (text, encoding).
+    """
+    declared = detect_charset(None, content[:SNIFF_BYTES], default=None)
+    attempts = [(declared, 'replace')] if declared else [('utf-8', 'strict'), (LEGACY_ENCODING, 'replace')]
+    for encoding, errors in attempts:
+        try:
+            if head_only:
+                text = decode_head(content, encoding, errors)[0]
+            else:
+                with memoryview(content) as view:   # Decoded straight from the mapping, no bytes copy
+                    text = str(view, encoding, errors)
+            break
+        except UnicodeDecodeError:
+            continue
+    if '\r' in text:                                # Universal newlines, as open() in text mode
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, encoding
+
+
+def read_html_file(file_path, head_only=False):
+    """
+    Reads and decodes a local HTML file. Returns (text, encoding). Large
+    files are memory-mapped; with head_only only the head is decoded.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return _decode(f.read(), head_only)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _decode(mapped, head_only)
+
+
+class LocalPage:
+    """One local file as loaded by read_local_page(): unchanged (cached) or read and decoded."""
+
+    __slots__ = ('path', 'key', 'size', 'mtime_ns', 'digest', 'html', 'encoding', 'cached', 'error')
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.size = self.mtime_ns = 0
+        self.digest = None
+        self.html = None
+        self.encoding = None
+        self.cached = False
+        self.error = None
+
+
+def read_local_page(file_path, key=None, known=None, head_only=False):
+    """
+    Stats and reads one local HTML file (see read_html_file). With a
+    manifest `key`, the content digest is computed too, and with `known`
+    (size, mtime_ns, digest) from the manifest an unchanged file is marked
+    cached instead: it is not opened when size and mtime match, and not
+    decoded when only the mtime differs but the digest matches. Errors are
+    kept in page.error.
+    """
+    page = LocalPage(file_path, key)
+    try:
+        stat = os.stat(file_path)
+        page.size, page.mtime_ns = stat.st_size, stat.st_mtime_ns
+        if known and known[:2] == (page.size, page.mtime_ns):
+            page.digest, page.cached = known[2], True
+            return page
+        if key is None:
+            page.html, page.encoding = read_html_file(file_path, head_only=head_only)
+            return page
+        with open(file_path, 'rb') as f:
+            content = f.read() if page.size < MMAP_THRESHOLD else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            page.digest = file_digest(content)
+            if known and known[0] == page.size and known[2] == page.digest:
+                page.cached = True
+                return page
+            page.html, page.encoding = _decode(content, head_only)
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+    except (OSError, ValueError) as e:
+        page.error = str(e)
+    return page
+
+
+class AuditManifest:
+    """
+    Per-file results of the previous directory audit. `fingerprint`
+    identifies everything besides the file that affects a page record (tool
+    version, scoring rules, head-only mode); when it changes, the stored
+    results are dropped and every page is audited again.
+    """
+
+    def __init__(self, path, root, fingerprint):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        row = self.connection.execute("SELECT value FROM settings WHERE name = 'fingerprint'").fetchone()
+        if not row or row[0] != fingerprint:
+            with self.connection:
+                self.connection.execute("DELETE FROM files")
+                self.connection.execute("INSERT OR REPLACE INTO settings (name, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        # Only the change-detection columns are held in memory; records are read on a hit
+        self.known = {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest
+                      in self.connection.execute("SELECT path, size, mtime_ns, digest FROM files")}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self._pending = []
+
+    def key_for(self, file_path):
+        """Manifest key of a file: its path relative to the root, with forward slashes."""
+        return os.path.relpath(os.path.abspath(file_path), self.root).replace(os.path.sep, '/')
+
+    def load(self, file_path, head_only=False):
+        """read_local_page() against the stored state of the file. Thread-safe (no SQLite access)."""
+        key = self.key_for(file_path)
+        return read_local_page(file_path, key, self.known.get(key), head_only=head_only)
+
+    def cached_result(self, page):
+        """(page record, raw links) stored for an unchanged page."""
+        self.seen.add(page.key)
+        self.hits += 1
+        record, links = self.connection.execute("SELECT record, links FROM files WHERE path = ?", (page.key,)).fetchone()
+        if self.known[page.key][1] != page.mtime_ns:        # Same content, new mtime: skip the hash next time
+            self._pending.append((page.key, page.size, page.mtime_ns, page.digest, record, links))
+        return json.loads(record), json.loads(links)
+
+    def store(self, page, record, links):
+        """Buffers the result of a page that was audited in this run."""
+        self.seen.add(page.key)
+        self.misses += 1
+        self._pending.append((page.key, page.size, page.mtime_ns, page.digest,
+                              json.dumps(record, ensure_ascii=False), json.dumps(links, ensure_ascii=False)))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO files (path, size, mtime_ns, digest, record, links) "
+                                            "VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            self._pending = []
+
+    def close(self, prune=True):
+        """Writes the pending rows and, with `prune`, forgets files that were not seen in this run (deleted pages)."""
+        self.flush()
+        if prune:
+            stale = [(key,) for key in self.known if key not in self.seen]
+            with self.connection:
+                self.connection.executemany("DELETE FROM files WHERE path = ?", stale)
+        self.connection.close()
+
+
+def read_ahead(function, items, workers=READ_WORKERS, window=READ_AHEAD):
+    """
+    Yields (item, function(item)) in order while a thread pool works up to
+    `window` items ahead, so file I/O overlaps with the caller's parsing.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(function, item)))
+            if len(pending) >= window:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
@@ -0,0 +1,229 @@
+"""
+Cross-page duplicate index for bulk audits.
+
+Pages are added one at a time as the audit streams through a site. Exact
+duplicates (title, meta description, canonical) are found through hash maps
+keyed by the normalized text; near-duplicates are found with 64-bit SimHash
+fingerprints and LSH banding, so each page is only compared against the few
+pages that share a band with it instead of against every other page.
+"""
+
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4               # 4 bands of 16 bits: any pair within 3 bits shares at least one band
+NEAR_DUPLICATE_DISTANCE = 3     # Maximum Hamming distance between near-duplicate fingerprints
+MAX_BUCKET_SCAN = 64            # Caps candidate comparisons per band so very common buckets stay cheap
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def normalize_text(text):
+    """Case-folds and collapses whitespace so trivially different strings hash alike."""
+    return ' '.join((text or '').casefold().split())
+
+
+def normalize_url(url):
+    """Normalizes a URL for comparison: lower-case scheme/host, no fragment, no trailing slash."""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text):
+    """64-bit SimHash over word bigram shingles (single words for one-word texts)."""
+    words = _WORD_RE.findall(text)
+    if not words:
+        return 0
+    shingles = [f"{a} {b}" for a, b in zip(words, words[1:])] or words
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = _hash64(shingle)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SiteIndex:
+    """Collects title/description/canonical facts per page and reports site-wide duplicates."""
+
+    def __init__(self, near_duplicate_distance=NEAR_DUPLICATE_DISTANCE):
+        self.urls = []                  # page id -> URL as audited
+        self.titles = {}                # hash(normalized title) -> [page ids]
+        self.descriptions = {}          # hash(normalized description) -> [page ids]
+        self.canonicals = {}            # normalized canonical -> [page ids]
+        self.canonical_of = {}          # normalized page URL -> normalized canonical (only when different)
+        self.near_duplicates = []       # (page id, page id, distance)
+        self.near_duplicate_distance = near_duplicate_distance
+        self._bands = [dict() for _ in range(SIMHASH_BANDS)]   # band value -> [(page id, fingerprint)]
+        self._fingerprinted = set()     # hash(title + description) already inserted in the LSH buckets
+
+    def add_page(self, url, title, description, canonical):
+        """Adds one audited page. Empty values (missing tags) are ignored."""
+        page_id = len(self.urls)
+        self.urls.append(url)
+
+        title_key = normalize_text(title)
+        description_key = normalize_text(description)
+        if title_key:
+            self.titles.setdefault(_hash64(title_key), []).append(page_id)
+        if description_key:
+            self.descriptions.setdefault(_hash64(description_key), []).append(page_id)
+
+        canonical_key = normalize_url(canonical)
+        if canonical_key:
+            self.canonicals.setdefault(canonical_key, []).append(page_id)
+            page_key = normalize_url(url)
+            if canonical_key != page_key:
+                self.canonical_of[page_key] = canonical_key
+
+        combined = f"{title_key} | {description_key}".strip(' |')
+        if combined:
+            self._add_fingerprint(page_id, combined)
+        return page_id
+
+    def _add_fingerprint(self, page_id, combined):
+        """Near-duplicate lookup via LSH buckets; exact repeats are left to the exact maps."""
+        combined_hash = _hash64(combined)
+        if combined_hash in self._fingerprinted:
+            return
+        self._fingerprinted.add(combined_hash)
+
+        fingerprint = simhash(combined)
+        seen = set()
+        for band, buckets in enumerate(self._bands):
+            value = (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK
+            bucket = buckets.setdefault(value, [])
+            for other_id, other_fp in bucket[-MAX_BUCKET_SCAN:]:
+                if other_id in seen:
+                    continue
+                seen.add(other_id)
+                distance = bin(fingerprint ^ other_fp).count('1')
+                if distance <= self.near_duplicate_distance:
+                    self.near_duplicates.append((other_id, page_id, distance))
+            bucket.append((page_id, fingerprint))
+
+    # ------------------------------------------------------------------
+    # Site-level analysis
+    # ------------------------------------------------------------------
+
+    def duplicate_groups(self, field):
+        """Returns the page-id groups sharing one title ('title') or description ('description')."""
+        table = self.titles if field == 'title' else self.descriptions
+        return [ids for ids in table.values() if len(ids) > 1]
+
+    def canonical_chains(self):
+        """
+        Follows canonical targets across audited pages, resolving every URL once.
+
+        Returns (resolved, cycles): `resolved` maps each page URL whose canonical
+        points elsewhere to (final canonical, hops), with final None when the
+        chain runs into a loop; `cycles` lists the URLs forming each loop.
+        """
+        resolved, cycles = {}, []
+        for start in self.canonical_of:
+            if start in resolved:
+                continue
+            path, position = [], {}
+            node = start
+            while node in self.canonical_of and node not in resolved and node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = self.canonical_of[node]
+            if node in position:
+                cycles.append(path[position[node]:])
+                final, hops = None, 0
+            elif node in resolved:
+                final, hops = resolved[node]
+            else:
+                final, hops = node, 0
+            for offset, hop in enumerate(reversed(path), 1):
+                resolved[hop] = (final, hops + offset)
+        return resolved, cycles
+
+    def page_findings(self):
+        """Returns {page id: {finding: detail}} for every page affected by a site-level problem."""
+        findings = {}
+        for ids in self.duplicate_groups('title'):
+            for page_id in ids:
+                findings.setdefault(page_id, {})['Duplicate_Title'] = len(ids)
+        for ids in self.duplicate_groups('description'):
+            for page_id in ids:
+                findings.setdefault(page_id, {})['Duplicate_Description'] = len(ids)
+        for a, b, distance in self.near_duplicates:
+            for page_id in (a, b):
+                page = findings.setdefault(page_id, {})
+                page['Near_Duplicate'] = page.get('Near_Duplicate', 0) + 1
+
+        resolved, cycles = self.canonical_chains()
+        for page_id, url in enumerate(self.urls):
+            target = resolved.get(normalize_url(url))
+            if target is None:
+                continue
+            final, hops = target
+            if final is None:
+                findings.setdefault(page_id, {})['Canonical_Cycle'] = True
+            elif hops > 1:
+                findings.setdefault(page_id, {})['Canonical_Chain'] = hops
+        return findings
+
+    def duplicates_report(self, max_examples=5):
+        """Formats the site-wide duplicates report as a list of lines."""
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append("           S I T E - W I D E   D U P L I C A T E S   R E P O R T")
+        lines.append("="*70)
+        lines.append(f"  Pages indexed: {len(self.urls)}")
+
+        for field, label in (('title', '<title>'), ('description', 'Meta Description')):
+            groups = sorted(self.duplicate_groups(field), key=len, reverse=True)
+            lines.append(f"\n--- Duplicate {label} ({len(groups)} group(s)) ---")
+            if not groups:
+                lines.append("  ✅ No duplicates found.")
+            for ids in groups[:max_examples * 4]:
+                lines.append(f"  ⚠️ {len(ids)} pages share one {label}:")
+                for page_id in ids[:max_examples]:
+                    lines.append(f"     - {self.urls[page_id]}")
+                if len(ids) > max_examples:
+                    lines.append(f"     ... and {len(ids) - max_examples} more")
+
+        lines.append(f"\n--- Near-Duplicate Title + Description ({len(self.near_duplicates)} pair(s)) ---")
+        if not self.near_duplicates:
+            lines.append("  ✅ No near-duplicates found.")
+        for a, b, distance in self.near_duplicates[:max_examples * 4]:
+            lines.append(f"  ⚠️ {self.urls[a]}  ~  {self.urls[b]} (distance {distance})")
+
+        shared = sorted(((target, ids) for target, ids in self.canonicals.items() if len(ids) > 1),
+                        key=lambda item: len(item[1]), reverse=True)
+        lines.append(f"\n--- Shared Canonical Targets ({len(shared)}) ---")
+        if not shared:
+            lines.append("  (None Found)")
+        for target, ids in shared[:max_examples * 4]:
+            lines.append(f"  ℹ️ {len(ids)} pages canonicalize to {target}")
+
+        resolved, cycles = self.canonical_chains()
+        chains = sorted(((url, final, hops) for url, (final, hops) in resolved.items() if final is not None and hops > 1),
+                        key=lambda item: item[2], reverse=True)
+        lines.append(f"\n--- Canonical Chains ({len(chains)}) and Cycles ({len(cycles)}) ---")
+        if not chains and not cycles:
+            lines.append("  ✅ Every canonical points directly at a final URL.")
+        for url, final, hops in chains[:max_examples * 4]:
+            lines.append(f"  ⚠️ Chain ({hops} hops): {url} -> ... -> {final}")
+        for cycle in cycles[:max_examples * 4]:
+            lines.append(f"  ❌ Cycle: {' -> '.join(cycle + cycle[:1])}")
+        lines.append("="*70)
+        return lines
@@ -0,0 +1,321 @@
+"""
+Streaming sitemap reader and validator.
+
+Sitemaps and sitemap indexes (plain or gzip-compressed, local files or
+URLs) are parsed with ElementTree.iterparse; every <url> element is handed
+out as soon as it is complete and then cleared, so memory stays flat on
+multi-million-URL sitemaps (only a 64-bit hash per location is kept, to
+skip duplicates). Child sitemaps of an index are read one after another.
+
+Validation covers what sitemap-generator.py writes and what search engines
+enforce: 50,000 URLs and 50 MB (uncompressed) per file, absolute <loc>
+values on the sitemap's host, W3C datetime <lastmod>, <changefreq> and
+<priority> values, duplicate locations and nested indexes. check_page()
+adds the findings that need the page itself (noindex, canonicalized
+elsewhere, redirects, errors) during a bulk audit.
+"""
+
+import gzip
+import re
+from collections import Counter
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+import xml.etree.ElementTree as ET
+
+from seokit import metrics
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+MAX_URLS_PER_SITEMAP = 50000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+MAX_LOC_CHARS = 2048
+CHANGEFREQ_VALUES = frozenset(('always', 'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'never'))
+
+SITEMAP_URLS = metrics.counter('seokit_sitemap_urls_read_total', 'Unique sitemap locations read.')
+
+_W3C_DATETIME_RE = re.compile(r"^\d{4}(-\d{2}(-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2}))?)?)?$")
+
+# Finding kinds: (severity, message)
+ISSUES = {
+    'parse_error': ('❌', 'Sitemap could not be read or parsed'),
+    'not_sitemap': ('❌', 'Root element is neither <urlset> nor <sitemapindex>'),
+    'namespace': ('⚠️', f'Root element is not in the {SITEMAP_NS} namespace'),
+    'too_many_urls': ('❌', f'More than {MAX_URLS_PER_SITEMAP} URLs in one sitemap file'),
+    'too_large': ('❌', f'Sitemap file larger than {MAX_SITEMAP_BYTES // (1024 * 1024)} MB uncompressed'),
+    'nested_index': ('❌', 'Sitemap index listed inside a sitemap index (not supported by search engines)'),
+    'missing_loc': ('❌', '<url> or <sitemap> entry without <loc>'),
+    'relative_loc': ('❌', '<loc> is not an absolute http(s) URL'),
+    'long_loc': ('❌', f'<loc> longer than {MAX_LOC_CHARS} characters'),
+    'other_host': ('⚠️', "<loc> on a different host than the sitemap (ignored unless the host is verified)"),
+    'fragment': ('⚠️', '<loc> contains a #fragment'),
+    'bad_lastmod': ('❌', '<lastmod> is not a W3C datetime (YYYY-MM-DD or YYYY-MM-DDThh:mm:ss+hh:mm)'),
+    'future_lastmod': ('⚠️', '<lastmod> is in the future'),
+    'bad_changefreq': ('❌', f'<changefreq> is not one of: {", ".join(sorted(CHANGEFREQ_VALUES))}'),
+    'bad_priority': ('❌', '<priority> is not a number between 0.0 and 1.0'),
+    'duplicate': ('⚠️', 'Duplicate <loc> (listed more than once)'),
+    'page_noindex': ('❌', 'Listed page is noindex (meta robots or X-Robots-Tag)'),
+    'page_canonicalized': ('❌', 'Listed page is canonicalized to another URL'),
+    'page_redirect': ('⚠️', 'Listed URL redirects; list the final URL instead'),
+    'page_error': ('❌', 'Listed URL returns an error status or could not be fetched'),
+    'page_blocked': ('❌', 'Listed URL is disallowed by robots.txt'),
+}
+
+
+_ENTRY_TAGS = {f'{{{SITEMAP_NS}}}{name}': name for name in ('url', 'sitemap')}
+_FIELD_TAGS = {f'{{{SITEMAP_NS}}}{name}': name for name in ('loc', 'lastmod', 'changefreq', 'priority')}
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _namespace(tag):
+    return tag[1:].split('}', 1)[0] if tag.startswith('{') else ''
+
+
+class _Reader:
+    """Read-only stream wrapper: replays `prefix` (bytes already peeked) and counts the bytes read."""
+
+    def __init__(self, stream, prefix=b'', underlying=None):
+        self.stream = stream
+        self.prefix = prefix
+        self.underlying = underlying    # Also closed (GzipFile leaves its fileobj open)
+        self.bytes = 0
+
+    def read(self, size=-1):
+        if self.prefix:
+            data, self.prefix = self.prefix, b''
+            if size is None or size < 0:
+                data += self.stream.read()
+            elif size > len(data):
+                data += self.stream.read(size - len(data))
+        else:
+            data = self.stream.read(size)
+        self.bytes += len(data)
+        return data
+
+    def close(self):
+        self.stream.close()
+        if self.underlying is not None:
+            self.underlying.close()
+
+
+def open_sitemap(source, session=None, timeout=30):
+    """
+    Opens a sitemap URL or file as a binary stream, decompressing gzip
+    (detected from the content, not the file name). The stream counts the
+    uncompressed bytes read in `.bytes`; the caller closes it.
+    """
+    if source.startswith(('http://', 'https://')):
+        response = session.get(source, stream=True, timeout=timeout)
+        response.raise_for_status()
+        response.raw.decode_content = True       # Undo Content-Encoding; a .gz body stays compressed
+        stream = response.raw
+    else:
+        stream = open(source, 'rb')
+    magic = stream.read(2)
+    if magic == b'\x1f\x8b':
+        compressed = _Reader(stream, magic)
+        return _Reader(gzip.GzipFile(fileobj=compressed), underlying=compressed)
+    return _Reader(stream, magic)
+
+
+class SitemapReader:
+    """
+    Iterating yields one dictionary per unique <url> entry
+    ({'loc', 'lastmod', 'changefreq', 'priority', 'sitemap'}) in document
+    order, following sitemap indexes. Findings are counted in `issues`
+    (kind -> count) with a few examples per kind in `examples`.
+    """
+
+    def __init__(self, sources, session=None, max_examples=10):
+        self.sources = [sources] if isinstance(sources, str) else list(sources)
+        self.session = session
+        self.max_examples = max_examples
+        self.issues = Counter()
+        self.examples = {}
+        self.files = []             # (sitemap, kind, entries, bytes)
+        self.urls = 0               # Unique locations yielded
+        self._seen = set()
+        self._tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        self._valid = set()         # (field, value) pairs already validated; sitemaps repeat a few values
+
+    def note(self, kind, detail):
+        self.issues[kind] += 1
+        examples = self.examples.setdefault(kind, [])
+        if len(examples) < self.max_examples:
+            examples.append(detail)
+
+    def __iter__(self):
+        pending = [(source, 0) for source in self.sources]
+        while pending:
+            source, depth = pending.pop(0)
+            children = []
+            for entry in self._read(source, depth, children):
+                yield entry
+            pending.extend((child, depth + 1) for child in children)
+
+    def _read(self, source, depth, children):
+        stream = None
+        kind, entries = None, 0
+        host = urlsplit(source).netloc.lower() if source.startswith(('http://', 'https://')) else ''
+        fast_prefixes = (f'http://{host}/', f'https://{host}/') if host else ('http://', 'https://')
+        try:
+            stream = open_sitemap(source, self.session)
+            root = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root, kind = elem, _local(elem.tag)
+                        if kind not in ('urlset', 'sitemapindex'):
+                            self.note('not_sitemap', f"{source} (<{kind}>)")
+                            return
+                        if _namespace(elem.tag) != SITEMAP_NS:
+                            self.note('namespace', source)
+                        if kind == 'sitemapindex' and depth > 0:
+                            self.note('nested_index', source)
+                    continue
+                tag = _ENTRY_TAGS.get(elem.tag) or _local(elem.tag)
+                if tag not in ('url', 'sitemap') or elem is root:
+                    continue
+                fields = {_FIELD_TAGS.get(child.tag) or _local(child.tag): (child.text or '').strip() for child in elem}
+                root.clear()        # Drop the finished entry (and any before it)
+                entries += 1
+                if entries == MAX_URLS_PER_SITEMAP + 1:
+                    self.note('too_many_urls', source)
+                loc = fields.get('loc', '')
+                # Fast path: an absolute URL (on the sitemap's own host) without a fragment
+                if not (loc.startswith(fast_prefixes) and '#' not in loc and len(loc) <= MAX_LOC_CHARS) \
+                        and not self._check_loc(loc, host, source):
+                    continue
+                if tag == 'sitemap':
+                    if kind == 'sitemapindex' and depth == 0:
+                        children.append(loc)
+                    continue
+                entry = self._check_entry(loc, fields, source)
+                if entry is not None:
+                    SITEMAP_URLS.inc()
+                    yield entry
+        except Exception as e:
+            self.note('parse_error', f"{source}: {e}")
+        finally:
+            if stream is not None:
+                stream.close()
+            size = stream.bytes if stream is not None else 0
+            if size > MAX_SITEMAP_BYTES:
+                self.note('too_large', f"{source} ({size / 1024 / 1024:.1f} MB)")
+            self.files.append((source, kind, entries, size))
+
+    def _check_loc(self, loc, host, source):
+        if not loc:
+            self.note('missing_loc', source)
+            return False
+        parts = urlsplit(loc)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            self.note('relative_loc', loc)
+            return False
+        if len(loc) > MAX_LOC_CHARS:
+            self.note('long_loc', loc[:100] + '...')
+        if host and parts.netloc.lower() != host:
+            self.note('other_host', loc)
+        if parts.fragment:
+            self.note('fragment', loc)
+        return True
+
+    def _check_entry(self, loc, fields, source):
+        lastmod = fields.get('lastmod', '')
+        changefreq = fields.get('changefreq', '')
+        priority = fields.get('priority', '')
+        valid = self._valid
+        if lastmod and ('lastmod', lastmod) not in valid:
+            if not _W3C_DATETIME_RE.match(lastmod) or not _valid_date(lastmod[:10]):
+                self.note('bad_lastmod', f"{loc}: {lastmod}")
+            elif len(lastmod) >= 10 and lastmod[:10] > self._tomorrow:
+                self.note('future_lastmod', f"{loc}: {lastmod}")
+            elif len(valid) < 10000:
+                valid.add(('lastmod', lastmod))
+        if changefreq and ('changefreq', changefreq) not in valid:
+            if changefreq.lower() not in CHANGEFREQ_VALUES:
+                self.note('bad_changefreq', f"{loc}: {changefreq}")
+            elif len(valid) < 10000:
+                valid.add(('changefreq', changefreq))
+        if priority and ('priority', priority) not in valid:
+            try:
+                in_range = 0.0 <= float(priority) <= 1.0
+            except ValueError:
+                in_range = False
+            if not in_range:
+                self.note('bad_priority', f"{loc}: {priority}")
+            elif len(valid) < 10000:
+                valid.add(('priority', priority))
+
+        key = hash(loc.split('#', 1)[0] if '#' in loc else loc)
+        if key in self._seen:
+            self.note('duplicate', loc)
+            return None
+        self._seen.add(key)
+        self.urls += 1
+        return {'loc': loc, 'lastmod': lastmod, 'changefreq': changefreq, 'priority': priority, 'sitemap': source}
+
+    def check_page(self, loc, facts=None, final_url=None, error=None):
+        """
+        Records what the audit of a listed page found: `facts` are the page
+        facts of seo-checker.py (None when the page was not audited),
+        `final_url` the URL after redirects and `error` 'blocked'
+        (robots.txt) or 'failed'.
+        """
+        if error == 'blocked':
+            self.note('page_blocked', loc)
+            return
+        if error or not facts or facts.get('http_status', 200) >= 400:
+            self.note('page_error', loc)
+            return
+        if facts.get('robots_noindex') or facts.get('x_robots_noindex'):
+            self.note('page_noindex', loc)
+        canonical = facts.get('canonical', '')
+        if canonical and _comparable(canonical) != _comparable(final_url or loc):
+            self.note('page_canonicalized', f"{loc} -> {canonical}")
+        if facts.get('redirect_hops'):
+            self.note('page_redirect', loc)
+
+
+def _valid_date(text):
+    """Rejects impossible dates such as 2024-13-45 (year and year-month values pass)."""
+    if len(text) < 10:
+        return True
+    try:
+        date.fromisoformat(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _comparable(url):
+    parts = urlsplit(url.strip())
+    return (parts.netloc.lower(), parts.path.rstrip('/') or '/', parts.query)
+
+
+def format_sitemap_report(reader, audited=None):
+    """Formats a SitemapReader's files and findings as report lines."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           S I T E M A P   V A L I D A T I O N")
+    lines.append("="*70)
+    lines.append(f"  Sitemap files: {len(reader.files)} | Unique URLs: {reader.urls}"
+                 + (f" | Audited: {audited}" if audited is not None else ""))
+    for source, kind, entries, size in reader.files[:20]:
+        lines.append(f"  > {source}: <{kind or '?'}> {entries} entries, {size / 1024:.0f} KB")
+    if len(reader.files) > 20:
+        lines.append(f"  ... and {len(reader.files) - 20} more file(s)")
+    if not reader.issues:
+        lines.append("\n  ✅ No sitemap problems found.")
+    for kind, (flag, message) in ISSUES.items():
+        count = reader.issues.get(kind)
+        if not count:
+            continue
+        lines.append(f"\n--- {flag} {message} ({count}) ---")
+        for detail in reader.examples.get(kind, []):
+            lines.append(f"  > {detail}")
+        if count > len(reader.examples.get(kind, [])):
+            lines.append(f"  ... and {count - len(reader.examples[kind])} more")
+    lines.append("="*70)
+    return lines
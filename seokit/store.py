@@ -0,0 +1,194 @@
+"""
+Local audit history (SQLite, standard library only).
+
+Every bulk audit becomes a run; each audited page becomes one row holding
+its score, grade and the extracted facts (JSON). Rows are buffered and
+written with executemany() inside one transaction per batch, and pages are
+indexed on (url, run_id), so nightly ingests of tens of thousands of pages
+take seconds and the trend queries below stay index lookups.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    label       TEXT,
+    pages       INTEGER DEFAULT 0,
+    failed      INTEGER DEFAULT 0,
+    site_score  INTEGER
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id  INTEGER NOT NULL REFERENCES runs(run_id),
+    url     TEXT NOT NULL,
+    score   INTEGER NOT NULL,
+    grade   TEXT NOT NULL,
+    facts   TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_url_run ON pages (url, run_id);
+CREATE INDEX IF NOT EXISTS pages_run ON pages (run_id);
+"""
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class AuditStore:
+    """Append-only store of audit runs and per-page results."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def begin_run(self, label=None):
+        """Creates a run and returns its id."""
+        with self.connection:
+            cursor = self.connection.execute("INSERT INTO runs (started_at, label) VALUES (?, ?)", (_now(), label))
+        return cursor.lastrowid
+
+    def add_page(self, run_id, url, score, grade, facts=None):
+        """Buffers one page row; rows are written BATCH_SIZE at a time."""
+        self._pending.append((run_id, url, int(score), grade,
+                              json.dumps(facts, ensure_ascii=False) if facts is not None else None))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany("INSERT INTO pages (run_id, url, score, grade, facts) VALUES (?, ?, ?, ?, ?)",
+                                        self._pending)
+        self._pending = []
+
+    def finish_run(self, run_id, failed=0, site_score=None):
+        """Flushes the remaining rows and records the run totals."""
+        self.flush()
+        with self.connection:
+            self.connection.execute(
+                "UPDATE runs SET finished_at = ?, failed = ?, site_score = ?,"
+                " pages = (SELECT COUNT(*) FROM pages WHERE run_id = ?) WHERE run_id = ?",
+                (_now(), failed, site_score, run_id, run_id))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def runs(self, limit=None):
+        """Returns the runs, newest first, as dictionaries."""
+        sql = "SELECT run_id, started_at, finished_at, label, pages, failed, site_score FROM runs ORDER BY run_id DESC"
+        rows = self.connection.execute(sql + (" LIMIT ?" if limit else ""), (limit,) if limit else ()).fetchall()
+        keys = ('run_id', 'started_at', 'finished_at', 'label', 'pages', 'failed', 'site_score')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def previous_run(self, run_id):
+        """The latest finished run before `run_id` with the same label (i.e. of the same targets), or None."""
+        row = self.connection.execute(
+            "SELECT MAX(run_id) FROM runs WHERE run_id < ? AND finished_at IS NOT NULL"
+            " AND label IS (SELECT label FROM runs WHERE run_id = ?)", (run_id, run_id)).fetchone()
+        return row[0]
+
+    def latest_run(self):
+        """The latest finished run (a crashed run never is), or None."""
+        return self.connection.execute("SELECT MAX(run_id) FROM runs WHERE finished_at IS NOT NULL").fetchone()[0]
+
+    def grade_drops(self, grade_rank, run_id=None, previous_id=None):
+        """
+        Pages whose grade got worse between two runs (default: the latest run
+        and the one before it). `grade_rank` maps grade -> rank (higher is
+        better). Returns [(url, old score, old grade, new score, new grade)],
+        largest score drop first.
+        """
+        run_id = run_id or self.latest_run()
+        previous_id = previous_id or (self.previous_run(run_id) if run_id else None)
+        if not run_id or not previous_id:
+            return []
+        # A grade can only drop when the score drops, so let SQLite narrow the join first
+        rows = self.connection.execute(
+            "SELECT new.url, old.score, old.grade, new.score, new.grade"
+            " FROM pages AS new JOIN pages AS old ON old.url = new.url AND old.run_id = ?"
+            " WHERE new.run_id = ? AND new.score < old.score", (previous_id, run_id)).fetchall()
+        drops = [row for row in rows if grade_rank.get(row[4], -1) < grade_rank.get(row[2], -1)]
+        drops.sort(key=lambda row: row[3] - row[1])
+        return drops
+
+    def score_distribution(self, bucket=10, limit=10):
+        """
+        Score histogram per run for the latest `limit` runs, oldest first:
+        [(run dict, {bucket start: pages})].
+        """
+        distribution = []
+        for run in reversed(self.runs(limit)):
+            rows = self.connection.execute(
+                "SELECT (score / ?) * ?, COUNT(*) FROM pages WHERE run_id = ? GROUP BY 1 ORDER BY 1",
+                (bucket, bucket, run['run_id'])).fetchall()
+            distribution.append((run, dict(rows)))
+        return distribution
+
+    def page_history(self, url, limit=20):
+        """Score/grade of one URL across the latest runs: [(run_id, started_at, score, grade)], oldest first."""
+        rows = self.connection.execute(
+            "SELECT pages.run_id, runs.started_at, pages.score, pages.grade FROM pages"
+            " JOIN runs ON runs.run_id = pages.run_id WHERE pages.url = ? ORDER BY pages.run_id DESC LIMIT ?",
+            (url, limit)).fetchall()
+        return rows[::-1]
+
+
+def format_history_report(store, grade_rank, bucket=10, runs=10, max_examples=50):
+    """Formats run history, score distribution over time and grade drops as report lines."""
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("           A U D I T   H I S T O R Y")
+    lines.append("="*70)
+    distribution = store.score_distribution(bucket=bucket, limit=runs)
+    if not distribution:
+        lines.append("  (No runs stored yet)")
+        lines.append("="*70)
+        return lines
+
+    lines.append("\n--- Score Distribution over Time ---")
+    starts = list(range(0, 101, bucket))
+    lines.append("  Run   Date                 Pages  Site  " + " ".join(f"{start:>5}" for start in starts))
+    for run, histogram in distribution:
+        site = f"{run['site_score']}%" if run['site_score'] is not None else "-"
+        lines.append(f"  #{run['run_id']:<4} {run['started_at']:<20} {run['pages']:>5}  {site:>4}  "
+                     + " ".join(f"{histogram.get(start, 0):>5}" for start in starts))
+
+    latest = store.latest_run()
+    drops = store.grade_drops(grade_rank, run_id=latest) if latest else []
+    lines.append(f"\n--- Grade Drops since Previous Run ({len(drops)}) ---")
+    if not latest or store.previous_run(latest) is None:
+        lines.append("  (No earlier finished run of the same targets; nothing to compare)")
+    elif not drops:
+        lines.append("  ✅ No page lost a grade.")
+    for url, old_score, old_grade, new_score, new_grade in drops[:max_examples]:
+        lines.append(f"  ⚠️ {url}: {old_score}% ({old_grade}) -> {new_score}% ({new_grade})")
+    if len(drops) > max_examples:
+        lines.append(f"  ... and {len(drops) - max_examples} more")
+    lines.append("="*70)
+    return lines
@@ -0,0 +1,298 @@
+"""
+Streaming, mergeable site-level aggregates of an audit.
+
+Pages are added one at a time as results arrive and nothing per page is
+kept, so the memory of a summary is fixed whatever the number of pages:
+
+- ScoreHistogram: one counter per integer score (0-100), i.e. an exact
+  HDR-style histogram; percentiles are exact and merging adds the counters.
+- CountMinSketch: failure-reason counts in a fixed table (estimates never
+  undercount), with the heaviest reasons tracked as candidates.
+- WorstPages: a bounded heap of the lowest-scoring pages.
+
+SiteSummary combines them with the grade distribution and one score
+histogram per path prefix (section). Summaries built in different worker
+processes (or from different result files) combine with merge(); they
+pickle as is and round-trip through to_dict() / from_dict() as JSON.
+"""
+
+import hashlib
+import heapq
+import os
+from urllib.parse import urlsplit
+
+from seokit.jsonld import loads as loads_json
+
+MAX_SCORE = 100
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+TRACKED_REASONS = 64            # Heavy-hitter candidates kept by the sketch
+WORST_PAGES = 10
+MAX_SECTIONS = 500              # Path prefixes beyond this are counted under OTHER_SECTION
+OTHER_SECTION = '(other)'
+CHUNK_BYTES = 32 * 1024 * 1024  # Slice of a JSONL file summarized by one worker
+
+
+class ScoreHistogram:
+    """Exact distribution of integer scores 0..MAX_SCORE (larger scores are clamped)."""
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts else [0] * (MAX_SCORE + 1)
+
+    def add(self, score, count=1):
+        self.counts[min(max(int(score), 0), MAX_SCORE)] += count
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def mean(self):
+        total = self.total
+        return sum(score * count for score, count in enumerate(self.counts)) / total if total else 0.0
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile (None when empty)."""
+        rank = max(1, round(fraction * self.total))
+        seen = 0
+        for score, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return score
+        return None
+
+
+def _hashes(key, depth):
+    """`depth` 32-bit hashes of a key, identical in every process (unlike hash())."""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * depth).digest()
+    return [int.from_bytes(digest[i * 4:i * 4 + 4], 'little') for i in range(depth)]
+
+
+class CountMinSketch:
+    """
+    Approximate counts of an open-ended set of keys in a fixed
+    width x depth table. estimate() never undercounts; with the default
+    size it overcounts by at most about 0.1% of all additions (with high
+    probability). The `tracked` most frequent keys are remembered so the
+    top reasons can be listed.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, tracked=TRACKED_REASONS):
+        self.width = width
+        self.depth = depth
+        self.tracked = tracked
+        self.table = [[0] * width for _ in range(depth)]
+        self.total = 0
+        self.candidates = {}        # key -> estimate when last updated
+
+    def add(self, key, count=1):
+        estimate = None
+        for row, value in zip(self.table, _hashes(key, self.depth)):
+            cell = value % self.width
+            row[cell] += count
+            estimate = row[cell] if estimate is None else min(estimate, row[cell])
+        self.total += count
+        self._track(key, estimate)
+
+    def _track(self, key, estimate):
+        if key in self.candidates or len(self.candidates) < self.tracked:
+            self.candidates[key] = estimate
+            return
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[key] = estimate
+
+    def estimate(self, key):
+        return min(row[value % self.width] for row, value in zip(self.table, _hashes(key, self.depth)))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-min sketches of different sizes cannot be merged")
+        for row, other_row in zip(self.table, other.table):
+            for cell, value in enumerate(other_row):
+                row[cell] += value
+        self.total += other.total
+        keys = set(self.candidates) | set(other.candidates)
+        self.candidates = {}
+        for key in sorted(keys, key=self.estimate, reverse=True)[:self.tracked]:
+            self.candidates[key] = self.estimate(key)
+        return self
+
+    def top(self, n=10):
+        """[(key, estimated count)] of the most frequent tracked keys."""
+        return sorted(((key, self.estimate(key)) for key in self.candidates), key=lambda item: (-item[1], item[0]))[:n]
+
+
+class WorstPages:
+    """The `size` lowest-scoring pages seen, as a bounded max-heap of (score, url)."""
+
+    def __init__(self, size=WORST_PAGES):
+        self.size = size
+        self._heap = []             # (-score, url): the best of the worst pages sits on top
+
+    def add(self, url, score, grade=''):
+        item = (-score, url, grade)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def merge(self, other):
+        for negative_score, url, grade in other._heap:
+            self.add(url, -negative_score, grade)
+        return self
+
+    def pages(self):
+        """[(url, score, grade)], worst first (ties by URL)."""
+        return sorted(((url, -negative_score, grade) for negative_score, url, grade in self._heap), key=lambda page: (page[1], page[0]))
+
+
+def section_of(url, depth=1):
+    """Path prefix a page is grouped under: '/blog' for /blog/2024/post.html (depth 1), '/' for top-level pages."""
+    path = urlsplit(url).path if '://' in url else url.replace('\\', '/')
+    parts = [part for part in path.split('/') if part]
+    return '/' + '/'.join(parts[:min(depth, len(parts) - 1)]) if len(parts) > 1 else '/'
+
+
+class SiteSummary:
+    def __init__(self, section_depth=1, worst=WORST_PAGES):
+        self.section_depth = section_depth
+        self.pages = 0
+        self.scores = ScoreHistogram()
+        self.grades = {}
+        self.sections = {}          # path prefix -> ScoreHistogram
+        self.failures = CountMinSketch()
+        self.worst = WorstPages(worst)
+
+    def _section(self, name):
+        histogram = self.sections.get(name)
+        if histogram is None:
+            if len(self.sections) >= MAX_SECTIONS and name != OTHER_SECTION:
+                return self._section(OTHER_SECTION)
+            histogram = self.sections[name] = ScoreHistogram()
+        return histogram
+
+    def add(self, url, score, grade, failed=()):
+        """Adds one page: its score, grade and the ids of the checks it failed."""
+        self.pages += 1
+        self.scores.add(score)
+        self.grades[grade] = self.grades.get(grade, 0) + 1
+        self._section(section_of(url, self.section_depth)).add(score)
+        for reason in failed:
+            self.failures.add(reason)
+        self.worst.add(url, score, grade)
+
+    def merge(self, other):
+        self.pages += other.pages
+        self.scores.merge(other.scores)
+        for grade, count in other.grades.items():
+            self.grades[grade] = self.grades.get(grade, 0) + count
+        for name, histogram in other.sections.items():
+            self._section(name).merge(histogram)
+        self.failures.merge(other.failures)
+        self.worst.merge(other.worst)
+        return self
+
+    def to_dict(self):
+        """JSON-serializable state (see from_dict)."""
+        return {
+            'section_depth': self.section_depth,
+            'pages': self.pages,
+            'scores': self.scores.counts,
+            'grades': self.grades,
+            'sections': {name: histogram.counts for name, histogram in self.sections.items()},
+            'failures': {'width': self.failures.width, 'depth': self.failures.depth, 'table': self.failures.table,
+                         'total': self.failures.total, 'candidates': self.failures.candidates},
+            'worst': {'size': self.worst.size, 'pages': self.worst.pages()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(section_depth=data['section_depth'], worst=data['worst']['size'])
+        summary.pages = data['pages']
+        summary.scores = ScoreHistogram(data['scores'])
+        summary.grades = dict(data['grades'])
+        summary.sections = {name: ScoreHistogram(counts) for name, counts in data['sections'].items()}
+        failures = data['failures']
+        summary.failures = CountMinSketch(width=failures['width'], depth=failures['depth'])
+        summary.failures.table = [list(row) for row in failures['table']]
+        summary.failures.total = failures['total']
+        summary.failures.candidates = dict(failures['candidates'])
+        for url, score, grade in data['worst']['pages']:
+            summary.worst.add(url, score, grade)
+        return summary
+
+
+def jsonl_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Splits a JSONL file into [(start, end)] byte ranges of about
+    `chunk_bytes` that begin and end on line boundaries, so the ranges can
+    be read by different processes (see iter_jsonl_range).
+    """
+    size = os.path.getsize(path)
+    chunks = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()            # Move to the start of the next line
+            end = f.tell()
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def iter_jsonl_range(path, start, end):
+    """Yields the records of the lines between two offsets of a JSONL file (blank lines are skipped)."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield loads_json(line)
+
+
+def _quantiles(histogram):
+    return (f"p10 {histogram.percentile(0.10):>3}  p50 {histogram.percentile(0.50):>3}  "
+            f"p90 {histogram.percentile(0.90):>3}  mean {histogram.mean():5.1f}")
+
+
+def format_summary_report(summary, grade_order=(), title="Score Summary", top=10, max_sections=20):
+    """Formats a SiteSummary. `grade_order` lists the grades best first (others follow)."""
+    lines = []
+    lines.append(f"\n--- {title} ({summary.pages} page(s)) ---")
+    if not summary.pages:
+        return lines
+    lines.append(f"  All pages: {_quantiles(summary.scores)}")
+
+    lines.append("  Grade distribution:")
+    grades = [grade for grade in grade_order if grade in summary.grades]
+    grades += sorted(grade for grade in summary.grades if grade not in grades)
+    for grade in grades:
+        count = summary.grades[grade]
+        lines.append(f"    {grade:<4} {count:>9}  ({count / summary.pages:.1%})")
+
+    sections = sorted(summary.sections.items(), key=lambda item: -item[1].total)
+    lines.append(f"  Sections (path prefix, depth {summary.section_depth}; {len(sections)} in total, busiest first):")
+    for name, histogram in sections[:max_sections]:
+        lines.append(f"    {name[:40]:<40} {histogram.total:>8} page(s)  {_quantiles(histogram)}")
+
+    lines.append("  Most failed checks:")
+    failures = summary.failures.top(top)
+    if not failures:
+        lines.append("    ✅ No page failed a check.")
+    for reason, count in failures:
+        lines.append(f"    ❌ {reason:<28} {count:>9} page(s)  ({count / summary.pages:.1%})")
+
+    worst = summary.worst.pages()
+    lines.append(f"  Worst pages ({len(worst)}):")
+    for url, score, grade in worst:
+        lines.append(f"    > {url}: {score}% ({grade})")
+    return lines
@@ -0,0 +1,248 @@
+"""
+Page-view counts from the analytics tracker's log (analytics/analytics.log).
+
+log_endpoint.php appends one line per tracked event: "[Y-m-d H:i:s] {json}",
+where the JSON holds the tracker's action, location (the page path) and
+pageTitle. Logs are read as a stream, so multi-GB files and their rotated
+siblings (analytics.log.1, analytics.log.2.gz, ...) never have to fit in
+memory: plain files are memory-mapped, gzip files are decompressed on the
+fly, and only PAGE_LOAD / PAGE_UNLOAD lines are decoded at all (clicks,
+errors and visibility events are skipped by a C-level byte search). Counts are kept
+per normalized path in flat integer arrays.
+"""
+
+import gzip
+import mmap
+import os
+from array import array
+from urllib.parse import urlsplit
+
+from seokit.jsonld import loads
+
+PAGE_LOAD = 'PAGE_LOAD'
+PAGE_UNLOAD = 'PAGE_UNLOAD'
+INDEX_FILES = ('index.html', 'index.htm', 'index.php')
+
+GZIP_CHUNK_SIZE = 4 * 1024 * 1024
+
+_PAGE_MARK = b'"PAGE_'
+_LOAD_MARK = b'"PAGE_LOAD"'
+_UNLOAD_MARK = b'"PAGE_UNLOAD"'
+
+
+def normalize_path(location):
+    """Path used to join log locations with audited URLs: no host, query or index file, no trailing slash."""
+    if not location:
+        return '/'
+    if '://' in location:
+        location = urlsplit(location).path
+    else:
+        location = location.partition('?')[0].partition('#')[0]
+    head, _, tail = location.rpartition('/')
+    if tail in INDEX_FILES:
+        location = head
+    return '/' + location.strip('/') if location.strip('/') else '/'
+
+
+def log_files(path):
+    """
+    The log files to read for `path`: every analytics.log* file of a
+    directory, or a log file together with its rotated siblings
+    (name.1, name.2.gz, name-20240105.gz, ...), the live file last.
+    """
+    if os.path.isdir(path):
+        directory, base = path, 'analytics.log'
+    else:
+        directory, base = os.path.dirname(path) or '.', os.path.basename(path)
+    rotated = [name for name in os.listdir(directory) if name.startswith((base + '.', base + '-'))]
+    rotated.sort(key=lambda name: (len(name), name), reverse=True)
+    files = [os.path.join(directory, name) for name in rotated]
+    if os.path.exists(os.path.join(directory, base)):
+        files.append(os.path.join(directory, base))
+    return files
+
+
+def _is_gzip(path):
+    with open(path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+
+
+def _page_event_lines(buffer, end=None):
+    """
+    Yields the lines of `buffer` (bytes or mmap) up to `end` that mention a
+    page event. The marker is located with C-level find(), so the lines in
+    between are never touched by Python code.
+    """
+    end = len(buffer) if end is None else end
+    find, rfind = buffer.find, buffer.rfind
+    position = find(_PAGE_MARK, 0, end)
+    while position >= 0:
+        line_end = find(b'\n', position, end)
+        if line_end < 0:
+            line_end = end
+        line = buffer[rfind(b'\n', 0, position) + 1:line_end]
+        if _LOAD_MARK in line or _UNLOAD_MARK in line:
+            yield line
+        position = find(_PAGE_MARK, line_end, end)
+
+
+def iter_page_event_lines(path, chunk_size=GZIP_CHUNK_SIZE):
+    """Yields the PAGE_LOAD / PAGE_UNLOAD lines (bytes) of one log file, memory-mapped or gunzipped."""
+    if _is_gzip(path):
+        with gzip.open(path, 'rb') as f:
+            carry = b''
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                buffer = carry + chunk
+                cut = buffer.rfind(b'\n') + 1
+                yield from _page_event_lines(buffer, cut)
+                carry = buffer[cut:]
+            yield from _page_event_lines(carry)
+        return
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield from _page_event_lines(mapped)
+
+
+def iter_page_events(path):
+    """
+    Yields (line, event) for every PAGE_LOAD / PAGE_UNLOAD line of one log
+    file: `event` is the decoded JSON object, or None when the line is not
+    valid JSON.
+    """
+    for line in iter_page_event_lines(path):
+        try:
+            event = loads(line[line.find(b'{'):])
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            yield line, None
+        elif event.get('action') in (PAGE_LOAD, PAGE_UNLOAD):
+            yield line, event
+
+
+def log_period(first_line, last_line):
+    """(first, last) "[Y-m-d H:i:s]" timestamps of a log; the endpoint appends in time order."""
+    return tuple(line[1:line.find(b']')].decode('ascii', 'replace') if line and line.startswith(b'[') else None
+                 for line in (first_line, last_line))
+
+
+class TrafficCounts:
+    """Page views and unloads per normalized path, interned to integer ids."""
+
+    def __init__(self):
+        self._ids = {}                  # normalized path -> id
+        self._locations = {}            # raw location -> id (skips normalize_path() for repeats)
+        self.paths = []                 # id -> normalized path
+        self.views = array('L')         # id -> PAGE_LOAD events
+        self.exits = array('L')         # id -> PAGE_UNLOAD events
+        self.files = []
+        self.malformed = 0
+        self.first_seen = None
+        self.last_seen = None
+
+    def _id(self, path):
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = self._ids[path] = len(self.paths)
+            self.paths.append(path)
+            self.views.append(0)
+            self.exits.append(0)
+        return path_id
+
+    def _seen(self, timestamp):
+        if timestamp is None:
+            return
+        if self.first_seen is None or timestamp < self.first_seen:
+            self.first_seen = timestamp
+        if self.last_seen is None or timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+    def read_file(self, path):
+        """Adds the page events of one log file."""
+        self.files.append(path)
+        locations, views, exits = self._locations, self.views, self.exits
+        first_line = line = None
+        for line, event in iter_page_events(path):
+            if event is None:
+                self.malformed += 1
+                continue
+            location = event.get('location')
+            path_id = locations.get(location)
+            if path_id is None:
+                path_id = locations[location] = self._id(normalize_path(location))
+            if event['action'] == PAGE_LOAD:
+                views[path_id] += 1
+            else:
+                exits[path_id] += 1
+            if first_line is None:
+                first_line = line
+        for timestamp in log_period(first_line, line):
+            self._seen(timestamp)
+
+    @classmethod
+    def from_logs(cls, path):
+        """Counts the page events of a log file (with its rotated siblings) or a log directory."""
+        files = log_files(path)
+        if not files:
+            raise FileNotFoundError(f"No analytics log found at {path}")
+        counts = cls()
+        for file_path in files:
+            counts.read_file(file_path)
+        return counts
+
+    @property
+    def total_views(self):
+        return sum(self.views)
+
+    def views_for(self, url):
+        """Page views of a URL or path (0 when it never appears in the log)."""
+        path_id = self._ids.get(normalize_path(url))
+        return self.views[path_id] if path_id is not None else 0
+
+    def order(self, targets, key=None):
+        """Returns the targets busiest first (ties keep their original order); `key` maps a target to its URL."""
+        return sorted(targets, key=lambda target: self.views_for(key(target) if key else target), reverse=True)
+
+    def top(self, n=20):
+        """The n most viewed paths as [(path, views)]."""
+        ranked = sorted(range(len(self.paths)), key=self.views.__getitem__, reverse=True)[:n]
+        return [(self.paths[path_id], self.views[path_id]) for path_id in ranked]
+
+
+def format_traffic_report(traffic, page_views, max_examples=10):
+    """
+    Traffic section of the site report. `page_views` lists (url, views,
+    score) for every audited page: the site score is re-weighted by page
+    views and the busiest low-scoring pages are listed first.
+    """
+    lines = []
+    total_views = traffic.total_views
+    audited_views = sum(views for _, views, _ in page_views)
+    lines.append(f"\n--- Traffic ({traffic.total_views} page view(s) in {len(traffic.files)} log file(s)) ---")
+    if traffic.first_seen:
+        lines.append(f"  Period: {traffic.first_seen} - {traffic.last_seen}")
+    if traffic.malformed:
+        lines.append(f"  ⚠️ {traffic.malformed} malformed page event line(s) skipped.")
+    if not audited_views:
+        lines.append("  ℹ️ None of the audited pages appear in the analytics log.")
+        return lines
+    weighted = round(sum(views * score for _, views, score in page_views) / audited_views)
+    lines.append(f"  Audited pages cover {audited_views / total_views:.0%} of all tracked page views.")
+    lines.append(f"  Traffic-weighted site score: {weighted}% (unweighted average: "
+                 f"{round(sum(score for _, _, score in page_views) / len(page_views))}%)")
+    # Views lost to each page's missing points: fixing the top of this list helps the most visitors
+    priorities = sorted((item for item in page_views if item[1] and item[2] < 100),
+                        key=lambda item: item[1] * (100 - item[2]), reverse=True)
+    lines.append("  Fix first (busiest pages with the most missing points):")
+    for url, views, score in priorities[:max_examples]:
+        lines.append(f"  > {url}: {score}% — {views} view(s) ({views / total_views:.1%} of traffic)")
+    if not priorities:
+        lines.append("  ✅ Every page with traffic scores 100%.")
+    return lines
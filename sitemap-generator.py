@@ -3,11 +3,80 @@ from tkinter import ttk, filedialog, messagebox
 import os
 from datetime import datetime
 import xml.etree.ElementTree as ET
+from seokit import metrics
+from seokit.site_files import iter_site_files
 
 # Configuration for the XML namespace
 SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
 ACCEPTED_EXTENSIONS = ('.html', '.htm', '.php', '.asp', '.aspx', '.js', '.css', '.xml', '.json')
 
+# Live counters (served when the SEOKIT_METRICS_PORT environment variable is set)
+FILES_INDEXED_METRIC = metrics.counter('seokit_sitemap_files_indexed_total', 'Local files indexed into sitemap URLs.')
+URLS_WRITTEN_METRIC = metrics.counter('seokit_sitemap_urls_written_total', 'URLs written into generated sitemaps.')
+
+# ----------------------------------------------------------------------
+# Indexing and XML generation (no GUI, so they can be scripted and benchmarked)
+# ----------------------------------------------------------------------
+
+def index_local_files(root_folder, base_url, log=None):
+    """
+    Walks the directory tree, converts file paths to URLs, and returns a list
+    of {'loc', 'lastmod'} entries. `log` is called with a message per file.
+    """
+    url_list = []
+
+    # Shared with `seo-checker.py audit --dir`: skipped directories are pruned, paths come relative with forward slashes
+    for file_path, url_path in iter_site_files(root_folder, ACCEPTED_EXTENSIONS):
+
+        # 1. Handle the index file at the root (e.g., index.html -> /)
+        if url_path.lower() in ['index.html', 'index.htm', 'index.php']:
+            url = base_url # e.g., https://yourdomain.com/
+        else:
+            # Standard file URL
+            url = base_url + url_path
+
+        # 2. Get last modification date (timestamp to ISO format)
+        try:
+            timestamp = os.path.getmtime(file_path)
+            lastmod = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+        except OSError:
+            lastmod = datetime.now().strftime("%Y-%m-%d")
+
+        url_list.append({'loc': url, 'lastmod': lastmod})
+        FILES_INDEXED_METRIC.inc()
+        if log:
+            log(f"Indexed: {url}")
+
+    return url_list
+
+def build_sitemap_xml(urls, default_priority, default_changefreq):
+    """Builds the pretty-printed sitemap XML for a list of {'loc', 'lastmod'} entries."""
+    # Register namespace
+    ET.register_namespace('', SITEMAP_NS)
+    urlset = ET.Element('urlset', xmlns=SITEMAP_NS)
+
+    for item in urls:
+        url_elem = ET.SubElement(urlset, 'url')
+
+        loc = ET.SubElement(url_elem, 'loc')
+        loc.text = item['loc']
+
+        lastmod = ET.SubElement(url_elem, 'lastmod')
+        lastmod.text = item['lastmod'] # Uses file's last modified time
+
+        changefreq = ET.SubElement(url_elem, 'changefreq')
+        changefreq.text = default_changefreq
+
+        priority = ET.SubElement(url_elem, 'priority')
+        priority.text = default_priority
+
+    # Pretty print XML
+    from xml.dom import minidom
+    rough_string = ET.tostring(urlset, 'utf-8')
+    reparsed = minidom.parseString(rough_string)
+    URLS_WRITTEN_METRIC.inc(amount=len(urls))
+    return reparsed.toprettyxml(indent="  ")
+
 class LocalSitemapGeneratorApp:
     def __init__(self, master):
         self.master = master
@@ -144,86 +213,13 @@ class LocalSitemapGeneratorApp:
 
     def index_local_files(self, root_folder, base_url):
         """Walks the directory tree, converts file paths to URLs, and returns a list of URLs."""
-        url_list = []
-        
-        # List of directories to skip (common development folders)
-        SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', 'tmp', 'temp', 'logs'}
-
-        for dirpath, dirnames, filenames in os.walk(root_folder):
-            
-            # Modify dirnames in place to skip unwanted directories on the next iteration
-            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-            
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                
-                # Check for accepted extensions
-                if filename.lower().endswith(ACCEPTED_EXTENSIONS):
-                    
-                    # 1. Get the path relative to the root folder
-                    relative_path = os.path.relpath(file_path, root_folder)
-                    
-                    # 2. Convert OS path separators to URL forward slashes
-                    url_path = relative_path.replace(os.path.sep, '/')
-                    
-                    # 3. Handle the index file at the root (e.g., index.html -> /)
-                    if url_path.lower() in ['index.html', 'index.htm', 'index.php']:
-                        if dirpath == root_folder:
-                             url = base_url # e.g., https://yourdomain.com/
-                        else:
-                             # For index files in subdirectories, use the directory URL
-                             url = base_url + os.path.relpath(dirpath, root_folder).replace(os.path.sep, '/') + '/'
-                             
-                    else:
-                        # Standard file URL
-                        url = base_url + url_path
-                    
-                    # 4. Get last modification date (timestamp to ISO format)
-                    try:
-                        timestamp = os.path.getmtime(file_path)
-                        lastmod = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
-                    except OSError:
-                        lastmod = datetime.now().strftime("%Y-%m-%d")
-
-                    url_list.append({'loc': url, 'lastmod': lastmod})
-                    self.update_log(f"Indexed: {url}")
-
-        return url_list
+        return index_local_files(root_folder, base_url, log=self.update_log)
 
     def generate_and_save_xml(self, urls):
         """Generates the sitemap XML structure and prompts the user to save it."""
         try:
-            # Get user-defined defaults
-            default_priority = self.default_priority_var.get()
-            default_changefreq = self.default_changefreq_var.get()
-
-            # Register namespace
-            ET.register_namespace('', SITEMAP_NS)
-            urlset = ET.Element('urlset', xmlns=SITEMAP_NS)
-            
-            for item in urls:
-                url_elem = ET.SubElement(urlset, 'url')
-                
-                loc = ET.SubElement(url_elem, 'loc')
-                loc.text = item['loc']
-                
-                lastmod = ET.SubElement(url_elem, 'lastmod')
-                lastmod.text = item['lastmod'] # Uses file's last modified time
-
-                changefreq = ET.SubElement(url_elem, 'changefreq')
-                changefreq.text = default_changefreq
-                
-                priority = ET.SubElement(url_elem, 'priority')
-                priority.text = default_priority
-                
-            # Pretty print XML
-            def prettify(elem):
-                from xml.dom import minidom
-                rough_string = ET.tostring(elem, 'utf-8')
-                reparsed = minidom.parseString(rough_string)
-                return reparsed.toprettyxml(indent="  ")
-
-            xml_content = prettify(urlset)
+            # Build the XML with the user-defined defaults
+            xml_content = build_sitemap_xml(urls, self.default_priority_var.get(), self.default_changefreq_var.get())
 
             # Prompt the user to save the XML file
             filepath = filedialog.asksaveasfilename(
@@ -245,6 +241,7 @@ class LocalSitemapGeneratorApp:
             messagebox.showerror("XML Error", f"Failed to generate or save XML: {e}")
 
 if __name__ == '__main__':
+    metrics.serve_from_environment()
     root = tk.Tk()
     app = LocalSitemapGeneratorApp(root)
     root.mainloop()
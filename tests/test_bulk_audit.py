@@ -0,0 +1,43 @@
+"""Directory audits (audit --dir): pages are keyed by their site URL, not by the file path."""
+
+import json
+import sqlite3
+
+
+def _write_site(root):
+    blog = root / 'site' / 'blog'
+    blog.mkdir(parents=True)
+    for page, canonical in (('a', 'b'), ('b', 'c'), ('c', 'a')):
+        (blog / f'{page}.html').write_text(
+            f'<html><head><title>Page {page}</title><meta name="description" content="About {page}">'
+            f'<link rel="canonical" href="/blog/{canonical}.html"></head>'
+            f'<body><a href="/blog/{canonical}.html">next</a></body></html>', encoding='utf-8')
+    (root / 'site' / 'index.html').write_text(
+        '<html><head><title>Home</title></head><body><a href="/blog/a.html">a</a></body></html>', encoding='utf-8')
+    return str(root / 'site'), [str(path) for path in sorted((root / 'site').rglob('*.html'))]
+
+
+def test_dir_audit_finds_canonical_cycle(checker, tmp_path, monkeypatch):
+    site_root, targets = _write_site(tmp_path)
+    monkeypatch.chdir(tmp_path / 'site' / 'blog')     # File paths no longer match the site paths
+    report = checker.run_bulk_audit(targets, site_root=site_root)
+    assert "Canonical Chains (0) and Cycles (1)" in report
+    assert "file:///blog/a.html -> file:///blog/b.html -> file:///blog/c.html" in report
+
+
+def test_dir_audit_joins_traffic_and_history_on_site_paths(checker, tmp_path):
+    site_root, targets = _write_site(tmp_path)
+    log = tmp_path / 'analytics.log'
+    log.write_text(''.join(f"[2026-10-01 10:00:0{i}] " + json.dumps({'action': 'PAGE_LOAD', 'location': location}) + "\n"
+                           for i, location in enumerate(['https://www.example.com/blog/c.html'] * 3 + ['/blog/b.html'])),
+                   encoding='utf-8')
+    traffic = checker.TrafficCounts.from_logs(str(log))
+    assert [target[-6:] for target in traffic.order(targets, key=lambda t: checker.page_url_for(t, site_root))][:2] == ['c.html', 'b.html']
+
+    store_path = str(tmp_path / 'history.db')
+    report = checker.run_bulk_audit(targets, site_root=site_root, traffic=traffic, store_path=store_path)
+    busiest = report.split("Fix first")[1].splitlines()[1]
+    assert busiest.startswith("  > file:///blog/c.html:") and "3 view(s)" in busiest
+    with sqlite3.connect(store_path) as db:
+        urls = sorted(url for url, in db.execute("SELECT url FROM pages"))
+    assert urls == ['file:///', 'file:///blog/a.html', 'file:///blog/b.html', 'file:///blog/c.html']
@@ -0,0 +1,46 @@
+"""diff: page matching and URL comparison across two result sets."""
+
+from seokit.diff import SortedPages, join_pages
+
+
+def _record(url, canonical, **extra):
+    facts = {'title': 'T', 'description': 'D', 'canonical': canonical, 'robots': '', 'http_status': 200}
+    return dict({'url': url, 'score': 80, 'grade': 'B', 'facts': facts, 'hreflang': [{'hreflang': 'en', 'href': canonical}],
+                 'open_graph': {'og:url': canonical}, 'twitter_card': {}, 'json_ld_types': []}, **extra)
+
+
+def _join(left, right, tmp_path, **options):
+    left_pages, right_pages = SortedPages(iter(left), str(tmp_path)), SortedPages(iter(right), str(tmp_path))
+    return list(join_pages(left_pages, right_pages, **options))
+
+
+def test_dir_runs_match_by_stored_site_path(checker, tmp_path, monkeypatch):
+    site = tmp_path / 'site'
+    (site / 'blog').mkdir(parents=True)
+    for name in ('index.html', 'blog/a.html', 'blog/b.html'):
+        (site / name).write_text(f'<html><head><title>{name}</title></head><body></body></html>', encoding='utf-8')
+    targets = [str(site / name) for name in ('index.html', 'blog/a.html', 'blog/b.html')]
+    for run in ('left', 'right'):
+        checker.run_bulk_audit(targets, jsonl_path=str(tmp_path / f'{run}.jsonl'), site_root=str(site))
+    monkeypatch.chdir(site / 'blog')        # No --left-root/--right-root: the stored site paths are used
+    diff = checker.run_diff(str(tmp_path / 'left.jsonl'), str(tmp_path / 'right.jsonl'))
+    assert (diff.matched, diff.only_left, diff.only_right) == (3, 0, 0)
+
+
+def test_urls_are_relative_to_the_hosts_of_both_sides(tmp_path):
+    live = [_record('https://www.example.com/blog/a.html', 'https://www.example.com/blog/a.html')]
+    local = [_record('site/blog/a.html', '/blog/a.html', site_path='blog/a.html')]
+    [(key, old, new)] = _join(live, local, tmp_path)
+    assert key == '/blog/a.html'
+    assert old['canonical'] == new['canonical'] == '/blog/a.html'
+    assert old['hreflang'] == new['hreflang'] == ['en /blog/a.html']
+    assert old['open_graph'] == new['open_graph']
+
+
+def test_other_hosts_stay_absolute(tmp_path):
+    left = [_record('https://www.example.com/', 'https://cdn.example.net/')]
+    right = [_record('https://staging.example.com/', 'https://www.example.com/')]
+    [(_, old, new)] = _join(left, right, tmp_path)
+    assert (old['canonical'], new['canonical']) == ('https://cdn.example.net/', '/')
+    [(_, old, _)] = _join(left, right, tmp_path, aliases=['CDN.example.net'])
+    assert old['canonical'] == '/'
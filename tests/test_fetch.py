@@ -0,0 +1,69 @@
+"""seokit.fetch against a local keep-alive server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from seokit.fetch import ResourceSizeCache, new_session, probe_status, response_facts, x_robots_noindex
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'      # Keep-alive
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', '1234')
+        self.send_header('X-Robots-Tag', 'bingbot: nofollow')
+        self.send_header('X-Robots-Tag', 'noindex')
+        self.end_headers()
+
+    def do_GET(self):
+        body = b'<html><head><title>t</title></head></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_probe_status_reuses_the_connection(server):
+    session = new_session()
+    for i in range(10):
+        facts = probe_status(session, f"{server}/page-{i}")
+        assert facts['Status'] == 200 and facts['Method'] == 'HEAD'
+    assert _Handler.connections == 1
+
+
+def test_resource_sizes_reuse_the_connection(server):
+    sizes = ResourceSizeCache(new_session(), workers=1).sizes([f"{server}/style-{i}.css" for i in range(5)])
+    assert set(sizes.values()) == {1234}
+    assert _Handler.connections == 1
+
+
+def test_x_robots_agent_scope_ends_with_its_header(server):
+    session = new_session()
+    response = session.head(server)
+    facts = response_facts(response, [])
+    assert facts['X_Robots_Tags'] == ['bingbot: nofollow', 'noindex']
+    assert x_robots_noindex(facts['X_Robots_Tags'])
+    assert not x_robots_noindex('bingbot: nofollow, noindex')
@@ -0,0 +1,32 @@
+"""seokit.metrics: sharded counters/histograms and deltas between processes."""
+
+import threading
+
+from seokit.metrics import MetricsRegistry
+
+
+def test_exited_threads_fold_into_the_retired_total():
+    registry = MetricsRegistry()
+    pages = registry.counter('pages_total', 'Pages.', ('result',))
+    threads = [threading.Thread(target=pages.inc, args=('ok',)) for _ in range(200)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    pages.inc('ok')
+    assert pages.values() == {('ok',): 201}
+    assert len(pages._shards) == 1
+
+
+def test_deltas_move_counts_between_registries():
+    worker, parent = MetricsRegistry(), MetricsRegistry()
+    fetches = worker.counter('fetches_total', 'Fetches.', ('status',))
+    latency = worker.histogram('parse_seconds', 'Parse time.', buckets=(0.1, 1.0))
+    fetches.inc('200', amount=2)
+    latency.observe(0.05)
+    parent.merge_delta(worker.collect_delta())
+    fetches.inc('404')
+    latency.observe(5.0)
+    parent.merge_delta(worker.collect_delta())
+    assert worker.collect_delta() == {}         # Nothing new since the last call
+    assert parent.counter('fetches_total', 'Fetches.', ('status',)).values() == {('200',): 2, ('404',): 1}
+    assert parent.histogram('parse_seconds', 'Parse time.', buckets=(0.1, 1.0)).values() == {(): ([1, 0, 1], 5.05)}
@@ -0,0 +1,76 @@
+"""The ruleset engine: scalar scoring (audits) and score_columns (rescore) must agree."""
+
+import json
+import random
+
+import pytest
+
+from seokit.scoring import RulesetError, compile_ruleset
+
+pytest.importorskip('numpy')
+
+CUSTOM_RULES = {
+    'max_score': 50,
+    'grading_scale': {'80': 'good', '40': 'fair', '0': 'poor'},
+    'params': {'slow_ms': 300},
+    'rules': [
+        {'id': 'Indexable', 'weight': 20, 'when': {'not': {'any': [{'field': 'robots', 'op': 'contains', 'value': 'NOINDEX'},
+                                                                     {'field': 'x_robots_noindex', 'op': 'true'}]}}},
+        {'id': 'Fast', 'weight': 20, 'when': {'field': 'render_blocking_ms', 'op': '<', 'value': '$slow_ms'},
+         'partial': [{'when': {'field': 'render_blocking_ms', 'op': '<', 'value': 1000}, 'credit': 0.25}]},
+        {'id': 'Dimensions', 'weight': 10, 'ratio': {'numerator': 'images_missing_dimensions', 'denominator': 'images_total',
+                                                     'invert': True, 'empty': 1}},
+        {'id': 'Status_Not_OK', 'weight': 60, 'penalty': True, 'when': {'field': 'http_status', 'op': '>=', 'value': 400}},
+    ],
+}
+
+
+def _random_facts(rng):
+    title = rng.choice(['', 'Home', 'x' * rng.randint(1, 90)])
+    description = rng.choice(['', 'Short', 'y' * rng.randint(50, 200)])
+    images = rng.choice([0, 0, rng.randint(1, 40)])
+    return {
+        'title': title, 'title_length': len(title), 'description': description, 'description_length': len(description),
+        'canonical': rng.choice(['', 'https://www.example.com/']), 'robots': rng.choice(['', 'index, follow', 'noindex', 'NoIndex,nofollow']),
+        'robots_noindex': rng.random() < 0.1, 'hreflang_count': rng.choice([0, 0, 3]), 'og_count': rng.randint(0, 3),
+        'twitter_count': rng.randint(0, 2), 'schema_checked': (checked := rng.randint(0, 4)), 'schema_valid': rng.randint(0, checked),
+        'images_total': images, 'images_missing_alt': rng.randint(0, images), 'outgoing_links': rng.randint(0, 100),
+        'blocking_scripts': rng.randint(0, 5), 'blocking_stylesheets': rng.randint(0, 5), 'blocking_bytes': rng.randint(0, 10 ** 6),
+        'render_blocking_ms': rng.choice([0, 299, 300, 999, 1000, rng.randint(0, 3000)]),
+        'images_missing_dimensions': rng.randint(0, images), 'http_status': rng.choice([0, 200, 200, 301, 404, 500]),
+        'redirect_hops': rng.choice([0, 0, 1, 2, 3]), 'x_robots_noindex': rng.random() < 0.05,
+        'robots_txt_blocked': rng.random() < 0.05, 'header_canonical_conflict': rng.random() < 0.05, 'compressed': rng.random() < 0.8,
+    }
+
+
+@pytest.fixture(scope='module')
+def pages():
+    rng = random.Random(20261019)
+    return [_random_facts(rng) for _ in range(2000)]
+
+
+@pytest.mark.parametrize('stored_as', ['npz', 'jsonl'])
+@pytest.mark.parametrize('ruleset', ['default', 'custom'])
+def test_score_columns_matches_scalar_scores(checker, pages, tmp_path, stored_as, ruleset):
+    rules = checker.SCORING_RULES if ruleset == 'default' else checker.compile_scoring_rules(CUSTOM_RULES)
+    expected = [rules.score(facts) for facts in pages]
+    path = str(tmp_path / f'facts.{stored_as}')
+    if stored_as == 'npz':
+        writer = checker.FactsColumnWriter(path)
+        for number, facts in enumerate(pages):
+            writer.append({'url': f'/p{number}', 'score': 0, 'grade': 'F', **facts})
+        writer.close()
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            for number, facts in enumerate(pages):
+                f.write(json.dumps({'url': f'/p{number}', 'score': 0, 'grade': 'F', 'facts': facts}) + "\n")
+    columns = checker.load_rescore_columns(path, rules.fields)
+    scores, grades = rules.score_columns({name: columns[name] for name in rules.fields})
+    assert list(zip(scores.tolist(), grades.tolist())) == expected
+    assert len({score for score, _ in expected}) > 10         # The corpus exercises many score levels
+
+
+def test_unknown_fields_are_rejected(checker):
+    with pytest.raises(RulesetError, match='title_lenght'):
+        checker.compile_scoring_rules({'rules': [{'id': 'Typo', 'weight': 1, 'when': {'field': 'title_lenght', 'op': '>', 'value': 0}}]})
+    assert compile_ruleset({'rules': [{'id': 'Any', 'weight': 1, 'when': {'field': 'anything', 'op': 'true'}}]}).fields == {'anything'}
@@ -0,0 +1,69 @@
+"""Audit server (`serve`): request parsing and error replies."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from seokit.server import AuditServer, ServeError, parse_audit_request
+
+
+@pytest.mark.parametrize('fields', [{'url': 5}, {'html': 5}, {'html': ['<p>']}, {'url': {'href': 'https://x'}}, [1, 2]])
+def test_non_string_fields_are_rejected(fields):
+    with pytest.raises(ServeError) as error:
+        parse_audit_request('/audit', 'application/json', json.dumps(fields).encode('utf-8'))
+    assert error.value.status == 400
+
+
+def test_json_and_query_requests():
+    request = parse_audit_request('/audit?head_only=1', 'application/json; charset=utf-8',
+                                  json.dumps({'html': '<title>t</title>', 'url': 'https://www.example.com/'}).encode('utf-8'))
+    assert request == {'html': '<title>t</title>', 'url': 'https://www.example.com/', 'head_only': True}
+    assert parse_audit_request('/audit?url=https://www.example.com/', None, b'')['url'] == 'https://www.example.com/'
+    with pytest.raises(ServeError):
+        parse_audit_request('/audit?url=file:///etc/passwd', None, b'')
+
+
+def test_bad_body_gets_a_400_reply_and_the_connection_survives():
+    server = AuditServer(dict, workers=1)
+    host, port = server.bind(port=0)[len('http://'):].split(':')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection(host, int(port), timeout=5)
+        for body in ('{"url": 5}', '{"html": 5}'):
+            connection.request('POST', '/audit', body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            assert response.status == 400
+            assert 'must be a string' in json.loads(response.read())['error']
+        connection.request('GET', '/health')
+        assert connection.getresponse().status == 200
+    finally:
+        server.httpd.shutdown()
+        server.close()
+
+
+def _audits_counted(checker):
+    counts, _ = checker.AUDIT_SECONDS_METRIC.values().get((), ([0], 0))
+    return sum(counts)
+
+
+def test_worker_metrics_reach_the_server(checker):
+    server = AuditServer(checker.serve_audit, workers=1, initializer=checker.init_serve_worker)
+    server.warm_up()
+    host, port = server.bind(port=0)[len('http://'):].split(':')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        before = _audits_counted(checker)
+        connection = http.client.HTTPConnection(host, int(port), timeout=30)
+        for _ in range(3):
+            connection.request('POST', '/audit', '<html><head><title>Page</title></head></html>', {'Content-Type': 'text/html'})
+            response = connection.getresponse()
+            assert response.status == 200 and json.loads(response.read())['score'] >= 0
+        connection.request('GET', '/metrics')
+        exposition = connection.getresponse().read().decode('utf-8')
+    finally:
+        server.httpd.shutdown()
+        server.close()
+    # Counted in the worker process (the warm-up audit is left out)
+    assert f"seokit_audit_seconds_count {before + 3}" in exposition.splitlines()
@@ -0,0 +1,9 @@
+"""Startup budget of seo-checker.py, the same probe as the checker.startup[--version] benchmark case."""
+
+from benchmarks.cases import STARTUP_BUDGET_MS
+from benchmarks.harness import run_case
+
+
+def test_checker_startup_within_budget():
+    result = run_case('checker.startup[--version]', quick=True)    # Raises if importing the checker loads a heavy module
+    assert result['p50_ms'] <= STARTUP_BUDGET_MS, f"--version p50 {result['p50_ms']:.0f} ms, budget {STARTUP_BUDGET_MS} ms"
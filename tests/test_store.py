@@ -0,0 +1,36 @@
+"""AuditStore: which runs grade drops are measured against."""
+
+from seokit.store import AuditStore
+
+GRADE_RANK = {'F': 0, 'C': 1, 'B': 2, 'A': 3}
+
+
+def _run(store, label, pages, finished=True):
+    run_id = store.begin_run(label=label)
+    for url, score, grade in pages:
+        store.add_page(run_id, url, score, grade)
+    if finished:
+        store.finish_run(run_id)
+    else:
+        store.flush()
+    return run_id
+
+
+def test_previous_run_skips_unfinished_and_other_targets(tmp_path):
+    with AuditStore(str(tmp_path / 'history.db')) as store:
+        baseline = _run(store, 'dir /site', [('/a', 95, 'A'), ('/b', 90, 'A')])
+        _run(store, 'dir /other', [('/a', 10, 'F')])
+        _run(store, 'dir /site', [('/a', 20, 'F')], finished=False)        # Crashed after one page
+        latest = _run(store, 'dir /site', [('/a', 80, 'B'), ('/b', 90, 'A')])
+        assert store.previous_run(latest) == baseline
+        assert store.grade_drops(GRADE_RANK, run_id=latest) == [('/a', 95, 'A', 80, 'B')]
+
+
+def test_latest_run_ignores_a_run_in_progress(tmp_path):
+    with AuditStore(str(tmp_path / 'history.db')) as store:
+        first = _run(store, 'sitemap s.xml', [('/a', 95, 'A')])
+        second = _run(store, 'sitemap s.xml', [('/a', 70, 'C')])
+        _run(store, 'sitemap s.xml', [], finished=False)
+        assert store.latest_run() == second
+        assert store.previous_run(second) == first
+        assert store.grade_drops(GRADE_RANK) == [('/a', 95, 'A', 70, 'C')]